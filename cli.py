@@ -0,0 +1,234 @@
+# Единая точка входа для заданий dz1-dz4. Модули заданий загружаются только
+# внутри своей подкоманды, поэтому быстрый запрос не платит за импорт NumPy,
+# matplotlib или tkinter:
+#
+#     python cli.py generate --size-mb 50
+#     python cli.py search id 000000123
+#     python cli.py range timestamp --from 2024-05-01 --to 2024-05-31 --status FAILED
+#     python cli.py experiment matrix
+#     python cli.py tree benchmark -n 2000
+import argparse
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FILE = "large_data.txt"
+
+
+def load_module(relative_path):
+    """Импортирует скрипт по пути (в разных каталогах есть одноименные FirstTask/SecondTask).
+
+    Каталог скрипта добавляется в sys.path, чтобы работали его импорты соседних модулей.
+    """
+    path = os.path.join(ROOT, relative_path)
+    directory = os.path.dirname(path)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    name = relative_path.replace(os.sep, '_').replace('/', '_')[:-3]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _run_main(relative_path, argv, function='main'):
+    """Запускает функцию модуля так, будто скрипт вызван с аргументами argv."""
+    module = load_module(relative_path)
+    previous, sys.argv = sys.argv, [relative_path] + list(argv)
+    try:
+        return getattr(module, function)()
+    finally:
+        sys.argv = previous
+
+
+def cmd_generate(args):
+    load_module('dz1/FirstTask.py').generate_large_file(args.file, target_size_mb=args.size_mb)
+
+
+def cmd_search(args):
+    block_store = load_module('dz1/block_store.py')
+    if block_store.has_store(args.file):
+        found, _ = block_store.search(args.file, args.query, args.field)
+        count, records = len(found), found[:args.limit]
+    else:
+        second_task = load_module('dz1/SecondTask.py')
+        count, records = second_task.find_records(args.file, args.query, args.field, args.limit)
+    print(f"Найдено записей: {count}")
+    for line in records:
+        print(line)
+
+
+def cmd_range(args):
+    record_index = load_module('dz1/record_index.py')
+    offsets = record_index.find_offsets(args.file, args.column, args.lo, args.hi, args.status)
+    print(f"Найдено записей: {len(offsets)}")
+    for line in record_index.read_lines(args.file, offsets[:args.limit]):
+        print(line)
+
+
+def cmd_append(args):
+    record_log = load_module('dz1/record_log.py')
+    with record_log.RecordAppender(args.file) as appender:
+        record_id = appender.append(args.status.upper(), args.value, args.tags)
+    print(f"Запись добавлена, ID {record_id:09d}")
+
+
+def cmd_pack(args):
+    count = load_module('dz1/block_store.py').write_store(args.file, args.codec)
+    print(f"Блоков: {count}")
+
+
+def cmd_serve(args):
+    argv = [args.file, '--port', str(args.port)]
+    if args.socket:
+        argv += ['--socket', args.socket]
+    if args.workers:
+        argv += ['--workers', str(args.workers)]
+    if args.threads:
+        argv.append('--threads')
+    _run_main('dz1/query_server.py', argv)
+
+
+def cmd_interactive(args):
+    load_module('dz1/SecondTask.py').main()
+
+
+# Эксперименты и деревья: (модуль, функция); аргументы после имени передаются скрипту
+EXPERIMENTS = {
+    'keys': ('dz1/ThirdTask.py', 'main'),
+    'linear': ('dz2/FirstTask.py', 'main'),
+    'tape': ('dz2/SecondTask.py', 'run_experiments'),
+    'geometric': ('dz2/ThreeTask.py', 'main'),
+    'matrix': ('dz2/FourTask.py', 'main'),
+    'conditions': ('dz2/FiveTask.py', 'main'),
+    'optimal': ('dz3/optimal_bst.py', 'main'),
+    'workload': ('dz2/workload.py', 'main'),
+}
+
+TREES = {
+    'bst': ('dz3/TwoTask.py', 'main'),
+    'avl': ('dz4/FirstTask.py', 'main'),
+    'export': ('dz3/tree_export.py', 'main'),
+    'benchmark': ('dz4/tree_benchmark.py', 'main'),
+}
+
+
+def cmd_experiment(args):
+    path, function = EXPERIMENTS[args.name]
+    if args.name == 'conditions':
+        # FiveTask спрашивает число условий через input(): берем его из аргументов
+        load_module(path).main(int(args.args[0]) if args.args else None)
+        return
+    _run_main(path, args.args, function)
+
+
+def cmd_tree(args):
+    path, function = TREES[args.name]
+    _run_main(path, args.args, function)
+
+
+def cmd_profile(args):
+    _run_main('profile_harness.py', args.args)
+
+
+# Подкоманды, чьи аргументы после собственных позиционных (их число — значение)
+# передаются скрипту как есть; argparse их не разбирает, иначе он отверг бы
+# незнакомые ему опции скрипта
+PASSTHROUGH = {'experiment': 1, 'tree': 1, 'profile': 0}
+
+
+def split_passthrough(argv):
+    """Делит аргументы на разбираемые cli.py и передаваемые скрипту.
+
+    Returns:
+        Кортеж (аргументы для build_parser, аргументы скрипта без ведущего '--').
+    """
+    position = next((i for i, token in enumerate(argv) if not token.startswith('-')), len(argv))
+    if position == len(argv) or argv[position] not in PASSTHROUGH:
+        return argv, []
+    cut = position + 1 + PASSTHROUGH[argv[position]]
+    if argv[position + 1:cut] and argv[cut - 1].startswith('-'):
+        return argv, []  # Например, experiment --help: справка самой подкоманды
+    rest = argv[cut:]
+    return argv[:cut], rest[1:] if rest[:1] == ['--'] else rest
+
+
+def build_parser():
+    """Разбор аргументов: у каждой подкоманды свой обработчик handler."""
+    parser = argparse.ArgumentParser(description="Задания dz1-dz4: файл записей, эксперименты, деревья")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    generate = subparsers.add_parser('generate', help="Сгенерировать файл записей")
+    generate.add_argument('--file', default=DEFAULT_FILE)
+    generate.add_argument('--size-mb', type=int, default=500)
+    generate.set_defaults(handler=cmd_generate)
+
+    search = subparsers.add_parser('search', help="Поиск записей по id, тегу или статусу")
+    search.add_argument('field', choices=('id', 'tags', 'status'))
+    search.add_argument('query')
+    search.add_argument('--file', default=DEFAULT_FILE)
+    search.add_argument('--limit', type=int, default=10, help="Сколько записей показать")
+    search.set_defaults(handler=cmd_search)
+
+    range_parser = subparsers.add_parser('range', help="Записи из диапазона времени или значения")
+    range_parser.add_argument('column', choices=('timestamp', 'value'))
+    range_parser.add_argument('--from', dest='lo', help="Нижняя граница (включительно)")
+    range_parser.add_argument('--to', dest='hi', help="Верхняя граница (включительно)")
+    range_parser.add_argument('--status')
+    range_parser.add_argument('--file', default=DEFAULT_FILE)
+    range_parser.add_argument('--limit', type=int, default=10)
+    range_parser.set_defaults(handler=cmd_range)
+
+    append = subparsers.add_parser('append', help="Добавить запись")
+    append.add_argument('status')
+    append.add_argument('value', type=float)
+    append.add_argument('tags', nargs='?', default='')
+    append.add_argument('--file', default=DEFAULT_FILE)
+    append.set_defaults(handler=cmd_append)
+
+    pack = subparsers.add_parser('pack', help="Сжать файл записей блоками")
+    pack.add_argument('--codec', choices=('zlib', 'lzma'), default='zlib')
+    pack.add_argument('--file', default=DEFAULT_FILE)
+    pack.set_defaults(handler=cmd_pack)
+
+    serve = subparsers.add_parser('serve', help="Сервис запросов dz1/query_server.py")
+    serve.add_argument('--file', default=DEFAULT_FILE)
+    serve.add_argument('--socket', help="Путь к Unix-сокету (иначе TCP на localhost)")
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--workers', type=int, help="Размер пула поиска")
+    serve.add_argument('--threads', action='store_true', help="Пул потоков вместо процессов")
+    serve.set_defaults(handler=cmd_serve)
+
+    interactive = subparsers.add_parser('interactive', help="Текстовое меню dz1/SecondTask")
+    interactive.set_defaults(handler=cmd_interactive)
+
+    experiment = subparsers.add_parser('experiment', help="Эксперименты с поиском")
+    experiment.add_argument('name', choices=tuple(EXPERIMENTS))
+    experiment.add_argument('args', nargs='*', help="Аргументы скрипта")
+    experiment.set_defaults(handler=cmd_experiment)
+
+    tree = subparsers.add_parser('tree', help="Деревья поиска: визуализация, экспорт, сравнение")
+    tree.add_argument('name', choices=tuple(TREES))
+    tree.add_argument('args', nargs='*', help="Аргументы скрипта")
+    tree.set_defaults(handler=cmd_tree)
+
+    profile = subparsers.add_parser('profile', help="Профилирование (аргументы — как у profile_harness.py)")
+    profile.add_argument('args', nargs='*', help="Аргументы profile_harness.py")
+    profile.set_defaults(handler=cmd_profile)
+    return parser
+
+
+def main(argv=None):
+    """Командная строка: выполняет выбранную подкоманду."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    own, forwarded = split_passthrough(argv)
+    args = build_parser().parse_args(own)
+    if forwarded:
+        args.args = forwarded
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
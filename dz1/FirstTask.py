@@ -34,4 +34,5 @@ def generate_large_file(file_path: str, target_size_mb: int = 500):
 
 
 # Запуск генерации
-generate_large_file("large_data.txt", target_size_mb=500)
\ No newline at end of file
+if __name__ == "__main__":
+    generate_large_file("large_data.txt", target_size_mb=500)
\ No newline at end of file
@@ -1,9 +1,30 @@
 import os
 
+import block_store
+
 FILENAME = "large_data.txt"
 TEMP_FILENAME = "temp_file.txt"
 
 
+def find_records(filename, query, field, limit=10):
+    # Потоковый поиск без перезаписи: в памяти только первые limit совпадений.
+    # Читается версия файла на момент открытия — дописанное позже и оборванная строка пропускаются
+    count, first = 0, []
+    with open(filename, 'rb') as f:
+        remaining = os.fstat(f.fileno()).st_size - len(f.readline())  # Заголовок
+        for raw in f:
+            remaining -= len(raw)
+            if remaining < 0 or not raw.endswith(b'\n'):
+                break
+            line = raw.decode('utf-8').strip()
+            parts = line.split(';')
+            if len(parts) == 5 and block_store.match_record(parts, query, field):
+                count += 1
+                if len(first) < limit:
+                    first.append(line)
+    return count, first
+
+
 def search_and_remove_records(filename, query, field):
     found = []
     remaining = []
@@ -22,11 +43,7 @@ def search_and_remove_records(filename, query, field):
                 continue
 
             # Поиск по полям
-            if field == 'id' and query.lower() in parts[0].lower():
-                found.append(line)
-            elif field == 'tags' and query in parts[4]:
-                found.append(line)
-            elif field == 'status' and query.lower() in parts[1].lower():
+            if block_store.match_record(parts, query, field):
                 found.append(line)
             else:
                 remaining.append(line)
@@ -49,12 +66,56 @@ def append_to_temp_file(temp_filename, found, remaining, header):
 
 def replace_file_with_temp():
     if os.path.exists(TEMP_FILENAME):
+        import record_index
+
         os.replace(TEMP_FILENAME, FILENAME)
+        # Смещения строк изменились: индексы перестроятся при следующем запросе
+        record_index.invalidate(FILENAME)
         print("Файл обновлён!")
 
 
+def range_search(filename, column):
+    import record_index  # numpy нужен только запросам по диапазону
+
+    # Запрос по диапазону через отсортированный индекс, без полного просмотра файла
+    hint = "ГГГГ-ММ-ДД[ чч:мм:сс]" if column == 'timestamp' else "число"
+    lo = input(f"Нижняя граница ({hint}, пусто — без границы): ").strip() or None
+    hi = input(f"Верхняя граница ({hint}, пусто — без границы): ").strip() or None
+    status = input("Статус (пусто — любой): ").strip() or None
+
+    try:
+        offsets = record_index.find_offsets(filename, column, lo, hi, status)
+    except ValueError as error:
+        print(f"Ошибка: {error}")
+        return
+
+    if len(offsets):
+        print(f"\nНайдено записей: {len(offsets)}")
+        for r in record_index.read_lines(filename, offsets[:10]):  # показываем первые 10
+            print(r)
+    else:
+        print("Совпадений не найдено.")
+
+
+def add_record(filename):
+    import record_index
+    import record_log
+
+    # Запись дописывается в конец файла через журнал, индексы дополняются без перестройки
+    status = input(f"Статус ({', '.join(record_index.STATUSES)}): ").strip().upper()
+    tags = input("Теги через запятую: ").strip()
+    try:
+        value = float(input("Значение: ").strip())
+        with record_log.RecordAppender(filename) as appender:
+            record_id = appender.append(status, value, tags)
+    except ValueError as error:
+        print(f"Ошибка: {error}")
+        return
+    print(f"Запись добавлена, ID {record_id:09d}")
+
+
 def main():
-    if not os.path.exists(FILENAME):
+    if not os.path.exists(FILENAME) and not block_store.has_store(FILENAME):
         print(f"Файл {FILENAME} не найден.")
         return
 
@@ -64,12 +125,26 @@ def main():
         print("2. Поиск по тегу")
         print("3. Поиск по статусу")
         print("4. Добавить запись")
-        print("5. Выход")
-        choice = input("Выберите действие (1-5): ")
+        print("5. Записи за период")
+        print("6. Записи по значению")
+        print("7. Выход")
+        choice = input("Выберите действие (1-7): ")
 
-        if choice == '5':
+        if choice == '7':
             break
 
+        if choice in ('4', '5', '6') and not os.path.exists(FILENAME):
+            print("Доступно только для текстового файла.")
+            continue
+
+        if choice == '4':
+            add_record(FILENAME)
+            continue
+
+        if choice in ('5', '6'):
+            range_search(FILENAME, 'timestamp' if choice == '5' else 'value')
+            continue
+
         query = input("Введите запрос: ").strip()
         field_map = {'1': 'id', '2': 'tags', '3': 'status'}
         field = field_map.get(choice)
@@ -78,6 +153,14 @@ def main():
             print("Неверный выбор.")
             continue
 
+        if block_store.has_store(FILENAME):
+            # Сжатое хранилище: распаковываются только нужные блоки, файл не переписывается
+            found, blocks = block_store.search(FILENAME, query, field)
+            print(f"\nНайдено записей: {len(found)} (распаковано блоков: {blocks})")
+            for r in found[:10]:
+                print(r)
+            continue
+
         found, remaining, header = search_and_remove_records(FILENAME, query, field)
 
         if found:
@@ -1,10 +1,16 @@
 import math
 
 import numpy as np
-import matplotlib.pyplot as plt
 from collections import defaultdict
 import bisect
 import json
+import os
+import sys
+
+# Общие алгоритмы поиска лежат в соседнем каталоге dz2
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'dz2'))
+import search_algorithms  # noqa: E402
+import workload  # noqa: E402
 
 
 class KeyExperiment:
@@ -47,32 +53,41 @@ class KeyExperiment:
 
     def linear_search(self, keys, queries):
         """Линейный поиск с подсчетом сравнений"""
-        comparisons = 0
+        counter = search_algorithms.ComparisonCounter()
+        hooks = (counter,)
+        keys = keys.tolist() if isinstance(keys, np.ndarray) else list(keys)
+        queries = queries.tolist() if isinstance(queries, np.ndarray) else queries
         for query in queries:
-            for i, key in enumerate(keys):
-                comparisons += 1
-                if key == query:
-                    break
-        return comparisons
-
-    def run_experiment(self, num_queries=100000):
-        """Проводит полный эксперимент"""
+            search_algorithms.linear_search(keys, query, hooks)
+        return counter.comparisons
+
+    def run_experiment(self, num_queries=100000, seed=None):
+        """Проводит полный эксперимент
+
+        Запросы генерируются порциями и не хранятся: оба прохода получают
+        один и тот же поток благодаря общему зерну.
+        """
         results = {}
+        rng = np.random.default_rng(seed)
 
         for dist_name in self.distributions:
             # Переупорядочиваем ключи
             ordered_keys = self.reorder_keys(dist_name)
 
-            # Генерируем запросы согласно распределению
+            # Запросы согласно распределению: ключ ordered_keys[i] — с вероятностью probs[i]
             probs = self.distributions[dist_name]()
-            queries = np.random.choice(ordered_keys, size=num_queries, p=probs)
+            stream_seed = int(rng.integers(2 ** 63))
+
+            def queries():
+                batches = workload.distribution_batches(ordered_keys, probs, num_queries, seed=stream_seed)
+                return workload.iter_queries(batches)
 
             # 1. Поиск в упорядоченном массиве
-            ordered_comparisons = self.linear_search(ordered_keys, queries)
+            ordered_comparisons = self.linear_search(ordered_keys, queries())
 
             # 2. Поиск в случайном порядке (перемешиваем)
             shuffled_keys = np.random.permutation(ordered_keys)
-            shuffled_comparisons = self.linear_search(shuffled_keys, queries)
+            shuffled_comparisons = self.linear_search(shuffled_keys, queries())
 
             # Сохраняем результаты
             results[dist_name] = {
@@ -92,6 +107,8 @@ class KeyExperiment:
 
     def save_distribution_plot(self, dist_name, keys, probs):
         """Сохраняет график распределения"""
+        import matplotlib.pyplot as plt  # Тяжелый импорт — только когда строится график
+
         plt.figure(figsize=(10, 5))
         plt.bar(range(len(keys)), probs[np.argsort(keys)])
         plt.title(f"Распределение вероятностей ({dist_name})")
@@ -106,8 +123,8 @@ class KeyExperiment:
             json.dump(results, f, indent=2)
 
 
-# Запуск эксперимента
-if __name__ == "__main__":
+def main():
+    """Запуск эксперимента"""
     experiment = KeyExperiment(size=300)
     results = experiment.run_experiment(num_queries=100000)
 
@@ -121,4 +138,9 @@ if __name__ == "__main__":
 
     # Сохранение результатов
     experiment.save_results(results)
-    print("\nРезультаты сохранены в experiment_results.json")
\ No newline at end of file
+    print("\nРезультаты сохранены в experiment_results.json")
+
+
+# Запуск эксперимента
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import argparse
+import json
+import lzma
+import os
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+BLOCK_SIZE = 1024 * 1024  # Несжатый размер блока
+CODECS = {
+    'zlib': (lambda data: zlib.compress(data, 6), zlib.decompress),
+    'lzma': (lambda data: lzma.compress(data, preset=6), lzma.decompress),
+}
+
+
+def store_path(filename: str) -> str:
+    """Путь к сжатому хранилищу файла записей."""
+    return f"{filename}.blk"
+
+
+def block_index_path(filename: str) -> str:
+    """Путь к индексу блоков: смещение, длина и диапазон id каждого блока."""
+    return f"{filename}.blk.json"
+
+
+def _signature(filename: str) -> Dict[str, int]:
+    stat = os.stat(filename)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'inode': stat.st_ino}
+
+
+def _record_id(line: bytes) -> Optional[int]:
+    record_id = line.split(b';', 1)[0]
+    return int(record_id) if record_id.isdigit() else None
+
+
+def match_record(parts: List[str], query: str, field: str) -> bool:
+    """Подходит ли запись (поля через ';') под запрос SecondTask."""
+    if field == 'id':
+        return query.lower() in parts[0].lower()
+    if field == 'tags':
+        return query in parts[4]
+    if field == 'status':
+        return query.lower() in parts[1].lower()
+    return False
+
+
+def _blocks(lines: Iterable[bytes], block_size: int) -> Iterator[List[bytes]]:
+    """Группирует строки в блоки примерно по block_size байт; строка не делится между блоками."""
+    block, size = [], 0
+    for line in lines:
+        block.append(line)
+        size += len(line)
+        if size >= block_size:
+            yield block
+            block, size = [], 0
+    if block:
+        yield block
+
+
+def write_store(filename: str, codec: str = 'zlib', block_size: int = BLOCK_SIZE,
+                workers: Optional[int] = None) -> int:
+    """Сжимает файл записей в независимые блоки и строит индекс блоков.
+
+    Блоки сжимаются параллельно (zlib и lzma отпускают GIL), порядок
+    записей сохраняется.
+
+    Args:
+        filename: Файл записей с заголовком (формат FirstTask.generate_large_file)
+        codec: 'zlib' (быстрее) или 'lzma' (сильнее сжимает)
+        block_size: Несжатый размер блока в байтах
+        workers: Число потоков сжатия (по умолчанию — по числу процессоров)
+
+    Returns:
+        Количество блоков.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Неизвестный кодек: {codec}")
+    compress = CODECS[codec][0]
+    source = _signature(filename)
+    blocks = []
+    temp = store_path(filename) + '.tmp'
+
+    def pack(lines):
+        ids = [record_id for record_id in map(_record_id, lines) if record_id is not None]
+        return compress(b''.join(lines)), len(lines), ids[0] if ids else None, \
+            min(ids, default=None), max(ids, default=None)
+
+    with open(filename, 'rb') as file, open(temp, 'wb') as out, \
+            ThreadPoolExecutor(workers) as executor:
+        header = file.readline().decode('utf-8').rstrip('\r\n')
+        packed = _ordered(executor, pack, _blocks(file, block_size), workers)
+        for data, records, first_id, min_id, max_id in packed:
+            blocks.append({'offset': out.tell(), 'length': len(data), 'records': records,
+                           'first_id': first_id, 'min_id': min_id, 'max_id': max_id})
+            out.write(data)
+
+    os.replace(temp, store_path(filename))
+    with open(block_index_path(filename), 'w') as file:
+        json.dump({'codec': codec, 'header': header, 'source': source, 'blocks': blocks}, file)
+    return len(blocks)
+
+
+def load_block_index(filename: str) -> dict:
+    """Индекс блоков хранилища файла filename."""
+    with open(block_index_path(filename)) as file:
+        return json.load(file)
+
+
+def has_store(filename: str) -> bool:
+    """Есть ли сжатое хранилище, соответствующее файлу записей.
+
+    Если исходного текстового файла нет, используется любое имеющееся хранилище.
+    """
+    try:
+        index = load_block_index(filename)
+    except (OSError, ValueError):
+        return False
+    if not os.path.exists(store_path(filename)):
+        return False
+    return not os.path.exists(filename) or index['source'] == _signature(filename)
+
+
+def _ordered(executor: ThreadPoolExecutor, function, items: Iterable, workers: Optional[int]) -> Iterator:
+    """executor.map с ограниченным числом задач в работе: в памяти не больше 2 * workers блоков."""
+    window = deque()
+    limit = 2 * (workers or os.cpu_count() or 1)
+    for item in items:
+        window.append(executor.submit(function, item))
+        if len(window) >= limit:
+            yield window.popleft().result()
+    while window:
+        yield window.popleft().result()
+
+
+def _read_blocks(filename: str, index: dict, blocks: List[dict], process, workers: Optional[int]) -> Iterator:
+    """Читает и распаковывает блоки в пуле потоков; результаты process(строки) — в порядке блоков."""
+    decompress = CODECS[index['codec']][1]
+
+    def load(block):
+        with open(store_path(filename), 'rb') as file:
+            file.seek(block['offset'])
+            data = file.read(block['length'])
+        return process(decompress(data).decode('utf-8').splitlines())
+
+    with ThreadPoolExecutor(workers) as executor:
+        yield from _ordered(executor, load, blocks, workers)
+
+
+def iter_records(filename: str, workers: Optional[int] = None) -> Iterator[str]:
+    """Все записи хранилища по порядку; блоки распаковываются параллельно."""
+    index = load_block_index(filename)
+    for lines in _read_blocks(filename, index, index['blocks'], lambda lines: lines, workers):
+        yield from lines
+
+
+def _needed_blocks(blocks: List[dict], query: str, field: str) -> List[dict]:
+    """Блоки, в которых могут быть совпадения.
+
+    Отсеять по индексу можно только поиск по полному id: если запрос из
+    цифр не короче id блока, совпадение подстроки — это равенство, и блок
+    нужен лишь при попадании числа в [min_id, max_id].
+    """
+    if field != 'id' or not query.isdigit():
+        return blocks
+    number = int(query)
+    return [block for block in blocks
+            if block['max_id'] is None or len(query) < len(f"{block['max_id']:09d}")
+            or block['min_id'] <= number <= block['max_id']]
+
+
+def search(filename: str, query: str, field: str, workers: Optional[int] = None) -> Tuple[List[str], int]:
+    """Записи хранилища, подходящие под запрос, как в SecondTask.search_and_remove_records.
+
+    Returns:
+        Кортеж (найденные строки, число распакованных блоков).
+    """
+    index = load_block_index(filename)
+    blocks = _needed_blocks(index['blocks'], query, field)
+
+    def process(lines):
+        found = []
+        for line in lines:
+            parts = line.split(';')
+            if len(parts) == 5 and match_record(parts, query, field):
+                found.append(line)
+        return found
+
+    found = []
+    for lines in _read_blocks(filename, index, blocks, process, workers):
+        found.extend(lines)
+    return found, len(blocks)
+
+
+def unpack(filename: str, target: str) -> None:
+    """Восстанавливает текстовый файл записей из хранилища."""
+    index = load_block_index(filename)
+    with open(target, 'w', encoding='utf-8') as file:
+        file.write(index['header'] + '\n')
+        for line in iter_records(filename):
+            file.write(line + '\n')
+
+
+def main() -> None:
+    """Командная строка: сжатие, распаковка и поиск по хранилищу."""
+    parser = argparse.ArgumentParser(description="Хранение файла записей сжатыми блоками")
+    parser.add_argument('filename', nargs='?', default="large_data.txt")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    pack_parser = subparsers.add_parser('pack', help="Сжать файл в блоки")
+    pack_parser.add_argument('--codec', choices=tuple(CODECS), default='zlib')
+    pack_parser.add_argument('--block-size', type=int, default=BLOCK_SIZE, help="Несжатый размер блока, байт")
+
+    unpack_parser = subparsers.add_parser('unpack', help="Восстановить текстовый файл")
+    unpack_parser.add_argument('target')
+
+    search_parser = subparsers.add_parser('search', help="Поиск записей")
+    search_parser.add_argument('field', choices=('id', 'tags', 'status'))
+    search_parser.add_argument('query')
+    search_parser.add_argument('--limit', type=int, default=10, help="Сколько записей показать")
+
+    args = parser.parse_args()
+    if args.command == 'pack':
+        count = write_store(args.filename, args.codec, args.block_size)
+        ratio = os.path.getsize(store_path(args.filename)) / os.path.getsize(args.filename)
+        print(f"Блоков: {count}, размер: {ratio:.1%} исходного")
+    elif args.command == 'unpack':
+        unpack(args.filename, args.target)
+    else:
+        found, blocks = search(args.filename, args.query, args.field)
+        print(f"Найдено записей: {len(found)} (распаковано блоков: {blocks})")
+        for line in found[:args.limit]:
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import block_store
+import record_index
+import record_log
+import SecondTask
+
+FIELDS = ('id', 'tags', 'status')
+DEFAULT_LIMIT = 10
+
+
+def search_snapshot(filename: str, query: str, field: str, limit: int) -> Tuple[int, List[str]]:
+    """Поиск по версии файла на момент открытия.
+
+    Перезапись (os.replace) не трогает уже открытый файл, а дописанные
+    после открытия строки не читаются: чтение ограничено размером файла
+    при открытии, оборванная последняя строка пропускается.
+
+    Returns:
+        Кортеж (число найденных записей, первые limit из них).
+    """
+    if block_store.has_store(filename):
+        found, _ = block_store.search(filename, query, field)
+        return len(found), found[:limit]
+    return SecondTask.find_records(filename, query, field, limit)
+
+
+def rewrite(filename: str, query: str, field: str) -> int:
+    """Переставляет найденные записи в начало файла, как SecondTask.main.
+
+    Returns:
+        Число найденных записей.
+    """
+    found, remaining, header = SecondTask.search_and_remove_records(filename, query, field)
+    if found:
+        temp = filename + '.tmp'
+        SecondTask.append_to_temp_file(temp, found, remaining, header)
+        os.replace(temp, filename)
+        record_index.invalidate(filename)
+    return len(found)
+
+
+def append_fields(request: dict) -> dict:
+    """Проверяет и приводит поля запроса на дописывание до постановки в очередь писателя.
+
+    Типы проверяются здесь (в JSON может прийти что угодно), содержимое —
+    тем же record_log.check_fields, что и у RecordAppender.append.
+
+    Returns:
+        Запрос с полями status, value (float), tags и timestamp (строка или None).
+    """
+    status, value = request['status'], request['value']
+    tags, timestamp = request.get('tags', ''), request.get('timestamp')
+    if not isinstance(status, str) or not isinstance(tags, str):
+        raise ValueError("status и tags должны быть строками")
+    if timestamp is not None and not isinstance(timestamp, str):
+        raise ValueError("timestamp должен быть строкой")
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"Неверное значение: {value!r}")
+    value = float(value)
+    record_log.check_fields(status, value, tags, timestamp)
+    return {'op': 'append', 'status': status, 'value': value, 'tags': tags, 'timestamp': timestamp}
+
+
+class QueryServer:
+    """Сервис запросов к файлу записей: JSON-строка на запрос, JSON-строка на ответ.
+
+    Запросы:
+        {"op": "search", "field": "id" | "tags" | "status", "query": "...", "limit": 10}
+        {"op": "rewrite", "field": ..., "query": ...} — найденные записи в начало файла
+        {"op": "append", "status": ..., "value": ..., "tags": ..., "timestamp": ...}
+
+    Поиски выполняются в пуле процессов и не блокируют цикл событий.
+    Одинаковые поиски, пришедшие, пока такой же уже выполняется по той же
+    версии файла, получают его результат вместо нового просмотра.
+    Изменения выполняет одна задача-писатель по очереди; дописывания,
+    накопившиеся в очереди, фиксируются одной пачкой (один fsync). Читатели
+    не ждут писателя: начатый поиск дочитывает прежнюю версию файла.
+    """
+
+    def __init__(self, filename: str, workers: Optional[int] = None, processes: bool = True):
+        """
+        Args:
+            filename: Файл записей
+            workers: Размер пула поиска (по умолчанию — по числу процессоров)
+            processes: Пул процессов (поиск на Python упирается в GIL) или потоков
+        """
+        self.filename = filename
+        self.version = 0  # Растет после каждого изменения файла
+        self._pool = ProcessPoolExecutor(workers) if processes else ThreadPoolExecutor(workers)
+        self._writer_pool = ThreadPoolExecutor(1)  # fsync и перезапись — вне цикла событий
+        self._appender: Optional[record_log.RecordAppender] = None
+        self._in_flight: Dict[tuple, asyncio.Future] = {}
+        self._writes: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self.scans = 0  # Сколько просмотров реально запущено
+
+    async def search(self, query: str, field: str, limit: int = DEFAULT_LIMIT) -> Tuple[int, List[str]]:
+        """Поиск с объединением одинаковых одновременных запросов."""
+        if field not in FIELDS:
+            raise ValueError(f"Неизвестное поле: {field}")
+        key = (field, query, limit, self.version)
+        future = self._in_flight.get(key)
+        if future is None:
+            self.scans += 1
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._pool, search_snapshot, self.filename, query, field, limit)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # shield: отмена одного клиента не отменяет общий поиск для остальных
+        return await asyncio.shield(future)
+
+    async def submit(self, request: dict):
+        """Ставит изменение в очередь писателя и ждет его выполнения."""
+        if self._writer is None:
+            self._writes = asyncio.Queue()
+            self._writer = asyncio.create_task(self._write_loop())
+        future = asyncio.get_running_loop().create_future()
+        await self._writes.put((request, future))
+        return await future
+
+    async def _write_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._writes.get()]
+            while not self._writes.empty():
+                batch.append(self._writes.get_nowait())
+            try:
+                results = await loop.run_in_executor(self._writer_pool, self._apply, [r for r, _ in batch])
+            except Exception as error:  # Сбой фиксации пачки достается каждому ее участнику
+                results = [error] * len(batch)
+            self.version += 1
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _apply(self, requests: List[dict]) -> list:
+        """Выполняет пачку изменений в потоке писателя; дописывания фиксируются вместе."""
+        if self._appender is None:
+            # Пачку определяет очередь писателя, а не пороги самого журнала
+            self._appender = record_log.RecordAppender(self.filename, sync_every=1 << 30,
+                                                       max_delay=float('inf'))
+        results = []
+        for request in requests:
+            # Ошибка одного запроса достается только ему: дописывания соседей по пачке
+            # уже в журнале и будут зафиксированы, их клиенты должны получить id
+            try:
+                if request['op'] == 'append':
+                    results.append(self._appender.append(request['status'], request['value'],
+                                                         request['tags'], request['timestamp']))
+                else:
+                    self._appender.flush()
+                    results.append(rewrite(self.filename, request['query'], request['field']))
+            except (KeyError, ValueError) as error:
+                results.append(ValueError(f"Неверный запрос: {error}"))
+            except Exception as error:
+                results.append(error)
+        self._appender.flush()
+        return results
+
+    async def handle(self, request: dict) -> dict:
+        """Ответ на один запрос."""
+        try:
+            op = request.get('op')
+            if op == 'search':
+                count, records = await self.search(request['query'], request['field'],
+                                                   int(request.get('limit', DEFAULT_LIMIT)))
+                return {'ok': True, 'count': count, 'records': records}
+            if op == 'rewrite':
+                if request.get('field') not in FIELDS:
+                    raise ValueError(f"Неизвестное поле: {request.get('field')}")
+                return {'ok': True, 'count': await self.submit(request)}
+            if op == 'append':
+                return {'ok': True, 'id': await self.submit(append_fields(request))}
+            raise ValueError(f"Неизвестная операция: {op}")
+        except KeyError as error:
+            return {'ok': False, 'error': f"В запросе нет поля {error}"}
+        except (TypeError, ValueError, OSError) as error:
+            return {'ok': False, 'error': str(error)}
+        except Exception as error:  # Ответ клиенту вместо обрыва соединения
+            return {'ok': False, 'error': f"{type(error).__name__}: {error}"}
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    response = await self.handle(request) if isinstance(request, dict) else \
+                        {'ok': False, 'error': "Запрос должен быть JSON-объектом"}
+                except ValueError:
+                    response = {'ok': False, 'error': "Неверный JSON"}
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path: Optional[str] = None, host: str = '127.0.0.1',
+                    port: int = 8765) -> None:
+        """Принимает соединения на Unix-сокете socket_path или на host:port."""
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            server = await asyncio.start_unix_server(self._client, path=socket_path)
+        else:
+            server = await asyncio.start_server(self._client, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        """Останавливает пулы и фиксирует несохраненные дописывания."""
+        if self._writer is not None:
+            self._writer.cancel()
+        self._pool.shutdown()
+        self._writer_pool.shutdown()
+        if self._appender is not None:
+            self._appender.close()
+
+
+def send(request: dict, socket_path: Optional[str] = None, host: str = '127.0.0.1', port: int = 8765) -> dict:
+    """Синхронный клиент: отправляет один запрос и возвращает ответ."""
+    if socket_path:
+        connection = socket.socket(socket.AF_UNIX)
+        connection.connect(socket_path)
+    else:
+        connection = socket.create_connection((host, port))
+    with connection, connection.makefile('rwb') as stream:
+        stream.write(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+        stream.flush()
+        return json.loads(stream.readline())
+
+
+def main() -> None:
+    """Командная строка: запуск сервиса."""
+    parser = argparse.ArgumentParser(description="Сервис запросов к файлу записей")
+    parser.add_argument('filename', nargs='?', default=SecondTask.FILENAME)
+    parser.add_argument('--socket', help="Путь к Unix-сокету (иначе TCP на localhost)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, help="Размер пула поиска")
+    parser.add_argument('--threads', action='store_true', help="Пул потоков вместо процессов")
+    args = parser.parse_args()
+
+    server = QueryServer(args.filename, args.workers, processes=not args.threads)
+    try:
+        asyncio.run(server.serve(args.socket, port=args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
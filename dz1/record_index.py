@@ -0,0 +1,335 @@
+import argparse
+import glob
+import json
+import os
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+COLUMNS = ('timestamp', 'value')
+STATUSES = ("ACTIVE", "PENDING", "COMPLETED", "FAILED")  # Как в FirstTask.generate_record
+UNKNOWN_STATUS = 255
+
+# Строка индекса: ключ столбца, смещение строки в файле, код статуса
+INDEX_DTYPE = np.dtype([('key', '<i8'), ('offset', '<i8'), ('status', 'u1')])
+
+_STATUS_CODES = {status.encode(): code for code, status in enumerate(STATUSES)}
+
+
+def index_path(filename: str, column: str) -> str:
+    """Путь к файлу индекса столбца (рядом с файлом данных)."""
+    return f"{filename}.{column}.idx.npy"
+
+
+def meta_path(filename: str) -> str:
+    """Путь к описанию индексов: по нему определяется, не устарели ли они."""
+    return f"{filename}.idx.json"
+
+
+def timestamp_key(text: str, upper: bool = False) -> int:
+    """Ключ времени: цифры 'ГГГГ-ММ-ДД чч:мм:сс' как одно целое ГГГГММДДччммсс.
+
+    Порядок таких чисел совпадает с хронологическим. Неполная запись
+    дополняется началом (или, при upper=True, концом) периода.
+
+    Args:
+        text: Дата или дата со временем, например '2024-05-01' или '2024-05-01 12:30'.
+        upper: Дополнять ли до конца периода (для верхней границы).
+    """
+    digits = ''.join(ch for ch in text if ch.isdigit())
+    if len(digits) < 4 or len(digits) > 14 or len(digits) % 2:
+        raise ValueError(f"Неверный формат времени: {text}")
+    # День 31 годится верхней границей для любого месяца: сравниваются только числа
+    fill = "1231235959" if upper else "0101000000"
+    return int(digits + fill[len(digits) - 4:])
+
+
+def value_key(text: str) -> int:
+    """Ключ значения: сумма в сотых (значения в файле хранятся с двумя знаками)."""
+    return round(float(text) * 100)
+
+
+def _parse_timestamp(raw: bytes) -> int:
+    return int(raw.replace(b'-', b'').replace(b' ', b'').replace(b':', b''))
+
+
+def _signature(filename: str) -> Dict[str, int]:
+    """Признаки версии файла данных: перезапись через os.replace меняет inode и время."""
+    stat = os.stat(filename)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'inode': stat.st_ino}
+
+
+def delta_path(filename: str, column: str, run: int) -> str:
+    """Путь к отсортированной серии дописанных записей (добавления без перестройки основного индекса)."""
+    return f"{filename}.{column}.delta{run}.npy"
+
+
+def _remove_deltas(filename: str) -> None:
+    for column in COLUMNS:
+        for path in glob.glob(glob.escape(f"{filename}.{column}.delta") + '*.npy'):
+            os.remove(path)
+
+
+def _scan(filename: str, start: int = 0) -> Tuple[Dict[str, np.ndarray], int]:
+    """Разбирает записи файла, начиная со смещения start (0 — с заголовка).
+
+    Returns:
+        Кортеж (строки индекса каждого столбца в порядке файла, конец разобранной части).
+        Неполная последняя строка (без перевода строки) не разбирается.
+    """
+    timestamps, values, offsets = array('q'), array('q'), array('q')
+    statuses = bytearray()
+
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        position = start if start else len(file.readline())  # Заголовок
+        for line in file:
+            if not line.endswith(b'\n'):
+                break
+            parts = line.split(b';')
+            if len(parts) == 5:
+                try:
+                    timestamp, value = _parse_timestamp(parts[2]), round(float(parts[3]) * 100)
+                    if not -2 ** 63 <= value < 2 ** 63:
+                        raise OverflowError
+                except (ValueError, OverflowError):  # Например, значение inf: строка не индексируется
+                    timestamp = None
+                if timestamp is not None:
+                    timestamps.append(timestamp)
+                    values.append(value)
+                    offsets.append(position)
+                    statuses.append(_STATUS_CODES.get(parts[1], UNKNOWN_STATUS))
+            position += len(line)
+
+    count = len(offsets)
+    rows = {}
+    for column, keys in zip(COLUMNS, (timestamps, values)):
+        index = np.empty(count, dtype=INDEX_DTYPE)
+        if count:
+            index['key'] = np.frombuffer(keys, dtype='<i8')
+            index['offset'] = np.frombuffer(offsets, dtype='<i8')
+            index['status'] = np.frombuffer(bytes(statuses), dtype='u1')
+        rows[column] = index
+    return rows, position
+
+
+def _read_meta(filename: str) -> Optional[dict]:
+    try:
+        with open(meta_path(filename)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(filename: str, source: Dict[str, int], records: int, runs: Sequence[int] = ()) -> None:
+    with open(meta_path(filename), 'w') as file:
+        json.dump({'source': source, 'records': records, 'runs': list(runs)}, file)
+
+
+def build_indexes(filename: str) -> int:
+    """Строит индексы по всем столбцам COLUMNS за один проход по файлу.
+
+    Returns:
+        Количество проиндексированных записей.
+    """
+    signature = _signature(filename)
+    rows, end = _scan(filename)
+    for column, index in rows.items():
+        index.sort(order='key', kind='stable')
+        np.save(index_path(filename, column), index, allow_pickle=False)
+    _remove_deltas(filename)
+
+    count = len(rows[COLUMNS[0]])
+    signature['size'] = end
+    _write_meta(filename, signature, count)
+    return count
+
+
+def _merge(parts: List[np.ndarray]) -> np.ndarray:
+    # Части упорядочены от старых к новым: устойчивая сортировка сохраняет порядок равных ключей
+    merged = np.concatenate(parts)
+    merged.sort(order='key', kind='stable')
+    return merged
+
+
+def extend_indexes(filename: str) -> int:
+    """Дописывает в индексы записи, добавленные в конец файла после их построения.
+
+    Новые строки каждого вызова сортируются отдельно и сохраняются
+    небольшой серией-дельтой; основной индекс и прежние серии не
+    перечитываются. Соседние серии сливаются, когда более старая не больше
+    новой, поэтому размеры серий убывают и их O(log n), а каждая запись
+    переписывается O(log n) раз. Когда серии вместе вырастают до 1/8
+    основного индекса, все сливается в него. Если файл не просто дописан
+    (другой inode или меньше размер), индексы строятся заново.
+
+    Returns:
+        Количество новых проиндексированных записей.
+    """
+    meta = _read_meta(filename)
+    current = _signature(filename)
+    if (meta is None or 'runs' not in meta or meta['source']['inode'] != current['inode']
+            or meta['source']['size'] > current['size']
+            or not all(os.path.exists(index_path(filename, column)) for column in COLUMNS)):
+        return build_indexes(filename)
+
+    rows, end = _scan(filename, meta['source']['size'])
+    added = len(rows[COLUMNS[0]])
+    runs = meta['runs']
+    if added:
+        if (sum(runs) + added) * 8 > meta['records'] - sum(runs):
+            for column, new_rows in rows.items():
+                parts = [np.load(index_path(filename, column), allow_pickle=False)]
+                parts += [np.load(delta_path(filename, column, run), allow_pickle=False)
+                          for run in range(len(runs))]
+                np.save(index_path(filename, column), _merge(parts + [new_rows]), allow_pickle=False)
+            _remove_deltas(filename)
+            runs = []
+        else:
+            for column, new_rows in rows.items():
+                new_rows.sort(order='key', kind='stable')
+                np.save(delta_path(filename, column, len(runs)), new_rows, allow_pickle=False)
+            runs.append(added)
+            while len(runs) > 1 and runs[-2] <= runs[-1]:
+                older, newer = len(runs) - 2, len(runs) - 1
+                for column in COLUMNS:
+                    parts = [np.load(delta_path(filename, column, run), allow_pickle=False)
+                             for run in (older, newer)]
+                    np.save(delta_path(filename, column, older), _merge(parts), allow_pickle=False)
+                    os.remove(delta_path(filename, column, newer))
+                runs[-2:] = [runs[-2] + runs[-1]]
+
+    current['size'] = end
+    _write_meta(filename, current, meta['records'] + added, runs)
+    return added
+
+
+def invalidate(filename: str) -> None:
+    """Удаляет индексы файла (например, после его перезаписи)."""
+    paths = [meta_path(filename)] + [index_path(filename, column) for column in COLUMNS]
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+    _remove_deltas(filename)
+
+
+def is_fresh(filename: str) -> bool:
+    """Соответствуют ли индексы текущему содержимому файла."""
+    meta = _read_meta(filename)
+    if meta is None:
+        return False
+    current = _signature(filename)
+    source = meta.get('source', {})
+    # Индексируются только полные строки: незавершенный хвост не делает индекс устаревшим
+    return (source.get('inode') == current['inode'] and source.get('mtime_ns') == current['mtime_ns']
+            and source.get('size', -1) <= current['size']
+            and all(os.path.exists(index_path(filename, column)) for column in COLUMNS))
+
+
+def refresh(filename: str) -> None:
+    """Приводит индексы в соответствие с файлом: дописывает новое или строит заново."""
+    if not is_fresh(filename):
+        extend_indexes(filename)
+
+
+def load_index(filename: str, column: str) -> List[np.ndarray]:
+    """Отображает индекс столбца в память, при необходимости обновляя индексы.
+
+    Returns:
+        Список отсортированных частей: основной индекс, затем серии-дельты дописанных записей.
+    """
+    if column not in COLUMNS:
+        raise ValueError(f"Нет индекса по столбцу {column}")
+    refresh(filename)
+    runs = _read_meta(filename)['runs']
+    return [np.load(path, mmap_mode='r', allow_pickle=False)
+            for path in [index_path(filename, column)]
+            + [delta_path(filename, column, run) for run in range(len(runs))]]
+
+
+def _key_bounds(column: str, lo: Optional[str], hi: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    if column == 'timestamp':
+        return (timestamp_key(lo) if lo else None,
+                timestamp_key(hi, upper=True) if hi else None)
+    return (value_key(lo) if lo else None,
+            value_key(hi) if hi else None)
+
+
+def find_offsets(filename: str, column: str, lo: Optional[str] = None, hi: Optional[str] = None,
+                 status: Optional[str] = None) -> np.ndarray:
+    """Смещения записей, у которых значение столбца в [lo, hi] (и статус равен status).
+
+    Границы ищутся бинарным поиском по отображенному индексу; фильтр по
+    статусу применяется только к строкам найденного отрезка.
+
+    Returns:
+        Смещения строк в порядке возрастания ключа.
+    """
+    lo_key, hi_key = _key_bounds(column, lo, hi)
+    parts = []
+    for index in load_index(filename, column):
+        keys = index['key']
+        start = int(np.searchsorted(keys, lo_key, side='left')) if lo_key is not None else 0
+        stop = int(np.searchsorted(keys, hi_key, side='right')) if hi_key is not None else len(keys)
+        parts.append(index[start:stop])
+    rows = parts[0] if len(parts) == 1 else np.concatenate(parts)
+    if len(parts) > 1:
+        rows = rows[np.argsort(rows['key'], kind='stable')]
+    if status:
+        code = _STATUS_CODES.get(status.upper().encode())
+        if code is None:
+            return np.empty(0, dtype='<i8')
+        rows = rows[rows['status'] == code]
+    return np.asarray(rows['offset'])
+
+
+def read_lines(filename: str, offsets: np.ndarray) -> Iterator[str]:
+    """Читает строки файла по смещениям, не просматривая остальной файл."""
+    with open(filename, 'rb') as file:
+        for offset in offsets:
+            file.seek(int(offset))
+            yield file.readline().decode('utf-8').rstrip('\r\n')
+
+
+def range_query(filename: str, column: str, lo: Optional[str] = None, hi: Optional[str] = None,
+                status: Optional[str] = None) -> Iterator[str]:
+    """Записи со значением столбца в [lo, hi], по возрастанию значения.
+
+    Args:
+        filename: Файл с записями (формат FirstTask.generate_record).
+        column: 'timestamp' или 'value'.
+        lo: Нижняя граница ('2024-05-01', '2024-05-01 12:00' или число) или None.
+        hi: Верхняя граница (включительно; неполная дата — до конца периода) или None.
+        status: Оставить только записи с этим статусом.
+    """
+    return read_lines(filename, find_offsets(filename, column, lo, hi, status))
+
+
+def main() -> None:
+    """Командная строка: построение индексов и запросы по диапазону."""
+    parser = argparse.ArgumentParser(description="Индексы по времени и значению для файла записей")
+    parser.add_argument('filename', nargs='?', default="large_data.txt")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('build', help="Построить индексы заново")
+
+    query_parser = subparsers.add_parser('query', help="Записи из диапазона")
+    query_parser.add_argument('column', choices=COLUMNS)
+    query_parser.add_argument('--from', dest='lo', help="Нижняя граница (включительно)")
+    query_parser.add_argument('--to', dest='hi', help="Верхняя граница (включительно)")
+    query_parser.add_argument('--status', help="Статус записи")
+    query_parser.add_argument('--limit', type=int, default=10, help="Сколько записей показать")
+
+    args = parser.parse_args()
+    if args.command == 'build':
+        print(f"Проиндексировано записей: {build_indexes(args.filename)}")
+        return
+
+    offsets = find_offsets(args.filename, args.column, args.lo, args.hi, args.status)
+    print(f"Найдено записей: {len(offsets)}")
+    for line in read_lines(args.filename, offsets[:args.limit]):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
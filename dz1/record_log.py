@@ -0,0 +1,270 @@
+import json
+import math
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import List, Optional
+
+import record_index
+
+# Кадр журнала: длина и CRC32 строки, затем сама строка
+_FRAME = struct.Struct('<II')
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def wal_path(filename: str) -> str:
+    """Путь к журналу упреждающей записи (рядом с файлом данных)."""
+    return f"{filename}.wal"
+
+
+def seq_path(filename: str) -> str:
+    """Путь к счетчику: следующий id и размер файла, для которого он верен."""
+    return f"{filename}.seq"
+
+
+def format_record(record_id: int, status: str, timestamp: str, value: float, tags: str) -> str:
+    """Строка записи в формате FirstTask.generate_record."""
+    return f"{record_id:09d};{status};{timestamp};{value:.2f};{tags}"
+
+
+def check_fields(status: str, value: float, tags: str, timestamp: Optional[str]) -> None:
+    """Проверяет поля записи до того, как ей будет выдан id.
+
+    Строка должна разбираться индексом и поиском: статус из STATUSES,
+    конечное значение, теги без ';' и переводов строки, время строго в
+    виде 'ГГГГ-ММ-ДД чч:мм:сс' с ведущими нулями (ключ индекса — его цифры).
+
+    Raises:
+        ValueError: Если поле не годится.
+    """
+    if status not in record_index.STATUSES:
+        raise ValueError(f"Неизвестный статус: {status}")
+    if not math.isfinite(value) or abs(value) * 100 >= 2 ** 63:  # Ключ индекса — сотые в int64
+        raise ValueError(f"Неверное значение: {value}")
+    if any(ch in tags for ch in ';\r\n'):
+        raise ValueError("Теги не должны содержать ';' и переводов строки")
+    if timestamp is not None:
+        try:
+            canonical = datetime.strptime(timestamp, TIMESTAMP_FORMAT).strftime(TIMESTAMP_FORMAT) == timestamp
+        except ValueError:
+            canonical = False
+        if not canonical:
+            raise ValueError(f"Время должно быть в виде ГГГГ-ММ-ДД чч:мм:сс: {timestamp!r}")
+
+
+def _read_wal(path: str) -> List[bytes]:
+    """Строки из целых кадров журнала; чтение останавливается на оборванном или испорченном кадре."""
+    entries = []
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+    except FileNotFoundError:
+        return entries
+
+    position = 0
+    while position + _FRAME.size <= len(data):
+        length, crc = _FRAME.unpack_from(data, position)
+        payload = data[position + _FRAME.size:position + _FRAME.size + length]
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            break
+        entries.append(payload)
+        position += _FRAME.size + length
+    return entries
+
+
+def _cut_torn_tail(file) -> None:
+    """Обрезает файл после последнего перевода строки (недописанную строку)."""
+    end = file.seek(0, os.SEEK_END)
+    position = end
+    while position > 0:
+        start = max(0, position - 65536)
+        file.seek(start)
+        chunk = file.read(position - start)
+        newline = chunk.rfind(b'\n')
+        if newline != -1:
+            cut = start + newline + 1
+            break
+        position = start
+    else:
+        cut = 0
+    if cut != end:
+        file.truncate(cut)
+
+
+def recover(filename: str) -> int:
+    """Доводит до файла данных записи, оставшиеся в журнале после сбоя.
+
+    Сначала отрезается оборванная строка в конце файла, затем дописываются
+    те строки журнала, которых еще нет в конце файла (часть из них могла
+    успеть записаться до сбоя). Журнал после этого очищается.
+
+    Returns:
+        Количество дописанных строк.
+    """
+    path = wal_path(filename)
+    entries = _read_wal(path)
+    if not entries:
+        if os.path.exists(path):
+            os.truncate(path, 0)
+        return 0
+
+    with open(filename, 'r+b') as file:
+        _cut_torn_tail(file)
+        end = file.seek(0, os.SEEK_END)
+        file.seek(max(0, end - sum(map(len, entries))))
+        tail = file.read()
+        # Записи журнала уходят в файл по порядку: в файле уже есть какой-то их префикс
+        written = next(k for k in range(len(entries), -1, -1) if tail.endswith(b''.join(entries[:k])))
+        missing = entries[written:]
+        file.write(b''.join(missing))
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.truncate(path, 0)
+    return len(missing)
+
+
+class RecordAppender:
+    """Добавление записей в конец файла данных через журнал упреждающей записи.
+
+    Каждая запись сначала попадает в журнал кадром с длиной и CRC32, затем
+    пачкой дописывается в файл данных. Сбой в любой момент не оставляет в
+    файле оборванной строки: recover() при следующем открытии отрезает ее и
+    дописывает записи из журнала.
+
+    fsync делается не на каждую запись, а на пачку (групповая фиксация):
+    после sync_every записей или через max_delay секунд после первой
+    неподтвержденной — по таймеру, даже если новых append не будет.
+    Записи, которые еще не зафиксированы, при сбое могут пропасть — но
+    только целиком.
+    """
+
+    def __init__(self, filename: str, sync_every: int = 256, max_delay: float = 0.05):
+        """
+        Args:
+            filename: Файл данных с заголовком (формат FirstTask.generate_large_file)
+            sync_every: Наибольшее число записей в одной пачке
+            max_delay: Наибольшее время ожидания пачки, секунды (inf — без таймера,
+                пачку фиксирует вызывающий через flush())
+        """
+        self.filename = filename
+        self.sync_every = sync_every
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._pending: List[bytes] = []
+        self._first_pending: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+
+        recover(filename)
+        self.next_id = self._load_next_id()
+        self._wal = open(wal_path(filename), 'ab')
+
+    def _load_next_id(self) -> int:
+        """Следующий id: из счетчика, если файл с тех пор не менялся, иначе просмотром файла."""
+        try:
+            with open(seq_path(self.filename)) as file:
+                seq = json.load(file)
+            if seq['size'] == os.path.getsize(self.filename):
+                return seq['next_id']
+        except (OSError, ValueError, KeyError):
+            pass
+
+        # SecondTask переставляет записи, поэтому последняя строка не обязательно с наибольшим id
+        last_id = -1
+        with open(self.filename, 'rb') as file:
+            file.readline()  # Заголовок
+            for line in file:
+                record_id = line.split(b';', 1)[0]
+                if record_id.isdigit():
+                    last_id = max(last_id, int(record_id))
+        return last_id + 1
+
+    def _save_next_id(self) -> None:
+        temp = seq_path(self.filename) + '.tmp'
+        with open(temp, 'w') as file:
+            json.dump({'next_id': self.next_id, 'size': os.path.getsize(self.filename)}, file)
+        os.replace(temp, seq_path(self.filename))
+
+    def append(self, status: str, value: float, tags: str, timestamp: Optional[str] = None) -> int:
+        """Добавляет запись со следующим id за амортизированное O(1).
+
+        Args:
+            status: Один из record_index.STATUSES
+            value: Значение (хранится с двумя знаками)
+            tags: Теги через запятую
+            timestamp: 'ГГГГ-ММ-ДД чч:мм:сс' или None — текущее время
+
+        Returns:
+            Назначенный id.
+
+        Raises:
+            ValueError: Поле не прошло check_fields; id при этом не расходуется.
+        """
+        check_fields(status, value, tags, timestamp)
+        if timestamp is None:
+            timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+
+        with self._lock:
+            record_id = self.next_id
+            payload = (format_record(record_id, status, timestamp, value, tags) + '\n').encode('utf-8')
+            self._wal.write(_FRAME.pack(len(payload), zlib.crc32(payload)) + payload)
+            self._pending.append(payload)
+            self.next_id += 1
+
+            now = time.monotonic()
+            if self._first_pending is None:
+                self._first_pending = now
+                if math.isfinite(self.max_delay):
+                    # Без таймера одиночная запись ждала бы следующего append
+                    self._timer = threading.Timer(self.max_delay, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+            if len(self._pending) >= self.sync_every or now - self._first_pending >= self.max_delay:
+                self._flush()
+        return record_id
+
+    def flush(self) -> None:
+        """Фиксирует накопленные записи в файле данных и индексах."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending or self._wal.closed:
+            return
+        # Точка фиксации: после fsync журнала записи переживут сбой
+        self._wal.flush()
+        os.fsync(self._wal.fileno())
+
+        with open(self.filename, 'ab') as file:
+            file.write(b''.join(self._pending))
+            file.flush()
+            os.fsync(file.fileno())
+        self._pending.clear()
+        self._first_pending = None
+
+        # Записи в файле данных: журнал больше не нужен
+        self._wal.seek(0)
+        self._wal.truncate()
+        self._save_next_id()
+        if os.path.exists(record_index.meta_path(self.filename)):
+            record_index.extend_indexes(self.filename)
+
+    def close(self) -> None:
+        """Фиксирует оставшиеся записи и закрывает журнал."""
+        with self._lock:
+            if self._wal.closed:
+                return
+            self._flush()
+            self._wal.close()
+
+    def __enter__(self) -> 'RecordAppender':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
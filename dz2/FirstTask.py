@@ -1,5 +1,8 @@
 import random
-from typing import List
+from typing import Iterable, List, Optional
+
+import array_storage
+import search_algorithms
 
 
 def generate_random_array(size: int) -> List[int]:
@@ -14,28 +17,26 @@ def write_array_to_file(filename: str, array: List[int]) -> None:
 
 
 def read_array_from_file(filename: str) -> List[int]:
-    """Читает массив из файла, где каждое число на новой строке."""
+    """Читает массив из файла, где каждое число на новой строке.
+
+    Бинарные файлы (.npy / raw int64) распознаются автоматически и читаются через array_storage.
+    """
+    if array_storage.detect_format(filename) != array_storage.FORMAT_TEXT:
+        return array_storage.load_array(filename).tolist()
     with open(filename, 'r') as file:
         return [int(line.strip()) for line in file if line.strip()]
 
 
-def linear_search(array: List[int], target: int) -> int:
-    """Выполняет линейный поиск и возвращает количество сравнений."""
-    comparisons = 0
-    for element in array:
-        comparisons += 1
-        if element == target:
-            break
-    return comparisons
-
+def calculate_average_comparisons(array: List[int], num_queries: int = 100_000,
+                                  queries: Optional[Iterable[int]] = None) -> float:
+    """Вычисляет среднее количество сравнений для заданного массива.
 
-def calculate_average_comparisons(array: List[int], num_queries: int = 100_000) -> float:
-    """Вычисляет среднее количество сравнений для заданного массива."""
-    total_comparisons = 0
-    for _ in range(num_queries):
-        target = random.choice(array)
-        total_comparisons += linear_search(array, target)
-    return total_comparisons / num_queries
+    Запросы по умолчанию — num_queries случайных элементов массива; можно
+    передать свой поток, например workload.iter_queries(workload.trace_batches(...)).
+    """
+    if queries is None:
+        queries = (random.choice(array) for _ in range(num_queries))
+    return search_algorithms.average_comparisons('linear', array, queries)
 
 
 def run_experiment(filename: str) -> None:
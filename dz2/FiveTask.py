@@ -1,5 +1,5 @@
 import numpy as np
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 
 class Condition:
@@ -93,12 +93,17 @@ def run_performance_test(
     return avg_unsorted, avg_sorted, speedup
 
 
-def main():
-    """Основная функция для взаимодействия с пользователем."""
+def main(num_conditions: Optional[int] = None):
+    """Основная функция для взаимодействия с пользователем.
+
+    Args:
+        num_conditions: Количество условий; если не задано, спрашивается у пользователя
+    """
     NUM_TESTS = 1000
 
     print("Оптимизация порядка выполнения проверок")
-    num_conditions = int(input("Введите количество условий для тестирования: "))
+    if num_conditions is None:
+        num_conditions = int(input("Введите количество условий для тестирования: "))
 
     unsorted_time, sorted_time, speedup = run_performance_test(
         NUM_TESTS, num_conditions
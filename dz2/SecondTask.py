@@ -1,7 +1,9 @@
 import random
-from typing import List, Dict, Callable
+from typing import List, Dict, Callable, Iterable, Optional
 import numpy as np
 
+import search_algorithms
+
 NUM_RECORDS = 10_000  # Количество записей в ленте
 SEARCH_ITERATIONS = 1_000  # Количество тестов поиска для оценки
 
@@ -31,53 +33,23 @@ def generate_tape(distribution: str, size: int) -> List[int]:
     return generators[distribution]().tolist()
 
 
-def linear_search(tape: List[int], target: int) -> int:
-    """Выполняет линейный поиск и возвращает количество сравнений."""
-    comparisons = 0
-    for item in tape:
-        comparisons += 1
-        if item == target:
-            break
-    return comparisons
-
-
-def binary_search(sorted_tape: List[int], target: int) -> int:
-    """Выполняет бинарный поиск в отсортированном массиве и возвращает количество сравнений."""
-    left, right = 0, len(sorted_tape) - 1
-    comparisons = 0
-
-    while left <= right:
-        mid = (left + right) // 2
-        comparisons += 1
-
-        if sorted_tape[mid] == target:
-            return comparisons
-        elif sorted_tape[mid] < target:
-            left = mid + 1
-        else:
-            right = mid - 1
-
-    return comparisons
-
-
-def evaluate_search_performance(tape: List[int], is_ordered: bool = False) -> float:
+def evaluate_search_performance(tape: List[int], is_ordered: bool = False,
+                                queries: Optional[Iterable[int]] = None) -> float:
     """Оценивает среднюю стоимость поиска для заданной ленты.
 
     Аргументы:
         tape: лента данных для поиска
         is_ordered: флаг, указывающий на отсортированность ленты
+        queries: поток запросов (например, из workload); по умолчанию
+            SEARCH_ITERATIONS случайных элементов ленты
 
     Возвращает:
         Среднее количество сравнений при поиске
     """
-    search_function = binary_search if is_ordered else linear_search
-    total_comparisons = 0
-
-    for _ in range(SEARCH_ITERATIONS):
-        target = random.choice(tape)
-        total_comparisons += search_function(tape, target)
-
-    return total_comparisons / SEARCH_ITERATIONS
+    algorithm = 'binary' if is_ordered else 'linear'
+    if queries is None:
+        queries = (random.choice(tape) for _ in range(SEARCH_ITERATIONS))
+    return search_algorithms.average_comparisons(algorithm, tape, queries)
 
 
 def run_experiments() -> None:
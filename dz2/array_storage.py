@@ -0,0 +1,215 @@
+import argparse
+import os
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+FORMAT_TEXT = "text"
+FORMAT_NPY = "npy"
+FORMAT_RAW = "raw"
+
+DTYPE = np.dtype('<i8')  # Все форматы хранят 64-битные целые (little-endian)
+NPY_MAGIC = b'\x93NUMPY'
+TEXT_CHUNK_BYTES = 8 * 1024 * 1024  # Размер блока при потоковом чтении текста
+
+_EXTENSIONS = {'.npy': FORMAT_NPY, '.bin': FORMAT_RAW, '.raw': FORMAT_RAW, '.txt': FORMAT_TEXT}
+_TEXT_BYTES = frozenset(b'0123456789+- \t\r\n')
+
+
+def detect_format(filename: str) -> str:
+    """Определяет формат файла с массивом по его содержимому.
+
+    Args:
+        filename: Путь к файлу.
+
+    Returns:
+        Одно из значений FORMAT_TEXT, FORMAT_NPY, FORMAT_RAW.
+    """
+    with open(filename, 'rb') as file:
+        head = file.read(4096)
+
+    if head.startswith(NPY_MAGIC):
+        return FORMAT_NPY
+    if all(byte in _TEXT_BYTES for byte in head):
+        return FORMAT_TEXT
+    return FORMAT_RAW
+
+
+def format_from_extension(filename: str) -> Optional[str]:
+    """Возвращает формат по расширению файла или None, если расширение неизвестно."""
+    return _EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+
+
+def write_npy(filename: str, array: Iterable[int]) -> None:
+    """Записывает массив в формате .npy (заголовок + сырые int64)."""
+    np.save(filename, np.asarray(array, dtype=DTYPE), allow_pickle=False)
+
+
+def write_raw(filename: str, array: Iterable[int]) -> None:
+    """Записывает массив как сырые int64 без заголовка."""
+    np.asarray(array, dtype=DTYPE).tofile(filename)
+
+
+def write_text(filename: str, array: Iterable[int]) -> None:
+    """Записывает массив в текстовом формате, совместимом с FirstTask.write_array_to_file."""
+    with open(filename, 'w') as file:
+        file.write('\n'.join(map(str, array)))
+
+
+def read_memmap(filename: str, fmt: Optional[str] = None) -> np.ndarray:
+    """Отображает бинарный файл в память без копирования данных.
+
+    Args:
+        filename: Путь к файлу в формате .npy или raw.
+        fmt: Формат файла; если не указан, определяется автоматически.
+
+    Returns:
+        Массив numpy только для чтения, данные подгружаются с диска по требованию.
+
+    Raises:
+        ValueError: если файл текстовый.
+    """
+    fmt = fmt or detect_format(filename)
+    if fmt == FORMAT_NPY:
+        return np.load(filename, mmap_mode='r', allow_pickle=False)
+    if fmt == FORMAT_RAW:
+        if os.path.getsize(filename) == 0:
+            return np.empty(0, dtype=DTYPE)
+        return np.memmap(filename, dtype=DTYPE, mode='r')
+    raise ValueError(f"Файл {filename} текстовый, отображение в память невозможно")
+
+
+def iter_text_chunks(filename: str, chunk_bytes: int = TEXT_CHUNK_BYTES) -> Iterator[np.ndarray]:
+    """Потоково читает текстовый файл (число на строке) блоками фиксированного размера.
+
+    Args:
+        filename: Путь к текстовому файлу.
+        chunk_bytes: Примерный размер читаемого блока в байтах.
+
+    Yields:
+        Массивы int64 с очередной порцией чисел.
+    """
+    tail = b''
+    with open(filename, 'rb') as file:
+        while True:
+            block = file.read(chunk_bytes)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b'\n') + 1
+            if cut == 0:
+                # В блоке нет ни одного полного числа — читаем дальше
+                tail = block
+                continue
+            tail = block[cut:]
+            values = block[:cut].split()
+            if values:
+                yield np.array(values, dtype=DTYPE)
+
+    values = tail.split()
+    if values:
+        yield np.array(values, dtype=DTYPE)
+
+
+def iter_chunks(filename: str, chunk_size: int = TEXT_CHUNK_BYTES // DTYPE.itemsize,
+                fmt: Optional[str] = None) -> Iterator[np.ndarray]:
+    """Потоково читает массив любого формата порциями примерно по chunk_size элементов."""
+    fmt = fmt or detect_format(filename)
+    if fmt == FORMAT_TEXT:
+        yield from iter_text_chunks(filename, chunk_size * DTYPE.itemsize)
+        return
+
+    data = read_memmap(filename, fmt)
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+
+def load_array(filename: str, fmt: Optional[str] = None) -> np.ndarray:
+    """Загружает массив с автоопределением формата.
+
+    Бинарные форматы отображаются в память (без копирования), текстовый
+    читается потоково и собирается в один массив.
+    """
+    fmt = fmt or detect_format(filename)
+    if fmt != FORMAT_TEXT:
+        return read_memmap(filename, fmt)
+
+    chunks = list(iter_text_chunks(filename))
+    if not chunks:
+        return np.empty(0, dtype=DTYPE)
+    return np.concatenate(chunks)
+
+
+def convert(src: str, dst: str, dst_fmt: Optional[str] = None) -> int:
+    """Преобразует файл с массивом в другой формат, не загружая его целиком.
+
+    Args:
+        src: Исходный файл (формат определяется автоматически).
+        dst: Файл назначения.
+        dst_fmt: Формат назначения; по умолчанию определяется по расширению dst.
+
+    Returns:
+        Количество записанных элементов.
+    """
+    src_fmt = detect_format(src)
+    dst_fmt = dst_fmt or format_from_extension(dst)
+    if dst_fmt is None:
+        raise ValueError(f"Не удалось определить формат для {dst}, укажите его явно")
+
+    if dst_fmt == FORMAT_NPY:
+        # Заголовку .npy нужна длина заранее: для текста считаем её первым проходом
+        if src_fmt == FORMAT_TEXT:
+            total = sum(len(chunk) for chunk in iter_text_chunks(src))
+        else:
+            total = len(read_memmap(src, src_fmt))
+        out = np.lib.format.open_memmap(dst, mode='w+', dtype=DTYPE, shape=(total,))
+        position = 0
+        for chunk in iter_chunks(src, fmt=src_fmt):
+            out[position:position + len(chunk)] = chunk
+            position += len(chunk)
+        out.flush()
+        del out
+        return total
+
+    total = 0
+    with open(dst, 'wb') as file:
+        for chunk in iter_chunks(src, fmt=src_fmt):
+            if dst_fmt == FORMAT_RAW:
+                np.ascontiguousarray(chunk, dtype=DTYPE).tofile(file)
+            elif dst_fmt == FORMAT_TEXT:
+                if total:
+                    file.write(b'\n')
+                file.write('\n'.join(map(str, chunk.tolist())).encode('ascii'))
+            else:
+                raise ValueError(f"Неизвестный формат: {dst_fmt}")
+            total += len(chunk)
+    return total
+
+
+def main() -> None:
+    """Командная строка: преобразование форматов и информация о файле."""
+    parser = argparse.ArgumentParser(description="Хранение массивов: text / npy / raw")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    convert_parser = subparsers.add_parser('convert', help="Преобразовать файл в другой формат")
+    convert_parser.add_argument('src')
+    convert_parser.add_argument('dst')
+    convert_parser.add_argument('--to', choices=(FORMAT_TEXT, FORMAT_NPY, FORMAT_RAW),
+                                help="Формат назначения (по умолчанию — по расширению)")
+
+    info_parser = subparsers.add_parser('info', help="Показать формат и размер массива")
+    info_parser.add_argument('filename')
+
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        count = convert(args.src, args.dst, args.to)
+        print(f"Записано {count} элементов в {args.dst}")
+    else:
+        fmt = detect_format(args.filename)
+        count = sum(len(chunk) for chunk in iter_chunks(args.filename, fmt=fmt))
+        print(f"Формат: {fmt}, элементов: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Iterable, List, Optional, Sequence
+
+# Каждый алгоритм есть в двух вариантах. Быстрый ничего не считает: линейный
+# поиск — list.index, бинарный — bisect, оба на C. Инструментированный
+# вызывается, только если переданы хуки, и сообщает им число сравнений,
+# время и (если хуку нужно) позиции проб. Выбор делается один раз на вызов,
+# внутри циклов проверок нет.
+
+
+class ComparisonCounter:
+    """Хук: суммарное число сравнений и время по всем поискам."""
+
+    wants_probes = False
+
+    def __init__(self):
+        self.searches = 0
+        self.comparisons = 0
+        self.seconds = 0.0
+
+    def on_search(self, algorithm: str, target, index: int, comparisons: int, seconds: float,
+                  probes: Optional[List[int]]) -> None:
+        self.searches += 1
+        self.comparisons += comparisons
+        self.seconds += seconds
+
+    @property
+    def average(self) -> float:
+        """Среднее число сравнений на поиск."""
+        return self.comparisons / self.searches if self.searches else 0.0
+
+
+class ProbeHistogram:
+    """Хук: сколько раз проверялась каждая позиция (память — по числу разных позиций)."""
+
+    wants_probes = True
+
+    def __init__(self):
+        self.positions = Counter()
+
+    def on_search(self, algorithm: str, target, index: int, comparisons: int, seconds: float,
+                  probes: Optional[List[int]]) -> None:
+        self.positions.update(probes)
+
+
+def _notify(hooks: Iterable, algorithm: str, target, index: int, comparisons: int, seconds: float,
+            probes: Optional[List[int]]) -> None:
+    for hook in hooks:
+        hook.on_search(algorithm, target, index, comparisons, seconds, probes)
+
+
+def linear_search(items: Sequence, target, hooks: Sequence = ()) -> int:
+    """Линейный поиск первого вхождения.
+
+    Args:
+        items: Список (у других последовательностей должен быть метод index)
+        target: Искомое значение
+        hooks: Хуки с методом on_search; пусто — быстрый вариант без подсчетов
+
+    Returns:
+        Индекс первого вхождения или -1. Число сравнений — индекс + 1 или
+        len(items) при промахе.
+    """
+    if not hooks:
+        try:
+            return items.index(target)
+        except ValueError:
+            return -1
+
+    started = time.perf_counter()
+    try:
+        index = items.index(target)
+        comparisons = index + 1
+    except ValueError:
+        index, comparisons = -1, len(items)
+    seconds = time.perf_counter() - started
+    # Позиции проб линейного поиска — подряд с начала, их не нужно собирать в цикле
+    probes = list(range(comparisons)) if any(hook.wants_probes for hook in hooks) else None
+    _notify(hooks, 'linear', target, index, comparisons, seconds, probes)
+    return index
+
+
+def binary_search(sorted_items: Sequence, target, hooks: Sequence = ()) -> int:
+    """Бинарный поиск в отсортированной последовательности.
+
+    Инструментированный вариант — классический цикл с остановкой на
+    совпадении в середине (одно сравнение на шаг); быстрый — bisect и
+    находит первое вхождение.
+
+    Args:
+        sorted_items: Последовательность по возрастанию
+        target: Искомое значение
+        hooks: Хуки с методом on_search; пусто — быстрый вариант без подсчетов
+
+    Returns:
+        Индекс вхождения или -1.
+    """
+    if not hooks:
+        index = bisect_left(sorted_items, target)
+        return index if index < len(sorted_items) and sorted_items[index] == target else -1
+
+    probes = [] if any(hook.wants_probes for hook in hooks) else None
+    started = time.perf_counter()
+    left, right = 0, len(sorted_items) - 1
+    comparisons, index = 0, -1
+    while left <= right:
+        mid = (left + right) // 2
+        comparisons += 1
+        if probes is not None:
+            probes.append(mid)
+        value = sorted_items[mid]
+        if value == target:
+            index = mid
+            break
+        elif value < target:
+            left = mid + 1
+        else:
+            right = mid - 1
+    seconds = time.perf_counter() - started
+    _notify(hooks, 'binary', target, index, comparisons, seconds, probes)
+    return index
+
+
+ALGORITHMS = {
+    'linear': linear_search,
+    'binary': binary_search,
+}
+
+
+def average_comparisons(algorithm: str, items: Sequence, queries: Iterable) -> float:
+    """Среднее число сравнений алгоритма на последовательности запросов."""
+    search = ALGORITHMS[algorithm]
+    counter = ComparisonCounter()
+    hooks = (counter,)
+    for target in queries:
+        search(items, target, hooks)
+    return counter.average
@@ -0,0 +1,230 @@
+import argparse
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+import numpy as np
+
+import array_storage
+
+BATCH_SIZE = 65536  # Запросов в порции: память генератора — O(BATCH_SIZE + число ключей)
+
+Seed = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+# Все генераторы выдают запросы порциями (массивами numpy) и никогда не
+# держат весь поток целиком. Одинаковое зерно дает одинаковый поток, поэтому
+# два прохода эксперимента (например, упорядоченный и перемешанный массив)
+# получают одни и те же запросы без их сохранения. Поток не зависит и от
+# batch_size: каждая величина берется из своего генератора по одному числу
+# на запрос, так что порции лишь режут одну и ту же последовательность.
+
+
+def _generator(seed: Seed) -> np.random.Generator:
+    return seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+
+def _streams(seed: Seed, count: int) -> list:
+    """count независимых генераторов, порожденных из seed через SeedSequence."""
+    if isinstance(seed, np.random.Generator):
+        seed = int(seed.integers(2 ** 63))
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in seed.spawn(count)]
+
+
+def _sizes(total: int, batch_size: int) -> Iterator[int]:
+    for start in range(0, total, batch_size):
+        yield min(batch_size, total - start)
+
+
+def distribution_batches(keys: Sequence, probabilities: Sequence[float], total: int,
+                         batch_size: int = BATCH_SIZE, seed: Seed = None) -> Iterator[np.ndarray]:
+    """Запросы к keys с заданными вероятностями.
+
+    Args:
+        keys: Ключи
+        probabilities: Вероятность запроса каждого ключа (нормируются)
+        total: Общее число запросов
+        batch_size: Размер порции
+        seed: Зерно или генератор numpy
+
+    Yields:
+        Массивы ключей длиной batch_size (последний — короче).
+    """
+    keys = np.asarray(keys)
+    cdf = np.cumsum(np.asarray(probabilities, dtype=float))
+    if len(cdf) != len(keys) or not len(cdf) or cdf[-1] <= 0:
+        raise ValueError("Нужна хотя бы одна положительная вероятность на каждый ключ")
+    cdf /= cdf[-1]
+    rng = _generator(seed)
+    for size in _sizes(total, batch_size):
+        # Обратная функция распределения: бинарный поиск по накопленным вероятностям
+        yield keys[np.minimum(np.searchsorted(cdf, rng.random(size), side='right'), len(keys) - 1)]
+
+
+def uniform_batches(keys: Sequence, total: int, batch_size: int = BATCH_SIZE,
+                    seed: Seed = None) -> Iterator[np.ndarray]:
+    """Равновероятные запросы к keys."""
+    keys = np.asarray(keys)
+    rng = _generator(seed)
+    for size in _sizes(total, batch_size):
+        yield keys[rng.integers(0, len(keys), size)]
+
+
+def zipf_weights(count: int, exponent: float = 1.0) -> np.ndarray:
+    """Веса закона Ципфа: ключ ранга r запрашивается пропорционально 1 / r^exponent."""
+    return 1.0 / np.arange(1, count + 1, dtype=float) ** exponent
+
+
+def zipf_batches(keys: Sequence, total: int, exponent: float = 1.0, batch_size: int = BATCH_SIZE,
+                 seed: Seed = None, shuffle: bool = True) -> Iterator[np.ndarray]:
+    """Запросы по закону Ципфа.
+
+    Args:
+        keys: Ключи
+        total: Общее число запросов
+        exponent: Показатель: 0 — равномерно, больше — сильнее перекос к популярным
+        batch_size: Размер порции
+        seed: Зерно или генератор numpy
+        shuffle: Случайно назначить ранги ключам (иначе keys[0] — самый популярный)
+    """
+    rng = _generator(seed)
+    keys = np.asarray(keys)
+    if shuffle:
+        keys = rng.permutation(keys)
+    return distribution_batches(keys, zipf_weights(len(keys), exponent), total, batch_size, rng)
+
+
+def locality_batches(base: Iterable[np.ndarray], reuse: float = 0.3, window: int = 64, burst: float = 0.0,
+                     burst_length: float = 8.0, seed: Seed = None) -> Iterator[np.ndarray]:
+    """Добавляет к потоку запросов временную локальность и всплески.
+
+    С вероятностью reuse запрос повторяет один из window предыдущих
+    (расстояние равновероятно), с вероятностью burst начинается всплеск —
+    серия одного и того же ключа средней длины burst_length
+    (геометрическое распределение). Остальные запросы берутся из base.
+
+    Args:
+        base: Порции исходного потока, например zipf_batches(...)
+        reuse: Доля повторов недавних запросов
+        window: Насколько далеко назад смотрит повтор
+        burst: Вероятность начала всплеска на каждом запросе
+        burst_length: Средняя длина всплеска
+        seed: Зерно или генератор numpy
+    """
+    if not 0 <= reuse + burst <= 1:
+        raise ValueError("reuse + burst должно быть в [0, 1]")
+    # Свой генератор на каждую величину: иначе их выборки чередовались бы
+    # по-разному при разном размере порций
+    roll_rng, distance_rng, length_rng = _streams(seed, 3)
+    history = None  # Последние window запросов предыдущих порций
+    run_key, run_left = None, 0  # Всплеск может продолжаться в следующей порции
+
+    for batch in base:
+        size = len(batch)
+        out = np.concatenate((history, batch)) if history is not None else np.array(batch)
+        start = len(out) - size
+        covered = start  # Позиции до covered уже заняты всплеском
+        if run_left:
+            covered = start + min(run_left, size)
+            out[start:covered] = run_key
+            run_left -= covered - start
+
+        roll = roll_rng.random(size)
+        distances = distance_rng.integers(1, window + 1, size)
+        lengths = length_rng.geometric(1.0 / max(burst_length, 1.0), size)
+        # Цикл только по событиям (повторам и началам всплесков); по порядку, чтобы повтор
+        # копировал уже окончательное значение
+        for i in np.flatnonzero(roll < reuse + burst).tolist():
+            position = start + i
+            if position < covered:
+                continue
+            if roll[i] < reuse:
+                if position >= distances[i]:
+                    out[position] = out[position - distances[i]]
+            else:
+                end = position + lengths[i]
+                covered = min(end, len(out))
+                out[position:covered] = out[position]
+                run_key, run_left = out[position], end - covered
+
+        history = out[-window:]
+        yield out[start:]
+
+
+def trace_batches(filename: str, batch_size: int = BATCH_SIZE, limit: Optional[int] = None,
+                  fmt: Optional[str] = None) -> Iterator[np.ndarray]:
+    """Воспроизводит запросы из файла трассы порциями фиксированного размера.
+
+    Файл — массив в любом формате array_storage (текст по числу на строке,
+    .npy или сырые int64); бинарные отображаются в память, текст читается
+    потоково.
+
+    Args:
+        filename: Файл трассы
+        batch_size: Размер порции
+        limit: Сколько запросов воспроизвести (None — все)
+        fmt: Формат файла; по умолчанию определяется по содержимому
+    """
+    pending, pending_size, remaining = [], 0, limit
+    for chunk in array_storage.iter_chunks(filename, batch_size, fmt):
+        if remaining is not None:
+            chunk = chunk[:remaining]
+            remaining -= len(chunk)
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= batch_size:
+            data = np.concatenate(pending)
+            cut = len(data) - len(data) % batch_size
+            for start in range(0, cut, batch_size):
+                yield data[start:start + batch_size]
+            pending, pending_size = [data[cut:]], len(data) - cut
+        if remaining == 0:
+            break
+    if pending_size:
+        yield np.concatenate(pending)
+
+
+def write_trace(filename: str, batches: Iterable[np.ndarray]) -> int:
+    """Сохраняет поток запросов как сырые int64 (формат raw в array_storage).
+
+    Returns:
+        Количество записанных запросов.
+    """
+    total = 0
+    with open(filename, 'wb') as file:
+        for batch in batches:
+            np.ascontiguousarray(batch, dtype=array_storage.DTYPE).tofile(file)
+            total += len(batch)
+    return total
+
+
+def iter_queries(batches: Iterable[np.ndarray]) -> Iterator:
+    """Поток отдельных запросов (целые Python) из порций."""
+    for batch in batches:
+        yield from batch.tolist()
+
+
+def main() -> None:
+    """Командная строка: генерация трассы запросов."""
+    parser = argparse.ArgumentParser(description="Генерация трассы запросов")
+    parser.add_argument('output', help="Файл трассы (сырые int64)")
+    parser.add_argument('--keys', type=int, default=1000, help="Ключи 0..keys-1")
+    parser.add_argument('-n', type=int, default=1_000_000, help="Число запросов")
+    parser.add_argument('--exponent', type=float, default=1.0, help="Показатель закона Ципфа")
+    parser.add_argument('--reuse', type=float, default=0.0, help="Доля повторов недавних запросов")
+    parser.add_argument('--window', type=int, default=64, help="Глубина повторов")
+    parser.add_argument('--burst', type=float, default=0.0, help="Вероятность начала всплеска")
+    parser.add_argument('--burst-length', type=float, default=8.0, help="Средняя длина всплеска")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Размер порции (на поток не влияет)")
+    args = parser.parse_args()
+
+    base_seed, locality_seed = np.random.SeedSequence(args.seed).spawn(2)
+    batches = zipf_batches(np.arange(args.keys), args.n, args.exponent, args.batch_size, base_seed)
+    if args.reuse or args.burst:
+        batches = locality_batches(batches, args.reuse, args.window, args.burst, args.burst_length,
+                                   locality_seed)
+    print(f"Записано запросов: {write_trace(args.output, batches)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
+import math
+import random
 import tkinter as tk
 from tkinter import simpledialog, messagebox
 from binary_tree import BinaryTree, TreeNode
+from tree_layout import TreeLayout
 
 
 class BinaryTreeVisualizer:
@@ -17,11 +20,30 @@ class BinaryTreeVisualizer:
         self.tree = None
         self.canvas = None
 
-        # Конфигурация отрисовки
+        # Конфигурация отрисовки (расстояния — в пикселях при масштабе 1)
         self.node_radius = 20
         self.horizontal_spacing = 40
         self.vertical_spacing = 80
-        self.max_display_depth = 5  # Инициализация отсутствующего атрибута
+        self.margin = 30
+        self.lod_size = 24  # Поддерево меньше этого размера сворачивается в значок
+        self.min_edge_length = 16  # Узел с более короткими связями к детям тоже сворачивается
+        self.large_tree_size = 100_000
+
+        # Окно просмотра: экранная позиция начала координат укладки и масштаб
+        self.zoom = 1.0
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self._drag_start = None
+        self._fit_pending = False
+
+        # Укладка и пороги детализации пересчитываются только при изменении дерева
+        self._layout = None
+        self._collapse_zoom = {}
+        self._hide_zoom = {}
+
+        # Отображаемые элементы холста: значение узла -> id фигуры, подписи и связи
+        self._items = {}
+        self._highlighted = None
 
         self._setup_ui()
         self.generate_random_tree()
@@ -29,6 +51,7 @@ class BinaryTreeVisualizer:
         # Оптимизация перерисовки
         self._redraw_scheduled = False
         self.master.bind("<Configure>", self.schedule_redraw)
+        self._bind_viewport()
 
     def _setup_ui(self):
         """Настройка пользовательского интерфейса."""
@@ -45,10 +68,12 @@ class BinaryTreeVisualizer:
 
         buttons = [
             ("Случайное дерево", self.generate_random_tree),
+            ("Большое дерево", self.generate_large_tree),
             ("Вставить", self.run_insert),
             ("Удалить", self.run_delete),
             ("Очистить", self.clear_tree),
-            ("Поиск", self.run_search)
+            ("Поиск", self.run_search),
+            ("Вписать", self.fit_view)
         ]
 
         for text, command in buttons:
@@ -75,17 +100,144 @@ class BinaryTreeVisualizer:
     def _execute_redraw(self):
         """Выполняет отложенную перерисовку."""
         self._redraw_scheduled = False
-        self.draw_tree()
+        if self._fit_pending:
+            self.fit_view()
+        else:
+            self.draw_tree(highlight_value=self._highlighted)
+
+    def _bind_viewport(self):
+        """Привязывает масштабирование колесом мыши и перетаскивание холста."""
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda event: self.zoom_at(event.x, event.y, 1.2))
+        self.canvas.bind("<Button-5>", lambda event: self.zoom_at(event.x, event.y, 1 / 1.2))
+        self.canvas.bind("<ButtonPress-1>", self._on_drag_start)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+
+    def _on_wheel(self, event):
+        """Масштабирование колесом мыши (Windows / macOS)."""
+        self.zoom_at(event.x, event.y, 1.2 if event.delta > 0 else 1 / 1.2)
+
+    def _on_drag_start(self, event):
+        """Запоминает точку начала перетаскивания."""
+        self._drag_start = (event.x, event.y)
+
+    def _on_drag(self, event):
+        """Сдвигает окно просмотра вслед за мышью."""
+        if self._drag_start is None:
+            return
+        start_x, start_y = self._drag_start
+        self._drag_start = (event.x, event.y)
+        self.offset_x += event.x - start_x
+        self.offset_y += event.y - start_y
+        self.schedule_redraw()
+
+    def zoom_at(self, x, y, factor):
+        """Меняет масштаб, оставляя точку холста (x, y) на месте."""
+        self.zoom *= factor
+        self.offset_x = x - (x - self.offset_x) * factor
+        self.offset_y = y - (y - self.offset_y) * factor
+        self.schedule_redraw()
+
+    def fit_view(self):
+        """Подбирает масштаб и сдвиг так, чтобы дерево целиком помещалось на холсте."""
+        layout = self._get_layout()
+        canvas_width = self.canvas.winfo_width()
+        canvas_height = self.canvas.winfo_height()
+        if canvas_width <= 1 or canvas_height <= 1:
+            # Холст еще не показан: впишем дерево при первой перерисовке
+            self._fit_pending = True
+            return
+        self._fit_pending = False
+        if not layout:
+            return
+
+        width = (layout.max_x - layout.min_x) * self.horizontal_spacing
+        height = (layout.height - 1) * self.vertical_spacing
+        zoom = 1.0
+        if width > 0:
+            zoom = min(zoom, (canvas_width - 2 * self.margin) / width)
+        if height > 0:
+            zoom = min(zoom, (canvas_height - 2 * self.margin) / height)
+        self.zoom = zoom
+
+        center = (layout.min_x + layout.max_x) / 2 * self.horizontal_spacing * zoom
+        self.offset_x = canvas_width / 2 - center
+        self.offset_y = self.margin
+        self.draw_tree(highlight_value=self._highlighted)
+
+    def reveal(self, value):
+        """Приближает и центрирует узел, скрытый за краем экрана или в свернутом поддереве."""
+        layout = self._get_layout()
+        if value not in layout:
+            return
+        self.zoom = max(self.zoom, self._hide_zoom[value] * 1.01, self._collapse_zoom[value] * 1.01)
+        x, depth = layout.position(value)
+        self.offset_x = self.canvas.winfo_width() / 2 - x * self.horizontal_spacing * self.zoom
+        self.offset_y = self.canvas.winfo_height() / 2 - depth * self.vertical_spacing * self.zoom
+        self.draw_tree(highlight_value=value)
+
+    def _tree_changed(self):
+        """Сбрасывает кэш укладки после изменения дерева."""
+        self._layout = None
+
+    def _get_layout(self):
+        """Возвращает укладку текущего дерева, вычисляя ее при первом обращении."""
+        if self._layout is None:
+            self._layout = TreeLayout(self.tree)
+            self._compute_detail_thresholds(self._layout)
+        return self._layout
+
+    def _compute_detail_thresholds(self, layout):
+        """Вычисляет, при каком масштабе каждое поддерево сворачивается в значок.
+
+        Поддерево сворачивается, если на экране оно меньше lod_size или связи
+        корня с детьми короче min_edge_length (дети сливаются в пятно). Узел
+        скрыт, если свернут кто-то из его предков. Оба порога зависят только
+        от масштаба, поэтому считаются один раз на укладку.
+        """
+        collapse_zoom = {}
+        hide_zoom = {}
+        nodes = layout.nodes
+        for key in layout.preorder():
+            node = nodes[key]
+            if node.count > 1:
+                width = (node.max_x - node.min_x) * self.horizontal_spacing
+                height = node.height * self.vertical_spacing
+                edge = min(
+                    math.hypot((nodes[child].x - node.x) * self.horizontal_spacing, self.vertical_spacing)
+                    for child in (node.left, node.right) if child is not None
+                )
+                collapse_zoom[key] = max(self.lod_size / max(width, height), self.min_edge_length / edge)
+            else:
+                collapse_zoom[key] = 0.0
+            if node.parent is None:
+                hide_zoom[key] = 0.0
+            else:
+                hide_zoom[key] = max(hide_zoom[node.parent], collapse_zoom[node.parent])
+
+        self._collapse_zoom = collapse_zoom
+        self._hide_zoom = hide_zoom
 
     def generate_random_tree(self):
         """Генерирует случайное дерево и перерисовывает его."""
         self.tree = BinaryTree.generate_random_tree()
-        self.draw_tree()
+        self._tree_changed()
+        self.fit_view()
+
+    def generate_large_tree(self):
+        """Строит большое случайное дерево для проверки масштабирования."""
+        size = self.large_tree_size
+        self.tree = BinaryTree.insert_many(None, random.sample(range(size * 10), size))
+        self._tree_changed()
+        self.fit_view()
 
     def clear_tree(self):
         """Очищает дерево и холст."""
         self.tree = None
+        self._tree_changed()
         self.canvas.delete("all")
+        self._items.clear()
+        self._highlighted = None
 
     def run_insert(self):
         """Запрашивает значение и вставляет его в дерево."""
@@ -95,6 +247,7 @@ class BinaryTreeVisualizer:
                 self.tree = TreeNode(value)
             else:
                 self.tree = BinaryTree.insert(self.tree, value)
+            self._tree_changed()
             self.draw_tree()
 
     def run_delete(self):
@@ -109,6 +262,7 @@ class BinaryTreeVisualizer:
                 self._show_warning("Значение не найдено!")
             else:
                 self.tree = BinaryTree.delete(self.tree, value)
+                self._tree_changed()
                 self.draw_tree()
 
     def run_search(self):
@@ -120,7 +274,10 @@ class BinaryTreeVisualizer:
         value = self._get_user_input("Введите значение для поиска")
         if value is not None:
             if BinaryTree.search(self.tree, value):
-                self.draw_tree(highlight_value=value)
+                if value in self._items and self._items[value]['kind'] == 'node':
+                    self.highlight_node(value)
+                else:
+                    self.reveal(value)
             else:
                 self._show_warning("Значение не найдено!")
 
@@ -136,101 +293,207 @@ class BinaryTreeVisualizer:
         messagebox.showwarning("Внимание", message)
 
     def draw_tree(self, highlight_value=None):
-        """Отрисовывает дерево на холсте."""
-        self.canvas.delete("all")
+        """Синхронизирует холст с деревом, меняя только изменившиеся элементы."""
+        layout = self._compute_layout()
+        created_edge = False
+
+        # Удаляем элементы узлов, которые больше не отображаются
+        for value in [value for value in self._items if value not in layout]:
+            self._delete_items(self._items.pop(value))
+
+        for value, (kind, x, y, size, parent_pos) in layout.items():
+            items = self._items.get(value)
+            if items is not None and items['kind'] != kind:
+                self._delete_items(self._items.pop(value))
+                items = None
+
+            moved = False
+            if items is None:
+                items = self._items[value] = self._create_items(value, kind, x, y, size)
+            else:
+                if items['pos'] != (x, y, size):
+                    self._move_items(items, x, y, size)
+                    moved = True
+                label = self._label_text(value, kind)
+                if items['label'] != label:
+                    # У значка число узлов меняется вместе с поддеревом
+                    self.canvas.itemconfig(items['text'], text=label)
+                    items['label'] = label
+
+            # Связь с родителем: создаем, двигаем или удаляем только при изменениях
+            if parent_pos is None:
+                if items['edge'] is not None:
+                    self.canvas.delete(items['edge'])
+                    items['edge'] = None
+            elif items['edge'] is None:
+                items['edge'] = self.canvas.create_line(
+                    *self._edge_coords(parent_pos, x, y, size),
+                    fill='gray', width=2, tags='edge'
+                )
+                created_edge = True
+            elif moved or parent_pos != items['parent_pos']:
+                self.canvas.coords(items['edge'], *self._edge_coords(parent_pos, x, y, size))
+            items['parent_pos'] = parent_pos
+
+        if created_edge:
+            # Связи всегда лежат под узлами
+            self.canvas.tag_lower('edge')
+
+        self.highlight_node(highlight_value)
+
+    def highlight_node(self, value):
+        """Подсвечивает узел со значением value (None снимает подсветку)."""
+        previous = self._items.get(self._highlighted)
+        if previous is not None and previous['kind'] == 'node':
+            self.canvas.itemconfig(previous['shape'], fill='lightblue')
+        current = self._items.get(value)
+        if current is not None and current['kind'] == 'node':
+            self.canvas.itemconfig(current['shape'], fill='lightgreen')
+        self._highlighted = value
+
+    def _compute_layout(self):
+        """Отбирает узлы и свернутые поддеревья, видимые в окне просмотра.
+
+        Returns:
+            {значение: (вид 'node' или 'glyph', x, y, размер, позиция родителя)},
+            где размер — радиус узла или прямоугольник свернутого поддерева.
+        """
+        visible = {}
         if not self.tree:
-            return
+            return visible
 
+        # Размер холста читаем один раз за кадр
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
-
         if canvas_width <= 0 or canvas_height <= 0:
-            return
-
-        depth = BinaryTree.get_tree_depth(self.tree)
-        if depth <= 0:
-            return
-
-        # Автоматическая настройка параметров отрисовки
-        max_levels = min(depth, self.max_display_depth)
-        self.vertical_spacing = (canvas_height - 100) // (max_levels + 1)
-
-        # Рассчитываем стартовую позицию
-        start_x = canvas_width // 2
-        start_y = 50 + self.node_radius
-
-        # Рекурсивная отрисовка дерева
-        self._draw_subtree(
-            self.tree,
-            start_x,
-            start_y,
-            self.horizontal_spacing * (2 ** (max_levels - 1)),
-            max_levels,
-            1,
-            highlight_value
-        )
-
-    def _draw_subtree(self, node, x, y, spacing, max_depth, current_depth, highlight_value=None):
-        """Рекурсивно отрисовывает поддерево."""
-        if not node or current_depth > max_depth:
-            return
-
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-
-        # Отрисовка связей с потомками
-        if node.left and current_depth < max_depth:
-            left_x = x - spacing / 2
-            left_y = y + self.vertical_spacing
-            if self._is_visible(left_x, left_y):
-                self.canvas.create_line(
-                    x, y + self.node_radius,
-                    left_x, left_y - self.node_radius,
-                    fill='gray', width=2
-                )
-                self._draw_subtree(
-                    node.left, left_x, left_y,
-                    spacing / 2, max_depth,
-                    current_depth + 1, highlight_value
-                )
-
-        if node.right and current_depth < max_depth:
-            right_x = x + spacing / 2
-            right_y = y + self.vertical_spacing
-            if self._is_visible(right_x, right_y):
-                self.canvas.create_line(
-                    x, y + self.node_radius,
-                    right_x, right_y - self.node_radius,
-                    fill='gray', width=2
-                )
-                self._draw_subtree(
-                    node.right, right_x, right_y,
-                    spacing / 2, max_depth,
-                    current_depth + 1, highlight_value
-                )
-
-        # Отрисовка узла
-        fill_color = 'lightgreen' if highlight_value == node.value else 'lightblue'
-        self.canvas.create_oval(
-            x - self.node_radius, y - self.node_radius,
-            x + self.node_radius, y + self.node_radius,
-            fill=fill_color, outline='black', width=2
-        )
-        self.canvas.create_text(
-            x, y,
-            text=str(node.value),
-            font=('Arial', 10, 'bold'),
-            fill='black'
-        )
-
-    def _is_visible(self, x, y):
-        """Проверяет, находится ли точка в видимой области холста."""
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-        return (
-                self.node_radius <= x <= canvas_width - self.node_radius and
-                self.node_radius <= y <= canvas_height - self.node_radius
+            return visible
+
+        layout = self._get_layout()
+        nodes = layout.nodes
+        zoom = self.zoom
+        hide_zoom = self._hide_zoom
+        unit_x = self.horizontal_spacing * zoom
+        unit_y = self.vertical_spacing * zoom
+        radius = min(self.node_radius, 0.45 * unit_x)
+
+        def screen(node):
+            return self.offset_x + node.x * unit_x, self.offset_y + node.depth * unit_y
+
+        def add(value, kind):
+            node = nodes[value]
+            x, y = screen(node)
+            if kind == 'node':
+                size = radius
+            else:
+                size = (self.offset_x + node.min_x * unit_x - radius, y - radius,
+                        self.offset_x + node.max_x * unit_x + radius,
+                        y + (node.height - 1) * unit_y + radius)
+            parent_pos = None
+            if node.parent is not None:
+                parent_pos = screen(nodes[node.parent]) + (radius,)
+            visible[value] = (kind, x, y, size, parent_pos)
+
+        # Видимый прямоугольник в координатах укладки (с запасом на радиус узла)
+        pad = self.node_radius
+        min_x = (-pad - self.offset_x) / unit_x
+        max_x = (canvas_width + pad - self.offset_x) / unit_x
+        min_depth = (-pad - self.offset_y) / unit_y
+        max_depth = (canvas_height + pad - self.offset_y) / unit_y
+
+        # Пространственный индекс отдает только узлы внутри окна просмотра
+        reached = set()
+        for value in layout.query(min_x, max_x, math.ceil(min_depth), math.floor(max_depth)):
+            if zoom >= hide_zoom[value]:
+                add(value, 'glyph' if zoom < self._collapse_zoom[value] else 'node')
+                continue
+
+            # Узел внутри свернутого поддерева: поднимаемся до его значка,
+            # корень которого может быть и за краем экрана
+            while value not in reached and zoom < hide_zoom[value]:
+                reached.add(value)
+                value = nodes[value].parent
+            if value not in reached:
+                reached.add(value)
+                add(value, 'glyph')
+
+        return visible
+
+    def _create_items(self, value, kind, x, y, size):
+        """Создает фигуру и подпись узла или значка свернутого поддерева."""
+        if kind == 'node':
+            fill_color = 'lightgreen' if value == self._highlighted else 'lightblue'
+            shape = self.canvas.create_oval(
+                *self._shape_coords(kind, x, y, size),
+                fill=fill_color, outline='black', width=2, tags='node'
+            )
+        else:
+            shape = self.canvas.create_rectangle(
+                *self._shape_coords(kind, x, y, size),
+                fill='lightgray', outline='gray', width=1, tags='node'
+            )
+
+        text = self._label_text(value, kind)
+        label = self.canvas.create_text(
+            *self._label_coords(kind, x, y, size),
+            text=text,
+            font=('Arial', 10 if kind == 'node' else 8, 'bold'),
+            fill='black', tags='node',
+            state=self._label_state(kind, size)
         )
+        return {
+            'kind': kind,
+            'shape': shape,
+            'text': label,
+            'edge': None,
+            'pos': (x, y, size),
+            'parent_pos': None,
+            'label': text
+        }
+
+    def _move_items(self, items, x, y, size):
+        """Переносит уже созданные элементы узла в новую позицию."""
+        kind = items['kind']
+        self.canvas.coords(items['shape'], *self._shape_coords(kind, x, y, size))
+        self.canvas.coords(items['text'], *self._label_coords(kind, x, y, size))
+        if items['pos'][2] != size:
+            self.canvas.itemconfig(items['text'], state=self._label_state(kind, size))
+        items['pos'] = (x, y, size)
+
+    def _delete_items(self, items):
+        """Удаляет с холста все элементы узла."""
+        self.canvas.delete(items['shape'], items['text'])
+        if items['edge'] is not None:
+            self.canvas.delete(items['edge'])
+
+    def _shape_coords(self, kind, x, y, size):
+        """Координаты овала узла или прямоугольника свернутого поддерева."""
+        if kind == 'node':
+            return x - size, y - size, x + size, y + size
+        return size
+
+    def _label_coords(self, kind, x, y, size):
+        """Подпись узла — в его центре, подпись значка — под корнем поддерева."""
+        if kind == 'node':
+            return x, y
+        return x, min(y + 10, (size[1] + size[3]) / 2)
+
+    def _label_text(self, value, kind):
+        """Подпись узла — его значение, подпись значка — число узлов в поддереве."""
+        if kind == 'node':
+            return str(value)
+        return f"+{self._layout.nodes[value].count}"
+
+    def _label_state(self, kind, size):
+        """Подписи прячутся, когда узлы слишком мелкие для текста."""
+        if kind == 'glyph':
+            size = min(size[2] - size[0], size[3] - size[1]) / 2
+        return tk.NORMAL if size >= 9 else tk.HIDDEN
+
+    def _edge_coords(self, parent_pos, x, y, size):
+        """Координаты линии от родителя к узлу или к верху значка."""
+        parent_x, parent_y, parent_size = parent_pos
+        top = y - size if not isinstance(size, tuple) else size[1]
+        return parent_x, parent_y + parent_size, x, top
 
 
 def main():
@@ -1,29 +1,52 @@
 import random
+from bisect import bisect_left
 
 class TreeNode:
+    # Без __dict__: узел занимает фиксированный небольшой объём памяти.
+    # size и height — размер и высота поддерева, их поддерживает BinaryTree.
+    __slots__ = ('value', 'left', 'right', 'size', 'height')
+
     def __init__(self, value):
         self.value = value
         self.left = None
         self.right = None
+        self.size = 1
+        self.height = 1
+
+    # Создает новый узел в том же хранилище (см. compact_tree.ArrayNode).
+    def new_node(self, value):
+        return TreeNode(value)
+
+    # Освобождает узел, исключенный из дерева; объекты забирает сборщик мусора.
+    def release(self):
+        pass
 
 class BinaryTree:
 
-    # Создаем сбалансированное бинарное дерево из отсортированного списка.
+    # Создаем сбалансированное бинарное дерево из списка (сам список не изменяется).
     def create_balanced_tree(values):
         if not values:
             return None
-        values.sort()
+        values = sorted(values)
+        return BinaryTree.from_sorted(values, len(values))
+
+    # Потоковая загрузка: сбалансированное дерево за O(n) из уже отсортированного
+    # итератора известной длины. Значения читаются по одному, список не строится.
+    def from_sorted(values, count, node_factory=TreeNode):
+        values = iter(values)
 
-        def _build_balanced(start, end):
-            if start > end:
+        def _build_balanced(count):
+            if count <= 0:
                 return None
-            mid = (start + end) // 2
-            node = TreeNode(values[mid])
-            node.left = _build_balanced(start, mid - 1)
-            node.right = _build_balanced(mid + 1, end)
+            left_count = (count - 1) // 2
+            left = _build_balanced(left_count)
+            node = node_factory(next(values))
+            node.left = left
+            node.right = _build_balanced(count - left_count - 1)
+            BinaryTree._update(node)
             return node
 
-        return _build_balanced(0, len(values) - 1)
+        return _build_balanced(count)
 
     # Генерируем случайный сбалансированный список.
     def generate_random_tree(min_nodes=7, max_nodes=15, min_val=1, max_val=100):
@@ -32,61 +55,195 @@ class BinaryTree:
         return BinaryTree.create_balanced_tree(values)
 
 
-    # Возвращает глубину дерева.
+    # Возвращает глубину дерева: высота хранится в корне, O(1).
     def get_tree_depth(node):
-        if not node:
-            return 0
-        left_depth = BinaryTree.get_tree_depth(node.left)
-        right_depth = BinaryTree.get_tree_depth(node.right)
-        return max(left_depth, right_depth) + 1
+        return node.height if node else 0
 
+    # Возвращает количество узлов в дереве, O(1).
+    def get_tree_size(node):
+        return node.size if node else 0
 
-    # Рекурсивный поиск узла по значению.
+
+    # Итеративный поиск узла по значению.
     def search(node, value):
-        if not node:
-            return None
-        if value == node.value:
-            return node
-        elif value < node.value:
-            return BinaryTree.search(node.left, value)
-        else:
-            return BinaryTree.search(node.right, value)
+        while node:
+            if value == node.value:
+                return node
+            node = node.left if value < node.value else node.right
+        return None
 
     # T-алгоритм: поиск со вставкой (если элемента нет)
     def insert(root, value):
         if not root:
             return TreeNode(value)
-        if value < root.value:
-            root.left = BinaryTree.insert(root.left, value)
-        elif value > root.value:
-            root.right = BinaryTree.insert(root.right, value)
-        return root  # Если значение уже есть, ничего не меняем
+        path = []
+        node = root
+        while True:
+            path.append(node)
+            if value < node.value:
+                if not node.left:
+                    node.left = node.new_node(value)
+                    break
+                node = node.left
+            elif value > node.value:
+                if not node.right:
+                    node.right = node.new_node(value)
+                    break
+                node = node.right
+            else:
+                return root  # Если значение уже есть, ничего не меняем
+        BinaryTree._update_path(path)
+        return root
+
+    # Пакетная вставка: отсортированная пачка делится по значениям узлов за один
+    # спуск, а каждый отрезок, дошедший до пустого места, подвешивается готовым
+    # сбалансированным поддеревом. Пересчитываются только посещенные узлы.
+    def insert_many(root, values):
+        batch = sorted(set(values))
+        if not root:
+            return BinaryTree.from_sorted(batch, len(batch))
+
+        visited = []
+        stack = [(root, 0, len(batch))]
+        while stack:
+            node, lo, hi = stack.pop()
+            visited.append(node)
+            split = bisect_left(batch, node.value, lo, hi)
+            right_lo = split + 1 if split < hi and batch[split] == node.value else split
+
+            if lo < split:
+                if node.left:
+                    stack.append((node.left, lo, split))
+                else:
+                    node.left = BinaryTree.from_sorted(batch[lo:split], split - lo, node.new_node)
+            if right_lo < hi:
+                if node.right:
+                    stack.append((node.right, right_lo, hi))
+                else:
+                    node.right = BinaryTree.from_sorted(batch[right_lo:hi], hi - right_lo, node.new_node)
+
+        # Потомки посещаются позже предков, поэтому обратный порядок пересчитывает снизу вверх
+        BinaryTree._update_path(visited)
+        return root
 
     # D-алгоритм: удаление узла по значению.
     def delete(root, value):
-        if not root:
-            return None
+        # Поиск узла вместе с родителем (сторону запоминаем явно: узлы
+        # компактного хранилища сравнивать через `is` нельзя)
+        path = []
+        parent, node, is_left = None, root, False
+        while node and value != node.value:
+            path.append(node)
+            parent, is_left = node, value < node.value
+            node = node.left if is_left else node.right
+        if not node:
+            return root
+
+        # Случай 2: Два потомка -> переносим минимальный из правого поддерева
+        # и удаляем уже его (у него нет левого потомка)
+        if node.left and node.right:
+            path.append(node)
+            min_parent, min_node, is_left = node, node.right, False
+            while min_node.left:
+                path.append(min_node)
+                min_parent, min_node, is_left = min_node, min_node.left, True
+            node.value = min_node.value
+            parent, node = min_parent, min_node
 
-        # Поиск узла
-        if value < root.value:
-            root.left = BinaryTree.delete(root.left, value)
-        elif value > root.value:
-            root.right = BinaryTree.delete(root.right, value)
-        else:  # Узел найден
-            # Случай 1: Нет потомков или только один
-            if not root.left:
-                return root.right
-            elif not root.right:
-                return root.left
-            # Случай 2: Два потомка -> находим минимальный в правом поддереве
-            min_node = BinaryTree._find_min(root.right)
-            root.value = min_node.value
-            root.right = BinaryTree.delete(root.right, min_node.value)
+        # Случай 1: Нет потомков или только один
+        child = node.left if node.left else node.right
+        node.release()
+        if not parent:
+            return child
+        if is_left:
+            parent.left = child
+        else:
+            parent.right = child
+        BinaryTree._update_path(path)
         return root
 
+    # Ленивый обход значений из отрезка [lo, hi] по возрастанию.
+    def range(root, lo, hi):
+        stack = []
+        node = root
+        while stack or node:
+            while node:
+                if node.value < lo:
+                    node = node.right  # Все левое поддерево меньше lo
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if node.value > hi:
+                return
+            yield node.value
+            node = node.right
+
+    # Ранг: количество значений в дереве, строго меньших value. O(высоты).
+    def rank(root, value):
+        return BinaryTree._count_less(root, value, inclusive=False)
+
+    # Порядковая статистика: узел с k-м по величине значением (k с нуля) или None.
+    def select(root, k):
+        node = root
+        while node:
+            left_size = node.left.size if node.left else 0
+            if k < left_size:
+                node = node.left
+            elif k == left_size:
+                return node
+            else:
+                k -= left_size + 1
+                node = node.right
+        return None
+
+    # Количество значений в отрезке [lo, hi]. O(высоты).
+    def count_range(root, lo, hi):
+        if lo > hi:
+            return 0
+        return (BinaryTree._count_less(root, hi, inclusive=True)
+                - BinaryTree._count_less(root, lo, inclusive=False))
+
+    # Симметричный (in-order) обход с явным стеком: значения по возрастанию.
+    def inorder(root):
+        stack = []
+        node = root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.value
+            node = node.right
+
+
+    # Количество значений меньше value (или не больше, если inclusive).
+    def _count_less(root, value, inclusive):
+        count = 0
+        node = root
+        while node:
+            if value < node.value or (value == node.value and not inclusive):
+                node = node.left
+            else:
+                count += (node.left.size if node.left else 0) + 1
+                node = node.right
+        return count
+
+    # Пересчитывает размер и высоту узла по его потомкам.
+    def _update(node):
+        left, right = node.left, node.right
+        node.size = 1 + (left.size if left else 0) + (right.size if right else 0)
+        node.height = 1 + max(left.height if left else 0, right.height if right else 0)
+
+    # Пересчитывает размер и высоту узлов пути снизу вверх (путь — от корня).
+    def _update_path(path):
+        for node in reversed(path):
+            BinaryTree._update(node)
 
     # Возвращает узел с минимальным значением в поддереве.
     def _find_min(node):
         while node.left:
             node = node.left
-        return node
\ No newline at end of file
+        return node
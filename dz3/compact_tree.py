@@ -0,0 +1,167 @@
+from array import array
+
+NIL = -1  # Индекс отсутствующего потомка
+
+
+class ArrayNodeStorage:
+    """Компактное хранилище узлов бинарного дерева в параллельных массивах.
+
+    Узел — это индекс в массивах values/lefts/rights/sizes/heights: ключ
+    занимает 8 байт, остальные поля — по 4 (индексы, размеры и высоты не
+    превышают числа узлов, до 2^31 - 1), всего 24 байта на узел. Высоту нельзя
+    хранить в байте: несбалансированное дерево вырождается в цепочку. Освобожденные индексы образуют список свободных, связанный
+    через lefts, и переиспользуются при следующих вставках.
+    """
+
+    def __init__(self, backend='array', capacity=0):
+        """
+        Args:
+            backend: 'array' (array из стандартной библиотеки) или 'numpy'
+            capacity: Сколько узлов выделить заранее
+        """
+        self.backend = backend
+        if backend == 'array':
+            self.values = array('q')
+            self.lefts, self.rights, self.sizes, self.heights = (array('i') for _ in range(4))
+        elif backend == 'numpy':
+            import numpy as np
+            self._np = np
+            self.values = np.empty(0, dtype=np.int64)
+            self.lefts, self.rights, self.sizes, self.heights = (
+                np.empty(0, dtype=np.int32) for _ in range(4))
+        else:
+            raise ValueError(f"Неизвестный тип хранилища: {backend}")
+
+        self._used = 0  # Сколько слотов когда-либо было выделено
+        self._free = NIL  # Голова списка свободных слотов
+        self.count = 0  # Количество живых узлов
+        if capacity:
+            self._grow(capacity)
+
+    def __len__(self):
+        return self.count
+
+    def _columns(self):
+        return self.values, self.lefts, self.rights, self.sizes, self.heights
+
+    def _grow(self, extra):
+        """Расширяет массивы как минимум на extra слотов."""
+        if self.backend == 'array':
+            for column in self._columns():
+                column.frombytes(bytes(extra * column.itemsize))
+        else:
+            np = self._np
+            self.values, self.lefts, self.rights, self.sizes, self.heights = (
+                np.concatenate((column, np.zeros(extra, dtype=column.dtype)))
+                for column in self._columns()
+            )
+
+    def allocate(self, value):
+        """Выделяет слот под новый лист и возвращает его индекс."""
+        if self._free != NIL:
+            index = self._free
+            self._free = int(self.lefts[index])
+        else:
+            if self._used == len(self.values):
+                self._grow(max(self._used, 16))
+            index = self._used
+            self._used += 1
+
+        self.values[index] = value
+        self.lefts[index] = NIL
+        self.rights[index] = NIL
+        self.sizes[index] = 1
+        self.heights[index] = 1
+        self.count += 1
+        return index
+
+    def release(self, index):
+        """Возвращает слот в список свободных."""
+        self.lefts[index] = self._free
+        self._free = index
+        self.count -= 1
+
+    def node(self, index):
+        """Возвращает узел по индексу (None для NIL)."""
+        return ArrayNode(self, index) if index != NIL else None
+
+    def new_node(self, value):
+        """Создает новый узел-лист и возвращает его."""
+        return ArrayNode(self, self.allocate(value))
+
+    def nbytes(self):
+        """Объем памяти, занятый массивами узлов, в байтах."""
+        if self.backend == 'array':
+            return sum(len(column) * column.itemsize for column in self._columns())
+        return sum(column.nbytes for column in self._columns())
+
+
+class ArrayNode:
+    """Легковесная ссылка на узел в ArrayNodeStorage.
+
+    Повторяет интерфейс TreeNode (value/left/right/size/height, new_node, release),
+    поэтому методы BinaryTree работают с обоими видами хранения. Ссылки
+    создаются на время обращения и не хранятся в дереве.
+    """
+
+    __slots__ = ('storage', 'index')
+
+    def __init__(self, storage, index):
+        self.storage = storage
+        self.index = index
+
+    def __eq__(self, other):
+        return (isinstance(other, ArrayNode) and other.storage is self.storage
+                and other.index == self.index)
+
+    def __hash__(self):
+        return hash((id(self.storage), self.index))
+
+    def __repr__(self):
+        return f"ArrayNode(index={self.index}, value={self.value})"
+
+    @property
+    def value(self):
+        return int(self.storage.values[self.index])
+
+    @value.setter
+    def value(self, value):
+        self.storage.values[self.index] = value
+
+    @property
+    def left(self):
+        return self.storage.node(int(self.storage.lefts[self.index]))
+
+    @left.setter
+    def left(self, node):
+        self.storage.lefts[self.index] = NIL if node is None else node.index
+
+    @property
+    def right(self):
+        return self.storage.node(int(self.storage.rights[self.index]))
+
+    @right.setter
+    def right(self, node):
+        self.storage.rights[self.index] = NIL if node is None else node.index
+
+    @property
+    def size(self):
+        return int(self.storage.sizes[self.index])
+
+    @size.setter
+    def size(self, size):
+        self.storage.sizes[self.index] = size
+
+    @property
+    def height(self):
+        return int(self.storage.heights[self.index])
+
+    @height.setter
+    def height(self, height):
+        self.storage.heights[self.index] = height
+
+    def new_node(self, value):
+        return self.storage.new_node(value)
+
+    def release(self):
+        self.storage.release(self.index)
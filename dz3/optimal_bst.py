@@ -0,0 +1,215 @@
+import argparse
+import json
+import os
+import sys
+from bisect import bisect_left
+from itertools import accumulate
+
+from binary_tree import BinaryTree, TreeNode
+
+OPTIMAL_LIMIT = 3000  # Больше ключей — квадратичные таблицы слишком велики, берем приближение
+
+
+def _prepare(keys, weights, misses):
+    """Сортирует ключи вместе с весами и проверяет размеры.
+
+    Returns:
+        Кортеж (ключи, веса ключей, веса промежутков) по возрастанию ключей.
+    """
+    if len(keys) != len(weights):
+        raise ValueError("Число весов должно совпадать с числом ключей")
+    pairs = sorted(zip(keys, weights))
+    if any(a[0] == b[0] for a, b in zip(pairs, pairs[1:])):
+        raise ValueError("Ключи должны быть уникальными")
+    keys = [key for key, _ in pairs]
+    weights = [weight for _, weight in pairs]
+    if misses is None:
+        misses = [0.0] * (len(keys) + 1)
+    elif len(misses) != len(keys) + 1:
+        raise ValueError("Весов промежутков должно быть на один больше, чем ключей")
+    return keys, weights, list(misses)
+
+
+def _build(keys, choose_root, node_factory):
+    """Строит дерево без рекурсии: choose_root(i, j) — индекс корня ключей keys[i:j]."""
+    if not keys:
+        return None
+    root = None
+    created = []
+    stack = [(0, len(keys), None, False)]
+    while stack:
+        lo, hi, parent, is_left = stack.pop()
+        r = choose_root(lo, hi)
+        node = node_factory(keys[r])
+        created.append(node)
+        if parent is None:
+            root = node
+        elif is_left:
+            parent.left = node
+        else:
+            parent.right = node
+        if lo < r:
+            stack.append((lo, r, node, True))
+        if r + 1 < hi:
+            stack.append((r + 1, hi, node, False))
+
+    # Потомки созданы позже предков: обратный порядок пересчитывает размеры снизу вверх
+    BinaryTree._update_path(created)
+    return root
+
+
+def optimal_bst(keys, weights, misses=None, node_factory=TreeNode):
+    """Оптимальное дерево поиска по частотам обращений (алгоритм Кнута).
+
+    Динамическое программирование по отрезкам ключей; корень отрезка ищется
+    только между корнями двух вложенных отрезков (монотонность корней), что
+    дает O(n^2) времени и памяти вместо O(n^3).
+
+    Args:
+        keys: Уникальные ключи в любом порядке
+        weights: Вероятности (или частоты) успешного поиска каждого ключа
+        misses: Вероятности неуспешного поиска в n + 1 промежутках между
+            отсортированными ключами или None
+        node_factory: Конструктор узла по ключу
+
+    Returns:
+        Корень дерева из узлов node_factory с заполненными size/height.
+    """
+    keys, weights, misses = _prepare(keys, weights, misses)
+    n = len(keys)
+
+    # Вес отрезка [i, j): ключи i..j-1 и промежутки i..j
+    key_prefix = [0.0] + list(accumulate(weights))
+    miss_prefix = [0.0] + list(accumulate(misses))
+
+    # cost[i][j] — наименьшее ожидаемое число сравнений на отрезке [i, j)
+    cost = [[0.0] * (n + 1) for _ in range(n + 1)]
+    best_root = [[0] * (n + 1) for _ in range(n + 1)]
+    for i in range(n):
+        best_root[i][i + 1] = i
+        cost[i][i + 1] = weights[i] + misses[i] + misses[i + 1]
+
+    for length in range(2, n + 1):
+        for i in range(n - length + 1):
+            j = i + length
+            row, best, best_r = cost[i], float('inf'), i
+            for r in range(best_root[i][j - 1], best_root[i + 1][j] + 1):
+                candidate = row[r] + cost[r + 1][j]
+                if candidate < best:
+                    best, best_r = candidate, r
+            weight = key_prefix[j] - key_prefix[i] + miss_prefix[j + 1] - miss_prefix[i]
+            row[j] = best + weight
+            best_root[i][j] = best_r
+
+    return _build(keys, lambda lo, hi: best_root[lo][hi], node_factory)
+
+
+def weight_balanced_bst(keys, weights, misses=None, node_factory=TreeNode):
+    """Почти оптимальное дерево по правилу деления веса пополам (Мельхорн).
+
+    Корень отрезка — ключ, при котором веса левой и правой частей ближе
+    всего; он находится бинарным поиском по префиксным суммам, итого
+    O(n log n). Ожидаемое число сравнений отличается от оптимального не
+    более чем на константу (около 2 для энтропийной оценки).
+    """
+    keys, weights, misses = _prepare(keys, weights, misses)
+    n = len(keys)
+
+    # Префиксы по последовательности q0, p0, q1, p1, ..., qn
+    interleaved = [0.0] * (2 * n + 1)
+    interleaved[0::2] = misses
+    interleaved[1::2] = weights
+    prefix = [0.0] + list(accumulate(interleaved))
+
+    # Для корня r: вес слева минус вес справа = balance[r] - (prefix[2i] + prefix[2j+1]),
+    # где balance[r] = prefix[2r+1] + prefix[2r+2] не убывает по r
+    balance = [prefix[2 * r + 1] + prefix[2 * r + 2] for r in range(n)]
+
+    def choose_root(lo, hi):
+        target = prefix[2 * lo] + prefix[2 * hi + 1]
+        r = min(bisect_left(balance, target, lo, hi), hi - 1)
+        if r > lo and target - balance[r - 1] < balance[r] - target:
+            r -= 1
+        return r
+
+    return _build(keys, choose_root, node_factory)
+
+
+def expected_comparisons(root, weights):
+    """Ожидаемое число сравнений при успешном поиске.
+
+    Args:
+        root: Корень дерева
+        weights: Словарь ключ -> вероятность (частота) обращения
+
+    Returns:
+        Сумма (глубина + 1) * вес по всем ключам, деленная на суммарный вес.
+    """
+    total = 0.0
+    stack = [(root, 1)] if root else []
+    while stack:
+        node, depth = stack.pop()
+        total += depth * weights.get(node.value, 0.0)
+        if node.left:
+            stack.append((node.left, depth + 1))
+        if node.right:
+            stack.append((node.right, depth + 1))
+    weight_sum = sum(weights.values())
+    return total / weight_sum if weight_sum else 0.0
+
+
+def compare_with_experiment(size=300):
+    """Сравнивает деревья с упорядоченным списком из dz1/ThirdTask.KeyExperiment.
+
+    Частоты ключей берутся так же, как в KeyExperiment.run_experiment:
+    ключ reorder_keys(...)[i] запрашивается с вероятностью probs[i].
+
+    Returns:
+        Словарь распределение -> ожидаемые числа сравнений.
+    """
+    # KeyExperiment лежит в соседнем каталоге dz1
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'dz1'))
+    from ThirdTask import KeyExperiment
+
+    experiment = KeyExperiment(size=size)
+    results = {}
+    for name, distribution in experiment.distributions.items():
+        keys = [int(key) for key in experiment.reorder_keys(name)]
+        probs = [float(p) for p in distribution()]
+        frequencies = dict(zip(keys, probs))
+
+        result = {
+            'theoretical': experiment.calculate_theoretical_avg(probs),
+            'balanced_bst': expected_comparisons(BinaryTree.create_balanced_tree(keys), frequencies),
+            'weight_balanced_bst': expected_comparisons(weight_balanced_bst(keys, probs), frequencies),
+        }
+        if size <= OPTIMAL_LIMIT:
+            result['optimal_bst'] = expected_comparisons(optimal_bst(keys, probs), frequencies)
+        results[name] = result
+    return results
+
+
+def main():
+    """Командная строка: ожидаемое число сравнений для распределений KeyExperiment."""
+    parser = argparse.ArgumentParser(description="Оптимальные деревья поиска по частотам обращений")
+    parser.add_argument('--size', type=int, default=300, help="Число ключей")
+    parser.add_argument('--json', help="Сохранить результаты в JSON-файл")
+    args = parser.parse_args()
+
+    results = compare_with_experiment(args.size)
+    print("\nОжидаемое число сравнений:")
+    for name, data in results.items():
+        print(f"\nРаспределение: {name}")
+        print(f"Упорядоченный список (теория): {data['theoretical']:.2f}")
+        print(f"Сбалансированное дерево: {data['balanced_bst']:.2f}")
+        print(f"Дерево с делением веса: {data['weight_balanced_bst']:.2f}")
+        if 'optimal_bst' in data:
+            print(f"Оптимальное дерево: {data['optimal_bst']:.2f}")
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
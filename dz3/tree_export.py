@@ -0,0 +1,145 @@
+import argparse
+import random
+from xml.sax.saxutils import escape
+
+from binary_tree import BinaryTree
+from tree_layout import TreeLayout
+
+BALANCE_COLORS = {-1: 'lightgreen', 0: 'lightblue', 1: 'lightcoral'}  # Как в dz4/FirstTask
+
+
+def _preorder(root):
+    """Прямой обход с явным стеком: пары (узел, родитель)."""
+    stack = [(root, None)] if root is not None else []
+    while stack:
+        node, parent = stack.pop()
+        yield node, parent
+        if node.right is not None:
+            stack.append((node.right, node))
+        if node.left is not None:
+            stack.append((node.left, node))
+
+
+def iter_dot(root, key_attr='value', title='Binary Tree'):
+    """Потоково выдает описание дерева на языке DOT (формат dz3/Digraph.gv).
+
+    Память — O(высоты дерева): узлы выдаются по мере обхода.
+
+    Args:
+        root: Корень дерева (TreeNode, ArrayNode или узел AVL-дерева)
+        key_attr: Имя атрибута с ключом ('value' для dz3, 'key' для dz4)
+        title: Комментарий в первой строке
+
+    Yields:
+        Строки DOT, каждая с переводом строки.
+    """
+    yield f"// {title}\n"
+    yield "digraph {\n"
+    for node, parent in _preorder(root):
+        key = getattr(node, key_attr)
+        yield f"\t{key}\n"
+        if parent is not None:
+            yield f"\t{getattr(parent, key_attr)} -> {key}\n"
+    yield "}\n"
+
+
+def iter_svg(root, key_attr='value', balance_attr=None, layout=None,
+             horizontal_spacing=40, vertical_spacing=80, node_radius=20, margin=30):
+    """Потоково выдает самостоятельный SVG-документ с деревом.
+
+    Координаты берутся из той же аккуратной укладки TreeLayout, что и в
+    визуализаторе; готовую укладку можно передать, чтобы не считать ее заново.
+
+    Args:
+        root: Корень дерева
+        key_attr: Имя атрибута с ключом
+        balance_attr: Имя атрибута с показателем баланса (для AVL-дерева) или None
+        layout: Уже вычисленная укладка этого дерева
+        horizontal_spacing: Пикселей на единицу укладки по горизонтали
+        vertical_spacing: Пикселей между уровнями
+        node_radius: Радиус узла
+        margin: Поля вокруг дерева
+
+    Yields:
+        Фрагменты SVG-документа.
+    """
+    if layout is None:
+        layout = TreeLayout(root, key_attr=key_attr)
+
+    width = (layout.max_x - layout.min_x) * horizontal_spacing + 2 * (margin + node_radius)
+    height = max(layout.height - 1, 0) * vertical_spacing + 2 * (margin + node_radius)
+    origin_x = margin + node_radius - layout.min_x * horizontal_spacing
+    origin_y = margin + node_radius
+
+    def point(key):
+        x, depth = layout.position(key)
+        return origin_x + x * horizontal_spacing, origin_y + depth * vertical_spacing
+
+    yield (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" '
+           f'viewBox="0 0 {width:.0f} {height:.0f}" font-family="Arial" font-weight="bold">\n')
+
+    # Сначала связи, чтобы узлы лежали поверх них
+    yield '<g stroke="gray" stroke-width="2">\n'
+    for node, parent in _preorder(root):
+        if parent is not None:
+            x1, y1 = point(getattr(parent, key_attr))
+            x2, y2 = point(getattr(node, key_attr))
+            yield f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}"/>\n'
+    yield '</g>\n'
+
+    yield '<g stroke="black" text-anchor="middle">\n'
+    for node, _ in _preorder(root):
+        key = getattr(node, key_attr)
+        x, y = point(key)
+        fill = 'lightblue'
+        balance = ''
+        if balance_attr is not None:
+            value = getattr(node, balance_attr)
+            fill = BALANCE_COLORS.get(value, 'lightblue')
+            balance = (f'<text x="{x:.1f}" y="{y + node_radius + 10:.1f}" font-size="8" '
+                       f'font-weight="normal" stroke="none">{value}</text>')
+        yield (f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{node_radius}" fill="{fill}"/>'
+               f'<text x="{x:.1f}" y="{y + 4:.1f}" font-size="10" stroke="none">{escape(str(key))}</text>'
+               f'{balance}\n')
+    yield '</g>\n</svg>\n'
+
+
+def write_dot(root, filename, **kwargs):
+    """Записывает дерево в DOT-файл, не собирая текст в памяти."""
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.writelines(iter_dot(root, **kwargs))
+
+
+def write_svg(root, filename, **kwargs):
+    """Записывает дерево в SVG-файл, не собирая документ в памяти."""
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.writelines(iter_svg(root, **kwargs))
+
+
+def main():
+    """Командная строка: экспорт случайного или заданного дерева без графической среды."""
+    parser = argparse.ArgumentParser(description="Экспорт бинарного дерева в DOT / SVG")
+    parser.add_argument('output', help="Файл результата (.gv/.dot или .svg)")
+    parser.add_argument('--keys', help="Файл с ключами (одно число на строке), вставляются по порядку")
+    parser.add_argument('--random', type=int, default=15, help="Размер случайного сбалансированного дерева")
+    args = parser.parse_args()
+
+    if args.keys:
+        with open(args.keys) as file:
+            tree = None
+            for line in file:
+                if line.strip():
+                    tree = BinaryTree.insert(tree, int(line))
+    else:
+        size = args.random
+        tree = BinaryTree.create_balanced_tree(random.sample(range(1, size * 10), size))
+
+    if args.output.endswith('.svg'):
+        write_svg(tree, args.output)
+    else:
+        write_dot(tree, args.output)
+    print(f"Дерево ({BinaryTree.get_tree_size(tree)} узлов) сохранено в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+from bisect import bisect_left, bisect_right
+
+
+class LayoutNode:
+    """Координаты узла и сводка по его поддереву в единицах укладки.
+
+    x измеряется в минимальных расстояниях между соседями уровня, depth — в уровнях.
+    """
+
+    __slots__ = ('x', 'depth', 'parent', 'left', 'right',
+                 'min_x', 'max_x', 'height', 'count')
+
+    def __init__(self):
+        self.x = 0.0
+        self.depth = 0
+        self.parent = None
+        self.left = None
+        self.right = None
+        self.min_x = 0.0
+        self.max_x = 0.0
+        self.height = 1
+        self.count = 1
+
+
+class _Contour:
+    """Левый и правый контуры поддерева по уровням.
+
+    Списки хранятся снизу вверх (последний элемент — корень поддерева), а
+    значения — со сдвигом shift. Так при слиянии поддеревьев более глубокий
+    контур переиспользуется без копирования, и слияние стоит O(высоты
+    меньшего поддерева).
+    """
+
+    __slots__ = ('lefts', 'rights', 'shift')
+
+    def __init__(self):
+        self.lefts = [0.0]
+        self.rights = [0.0]
+        self.shift = 0.0
+
+
+class TreeLayout:
+    """Аккуратная укладка бинарного дерева (Reingold–Tilford) без рекурсии.
+
+    Соседние поддеревья сдвигаются так, чтобы на каждом общем уровне между
+    ними было не меньше separation; родитель ставится посередине между
+    детьми, единственный потомок — на separation / 2 в свою сторону.
+    Укладка вычисляется один раз на состояние дерева и кэширует координаты
+    всех узлов, поэтому отрисовка и экспорт только читают готовые числа.
+    """
+
+    def __init__(self, root, key_attr='value', separation=1.0):
+        """
+        Args:
+            root: Корень дерева (узлы с атрибутами left/right и ключом key_attr)
+            key_attr: Имя атрибута с ключом узла ('value' для TreeNode, 'key' для AVL)
+            separation: Минимальное расстояние между соседними узлами уровня
+        """
+        self.key_attr = key_attr
+        self.separation = separation
+        self.nodes = {}  # ключ -> LayoutNode
+        self.root = None
+        self.levels = []  # по уровням: (отсортированные x, ключи в том же порядке)
+        self.min_x = self.max_x = 0.0
+        self.height = 0
+
+        if root is not None:
+            self.root = getattr(root, key_attr)
+            self._place(root)
+            self._index(root)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, key):
+        return key in self.nodes
+
+    def position(self, key):
+        """Возвращает (x, depth) узла с ключом key."""
+        node = self.nodes[key]
+        return node.x, node.depth
+
+    def _place(self, root):
+        """Вычисляет относительные смещения детей и переводит их в абсолютные x."""
+        key_attr = self.key_attr
+        half = self.separation / 2
+        offsets = {}  # ключ -> (смещение левого потомка, смещение правого)
+        contours = {}
+
+        # Обратный порядок обхода (корень, правый, левый) дает потомков раньше предков
+        order = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            if node.left is not None:
+                stack.append(node.left)
+            if node.right is not None:
+                stack.append(node.right)
+
+        for node in reversed(order):
+            key = getattr(node, key_attr)
+            info = self.nodes[key] = LayoutNode()
+            left = getattr(node.left, key_attr) if node.left is not None else None
+            right = getattr(node.right, key_attr) if node.right is not None else None
+            info.left, info.right = left, right
+
+            if left is None and right is None:
+                contours[key] = _Contour()
+                offsets[key] = (0.0, 0.0)
+                continue
+
+            if right is None:
+                contour = contours.pop(left)
+                contour.shift -= half
+                offsets[key] = (-half, 0.0)
+            elif left is None:
+                contour = contours.pop(right)
+                contour.shift += half
+                offsets[key] = (0.0, half)
+            else:
+                contour, gap = self._merge(contours.pop(left), contours.pop(right))
+                offsets[key] = (-gap / 2, gap / 2)
+
+            # Уровень самого родителя: его координата 0
+            contour.lefts.append(-contour.shift)
+            contour.rights.append(-contour.shift)
+            contours[key] = contour
+
+            # Сводка по поддереву в координатах относительно узла
+            left_offset, right_offset = offsets[key]
+            children = [(self.nodes[child], offset) for child, offset
+                        in ((left, left_offset), (right, right_offset)) if child is not None]
+            info.min_x = min([0.0] + [child.min_x + offset for child, offset in children])
+            info.max_x = max([0.0] + [child.max_x + offset for child, offset in children])
+            info.height = 1 + max(child.height for child, _ in children)
+            info.count = 1 + sum(child.count for child, _ in children)
+
+        # Абсолютные координаты: прямой проход от корня
+        for node in order:
+            key = getattr(node, key_attr)
+            info = self.nodes[key]
+            left_offset, right_offset = offsets.pop(key)
+            info.min_x += info.x
+            info.max_x += info.x
+            for child, offset in ((info.left, left_offset), (info.right, right_offset)):
+                if child is not None:
+                    child_info = self.nodes[child]
+                    child_info.x = info.x + offset
+                    child_info.depth = info.depth + 1
+                    child_info.parent = key
+
+        root_info = self.nodes[self.root]
+        self.min_x, self.max_x, self.height = root_info.min_x, root_info.max_x, root_info.height
+
+    def _merge(self, left, right):
+        """Сдвигает правый контур вплотную к левому и объединяет их.
+
+        Returns:
+            Кортеж (объединенный контур относительно родителя, расстояние между детьми).
+        """
+        separation = self.separation
+        common = min(len(left.lefts), len(right.lefts))
+
+        # Минимальное расстояние между корнями по всем общим уровням
+        gap = separation
+        for i in range(1, common + 1):
+            need = (left.rights[-i] + left.shift) - (right.lefts[-i] + right.shift) + separation
+            if need > gap:
+                gap = need
+
+        # Переиспользуем более глубокий контур, на общих уровнях подменяем внешнюю сторону
+        if len(right.lefts) >= len(left.lefts):
+            merged = right
+            merged.shift += gap / 2
+            for i in range(1, common + 1):
+                merged.lefts[-i] = left.lefts[-i] + left.shift - gap / 2 - merged.shift
+        else:
+            merged = left
+            merged.shift -= gap / 2
+            for i in range(1, common + 1):
+                merged.rights[-i] = right.rights[-i] + right.shift + gap / 2 - merged.shift
+
+        return merged, gap
+
+    def _index(self, root):
+        """Строит пространственный индекс: узлы каждого уровня, упорядоченные по x."""
+        # В аккуратной укладке порядок узлов уровня по x совпадает с симметричным обходом
+        levels = [([], []) for _ in range(self.height)]
+        key_attr = self.key_attr
+        stack = []
+        node = root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            key = getattr(node, key_attr)
+            info = self.nodes[key]
+            xs, keys = levels[info.depth]
+            xs.append(info.x)
+            keys.append(key)
+            node = node.right
+        self.levels = levels
+
+    def query(self, min_x, max_x, min_depth, max_depth):
+        """Ключи узлов, попадающих в прямоугольник [min_x, max_x] x [min_depth, max_depth].
+
+        Уровни вне дерева пропускаются, внутри уровня поиск — бинарный.
+        """
+        first = max(0, int(min_depth))
+        last = min(len(self.levels) - 1, int(max_depth))
+        for depth in range(first, last + 1):
+            xs, keys = self.levels[depth]
+            start = bisect_left(xs, min_x)
+            stop = bisect_right(xs, max_x)
+            yield from keys[start:stop]
+
+    def preorder(self):
+        """Ключи в прямом порядке (корень, левое, правое поддерево)."""
+        if self.root is None:
+            return
+        stack = [self.root]
+        nodes = self.nodes
+        while stack:
+            key = stack.pop()
+            yield key
+            info = nodes[key]
+            if info.right is not None:
+                stack.append(info.right)
+            if info.left is not None:
+                stack.append(info.left)
+
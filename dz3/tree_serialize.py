@@ -0,0 +1,214 @@
+import contextlib
+import mmap
+import struct
+from array import array
+
+from binary_tree import BinaryTree, TreeNode
+
+MAGIC = b'BST1'
+HEADER = struct.Struct('<4sB3xQ')  # сигнатура, флаги, выравнивание, число узлов
+FLAG_BALANCE = 1  # После структуры идет по байту баланса на узел (AVL)
+WRITE_CHUNK = 65536  # Сколько ключей буферизуется перед записью
+
+
+def _structure_size(count):
+    """Размер битовой структуры: по два бита (есть левый / правый потомок) на узел."""
+    return (2 * count + 7) // 8
+
+
+def write_tree(root, filename, key_attr='value', balance_attr=None):
+    """Сохраняет дерево в компактном двоичном виде.
+
+    Формат: заголовок, ключи в прямом порядке (int64), два бита структуры на
+    узел и, для AVL-дерева, байт баланса на узел. Ключи пишутся потоково.
+
+    Args:
+        root: Корень дерева (TreeNode, ArrayNode или узел AVL-дерева)
+        filename: Путь к файлу
+        key_attr: Имя атрибута с ключом ('value' для dz3, 'key' для dz4)
+        balance_attr: Имя атрибута баланса, если его нужно сохранить
+
+    Returns:
+        Количество сохраненных узлов.
+    """
+    structure = bytearray()
+    balances = array('b')
+    keys = array('q')
+    count = 0
+
+    with open(filename, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, 0, 0))  # Число узлов допишем в конце
+
+        stack = [root] if root is not None else []
+        while stack:
+            node = stack.pop()
+            keys.append(getattr(node, key_attr))
+            if len(keys) == WRITE_CHUNK:
+                keys.tofile(file)
+                del keys[:]
+
+            bits = (node.left is not None) << 1 | (node.right is not None)
+            if count % 4 == 0:
+                structure.append(0)
+            structure[-1] |= bits << (2 * (count % 4))
+            if balance_attr is not None:
+                balances.append(getattr(node, balance_attr))
+            count += 1
+
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+
+        keys.tofile(file)
+        file.write(structure)
+        if balance_attr is not None:
+            balances.tofile(file)
+
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, FLAG_BALANCE if balance_attr is not None else 0, count))
+    return count
+
+
+def _read_header(buffer, filename):
+    """Проверяет заголовок и возвращает (флаги, число узлов)."""
+    if len(buffer) < HEADER.size:
+        raise ValueError(f"Файл {filename} слишком короткий для дерева")
+    magic, flags, count = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"Файл {filename} не является сохраненным деревом")
+    return flags, count
+
+
+def load_tree(filename, node_factory=TreeNode):
+    """Восстанавливает дерево из файла за O(n) без единого сравнения ключей.
+
+    Args:
+        filename: Путь к файлу, созданному write_tree
+        node_factory: Конструктор узла по ключу (TreeNode, ArrayNodeStorage.new_node,
+            класс узла AVL-дерева)
+
+    Returns:
+        Корень восстановленного дерева или None для пустого дерева.
+    """
+    with open(filename, 'rb') as file:
+        data = file.read()
+    flags, count = _read_header(data, filename)
+    expected = HEADER.size + 8 * count + _structure_size(count)
+    if flags & FLAG_BALANCE:
+        expected += count
+    if len(data) < expected:
+        raise ValueError(f"Файл {filename} обрезан")
+
+    keys = array('q')
+    keys.frombytes(data[HEADER.size:HEADER.size + 8 * count])
+    offset = HEADER.size + 8 * count
+    structure = data[offset:offset + _structure_size(count)]
+    offset += len(structure)
+    balances = None
+    if flags & FLAG_BALANCE:
+        balances = array('b')
+        balances.frombytes(data[offset:offset + count])
+
+    # Прямой порядок: следующий узел — левый потомок текущего, если он есть,
+    # иначе правый потомок последнего узла, ожидающего правое поддерево
+    nodes = list(map(node_factory, keys))
+    if balances is not None:
+        for node, balance in zip(nodes, balances):
+            node.balance = balance
+
+    pending = []
+    parent, is_left = None, False
+    for i, node in enumerate(nodes):
+        if parent is not None:
+            if is_left:
+                parent.left = node
+            else:
+                parent.right = node
+
+        bits = structure[i >> 2] >> (2 * (i & 3))
+        if bits & 1:
+            pending.append(node)
+        if bits & 2:
+            parent, is_left = node, True
+        elif pending:
+            parent, is_left = pending.pop(), False
+        else:
+            parent = None
+
+    if balances is None and nodes and hasattr(nodes[0], 'size'):
+        # Размеры и высоты поддеревьев: потомки идут позже предков
+        BinaryTree._update_path(nodes)
+    return nodes[0] if nodes else None
+
+
+class MappedTree:
+    """Дерево только для чтения поверх отображенного в память файла.
+
+    Узлы не создаются: поиск идет прямо по ключам в прямом порядке. В этом
+    порядке поддерево занимает непрерывный отрезок, в котором сначала идут
+    ключи меньше корня (левое поддерево), затем больше (правое), поэтому
+    границу между ними находит бинарный поиск.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        # Если заголовок неверный, стек закроет уже открытые файл и отображение
+        with contextlib.ExitStack() as stack:
+            self._file = stack.enter_context(open(filename, 'rb'))
+            try:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Пустой файл отобразить нельзя
+                raise ValueError(f"Файл {filename} не является сохраненным деревом")
+            stack.callback(self._mmap.close)
+            self.flags, self.count = _read_header(self._mmap, filename)
+            if len(self._mmap) < HEADER.size + 8 * self.count:
+                raise ValueError(f"Файл {filename} обрезан")
+            self._view = memoryview(self._mmap)
+            stack.callback(self._view.release)
+            self.keys = self._view[HEADER.size:HEADER.size + 8 * self.count].cast('q')
+            stack.pop_all()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, key):
+        return self.search(key) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Освобождает отображение и файл."""
+        self.keys.release()
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def search(self, key):
+        """Ищет ключ; возвращает его позицию в прямом порядке или None."""
+        keys = self.keys
+        lo, hi = 0, self.count
+        while lo < hi:
+            current = keys[lo]
+            if key == current:
+                return lo
+
+            # Граница между левым и правым поддеревом внутри (lo, hi)
+            left, right = lo + 1, hi
+            while left < right:
+                middle = (left + right) // 2
+                if keys[middle] < current:
+                    left = middle + 1
+                else:
+                    right = middle
+
+            if key < current:
+                lo, hi = lo + 1, left
+            else:
+                lo = left
+        return None
@@ -1,28 +1,37 @@
 import tkinter as tk
+from collections import deque
 from tkinter import messagebox
-import time
 
+from avl_tree import AVLTree, Step, TraceRecorder
+from incremental_layout import IncrementalLayout
 
-class BalancedTreeVisualizer:
-    class Node:
-        def __init__(self, key):
-            self.key = key
-            self.left = None
-            self.right = None
-            self.balance = 0  # -1, 0, 1
-            self.x = 0
-            self.y = 0
 
+class BalancedTreeVisualizer:
     def __init__(self, root):
-        self.root_node = None
-        self.tall = False
+        self.tree = AVLTree()  # Логика дерева не зависит от Tk
+        # Показанное состояние дерева: отстает от self.tree, пока идет анимация
+        self.shown = {}  # узел -> (ключ, левый, правый, баланс)
+        self.shown_root = None
+        self.layout = IncrementalLayout(self._children)  # Кэш укладки показанного дерева
+        self.items = {}  # узел -> (круг, ключ, баланс) на холсте
+        self.edges = {}  # узел -> линия от родителя
+        self._highlight = None
+        self.queue = deque()  # Записанные шаги, ожидающие показа
         self.animation_speed = 500  # мс задержки между шагами
+        self.origin_x, self.origin_y = 400, 50  # Положение корня
+        self.horizontal_spacing = 50  # Пикселей на единицу укладки
+        self.vertical_spacing = 80
+        self.paused = False
+        self._job = None  # Запланированный вызов after()
 
         # Настройка GUI
         self.root = root
         self.root.title("Balanced Tree Visualizer")
         self.canvas = tk.Canvas(root, width=800, height=600, bg='white')
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        # Широкое дерево можно сдвигать мышью
+        self.canvas.bind("<ButtonPress-1>", lambda event: self.canvas.scan_mark(event.x, event.y))
+        self.canvas.bind("<B1-Motion>", lambda event: self.canvas.scan_dragto(event.x, event.y, gain=1))
 
         # Панель управления
         control_frame = tk.Frame(root)
@@ -32,241 +41,285 @@ class BalancedTreeVisualizer:
         self.entry.pack(side=tk.LEFT, padx=5)
 
         tk.Button(control_frame, text="Insert", command=self.insert_step).pack(side=tk.LEFT, padx=5)
+        tk.Button(control_frame, text="Delete", command=self.delete_step).pack(side=tk.LEFT, padx=5)
         tk.Button(control_frame, text="Auto Insert", command=self.auto_insert).pack(side=tk.LEFT, padx=5)
         tk.Button(control_frame, text="Clear", command=self.clear_tree).pack(side=tk.LEFT, padx=5)
 
+        # Управление анимацией
+        self.animate = tk.BooleanVar(value=True)
+        tk.Checkbutton(control_frame, text="Animate", variable=self.animate).pack(side=tk.LEFT, padx=5)
+        self.pause_button = tk.Button(control_frame, text="Pause", command=self.toggle_pause)
+        self.pause_button.pack(side=tk.LEFT, padx=5)
+        tk.Button(control_frame, text="Skip", command=self.skip_animation).pack(side=tk.LEFT, padx=5)
+        speed = tk.Scale(control_frame, from_=0, to=1000, resolution=50, orient=tk.HORIZONTAL,
+                         label="Delay, ms", command=self.set_speed)
+        speed.set(self.animation_speed)
+        speed.pack(side=tk.LEFT, padx=5)
+
         # Статус
         self.status = tk.Label(root, text="Ready", bd=1, relief=tk.SUNKEN, anchor=tk.W)
         self.status.pack(fill=tk.X)
 
     def set_status(self, text):
         self.status.config(text=text)
-        self.root.update()
+
+    def set_speed(self, value):
+        self.animation_speed = int(float(value))
 
     def clear_tree(self):
-        self.canvas.delete("all")
-        self.root_node = None
+        self._cancel()
+        self.queue.clear()
+        self.tree = AVLTree()
+        self.skip_animation()
         self.set_status("Tree cleared")
 
     def insert_step(self):
-        try:
-            key = int(self.entry.get())
-            self.set_status(f"Inserting {key}...")
-            self.root_node = self._insert(self.root_node, key, animate=True)
-            self.entry.delete(0, tk.END)
-            self.set_status(f"Inserted {key}")
-        except ValueError:
-            messagebox.showerror("Error", "Please enter a valid integer")
+        key = self._read_key()
+        if key is not None:
+            self._run('insert', key)
+
+    def delete_step(self):
+        key = self._read_key()
+        if key is not None:
+            self._run('delete', key)
 
     def auto_insert(self):
+        # Все вставки выполняются сразу, их показ идет по очереди через after()
         keys = [50, 30, 70, 20, 40, 60, 80, 10, 25, 35, 45]
         for key in keys:
-            self.entry.delete(0, tk.END)
-            self.entry.insert(0, str(key))
-            self.insert_step()
-            time.sleep(0.7)
-
-    def _insert(self, node, key, animate=False):
-        if node is None:
-            if animate:
-                self.set_status(f"Creating new node with key {key}")
-                self.root.after(self.animation_speed)
-            new_node = self.Node(key)
-            if animate:
-                self.draw_tree()
-                self.highlight_node(new_node, "green")
-                self.root.after(self.animation_speed)
-            self.tall = True
-            return new_node
-
-        if animate:
-            self.highlight_node(node, "yellow")
-            self.set_status(f"Checking node {node.key}")
-            self.root.after(self.animation_speed)
-
-        if key < node.key:
-            if animate:
-                self.set_status(f"{key} < {node.key}, going left")
-                self.root.after(self.animation_speed)
-            node.left = self._insert(node.left, key, animate)
-            if self.tall:
-                if node.balance == 1:
-                    node.balance = 0
-                    self.tall = False
-                elif node.balance == 0:
-                    node.balance = -1
-                    if animate:
-                        self.set_status(f"Adjusting balance of {node.key} to -1")
-                        self.root.after(self.animation_speed)
-                else:
-                    if animate:
-                        self.set_status(f"Need to balance left-heavy {node.key}")
-                        self.root.after(self.animation_speed)
-                    node = self._balance_left(node)
-                    self.tall = False
-        elif key > node.key:
-            if animate:
-                self.set_status(f"{key} > {node.key}, going right")
-                self.root.after(self.animation_speed)
-            node.right = self._insert(node.right, key, animate)
-            if self.tall:
-                if node.balance == -1:
-                    node.balance = 0
-                    self.tall = False
-                elif node.balance == 0:
-                    node.balance = 1
-                    if animate:
-                        self.set_status(f"Adjusting balance of {node.key} to +1")
-                        self.root.after(self.animation_speed)
-                else:
-                    if animate:
-                        self.set_status(f"Need to balance right-heavy {node.key}")
-                        self.root.after(self.animation_speed)
-                    node = self._balance_right(node)
-                    self.tall = False
-        else:
-            if animate:
-                self.set_status(f"Key {key} already exists")
-                self.highlight_node(node, "red")
-                self.root.after(self.animation_speed)
-            self.tall = False
-
-        if animate:
-            self.draw_tree()
-            self.root.after(self.animation_speed)
-
-        return node
-
-    def _balance_left(self, node):
-        left_child = node.left
-        if left_child.balance == -1:
-            # Single right rotation
-            self.set_status(f"Single right rotation at {node.key}")
-            node.left = left_child.right
-            left_child.right = node
-            node.balance = 0
-            left_child.balance = 0
-            return left_child
-        else:
-            # Double rotation (left-right)
-            self.set_status(f"Double rotation (left-right) at {node.key}")
-            right_grandchild = left_child.right
-            left_child.right = right_grandchild.left
-            right_grandchild.left = left_child
-            node.left = right_grandchild.right
-            right_grandchild.right = node
-
-            if right_grandchild.balance == -1:
-                node.balance = 1
-                left_child.balance = 0
-            elif right_grandchild.balance == 1:
-                node.balance = 0
-                left_child.balance = -1
-            else:
-                node.balance = 0
-                left_child.balance = 0
-
-            right_grandchild.balance = 0
-            return right_grandchild
-
-    def _balance_right(self, node):
-        right_child = node.right
-        if right_child.balance == 1:
-            # Single left rotation
-            self.set_status(f"Single left rotation at {node.key}")
-            node.right = right_child.left
-            right_child.left = node
-            node.balance = 0
-            right_child.balance = 0
-            return right_child
-        else:
-            # Double rotation (right-left)
-            self.set_status(f"Double rotation (right-left) at {node.key}")
-            left_grandchild = right_child.left
-            right_child.left = left_grandchild.right
-            left_grandchild.right = right_child
-            node.right = left_grandchild.left
-            left_grandchild.left = node
-
-            if left_grandchild.balance == 1:
-                node.balance = -1
-                right_child.balance = 0
-            elif left_grandchild.balance == -1:
-                node.balance = 0
-                right_child.balance = 1
-            else:
-                node.balance = 0
-                right_child.balance = 0
-
-            left_grandchild.balance = 0
-            return left_grandchild
-
-    def draw_tree(self):
-        self.canvas.delete("all")
-        if self.root_node is None:
-            return
-
-        # Calculate positions
-        self._calculate_positions(self.root_node, 400, 50, 200)
-
-        # Draw connections first
-        self._draw_connections(self.root_node)
-
-        # Then draw nodes
-        self._draw_nodes(self.root_node)
+            self._run('insert', key)
 
-    def _calculate_positions(self, node, x, y, spacing):
-        if node is None:
+    def _read_key(self):
+        try:
+            key = int(self.entry.get())
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid integer")
+            return None
+        self.entry.delete(0, tk.END)
+        return key
+
+    def _run(self, operation, key):
+        # Операция над деревом выполняется сразу; анимация лишь воспроизводит ее запись
+        recorder = TraceRecorder(self.tree) if self.animate.get() else None
+        self.tree.observer = recorder
+        try:
+            done = getattr(self.tree, operation)(key)
+        finally:
+            self.tree.observer = None
+        end = Step('end', {'operation': operation, 'key': key, 'done': done}, None, [], None, None)
+
+        if recorder is None:
+            # Без анимации итоговое состояние показывается сразу
+            self.skip_animation()
+            self.set_status(self._describe(end))
             return
 
-        node.x = x
-        node.y = y
+        self.queue.append(Step('begin', {'operation': operation, 'key': key}, None, [], None, None))
+        self.queue.extend(recorder.steps)
+        self.queue.append(end)
+        self._schedule(0)
 
-        if node.left:
-            self._calculate_positions(node.left, x - spacing, y + 80, spacing * 0.6)
-        if node.right:
-            self._calculate_positions(node.right, x + spacing, y + 80, spacing * 0.6)
-
-    def _draw_connections(self, node):
-        if node is None:
+    def toggle_pause(self):
+        self.paused = not self.paused
+        self.pause_button.config(text="Resume" if self.paused else "Pause")
+        if self.paused:
+            self._cancel()
+        else:
+            self._schedule(0)
+
+    def skip_animation(self):
+        # Сразу показывает итоговое состояние дерева
+        self._cancel()
+        self.queue.clear()
+        self.shown = {}
+        self.shown_root = self.tree.root
+        stack = [self.tree.root] if self.tree.root is not None else []
+        while stack:
+            node = stack.pop()
+            self.shown[node] = (node.key, node.left, node.right, node.balance)
+            stack.extend(child for child in (node.left, node.right) if child is not None)
+        self.draw_tree()
+        self.set_status("Ready")
+
+    def _schedule(self, delay):
+        if self._job is None and not self.paused and self.queue:
+            self._job = self.root.after(delay, self._tick)
+
+    def _cancel(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+    def _tick(self):
+        # Один шаг записи за вызов: окно остается отзывчивым между шагами
+        self._job = None
+        if self.paused or not self.queue:
             return
+        step = self.queue.popleft()
+        self._apply(step)
+        self._show(step)
+        self._schedule(self.animation_speed)
+
+    def _apply(self, step):
+        for node, key, left, right, balance in step.changes:
+            self.shown[node] = (key, left, right, balance)
+        if step.removed is not None:
+            self.shown.pop(step.removed, None)
+        if step.changes or step.removed is not None:
+            self.shown_root = step.root
+
+    def _show(self, step):
+        if step.changes or step.removed is not None:
+            removed = (step.removed,) if step.removed is not None else ()
+            self._refresh([node for node, *_ in step.changes], removed)
+        self.set_status(self._describe(step))
+        color = {'visit': "yellow", 'create': "green", 'duplicate': "red"}.get(step.event)
+        if color is not None:
+            self.highlight_node(step.node, color)
+        elif step.event in ('begin', 'end'):
+            self.clear_highlight()
+
+    def _describe(self, step):
+        info = step.info
+        event = step.event
+        if event == 'begin':
+            action = "Inserting" if info['operation'] == 'insert' else "Deleting"
+            return f"{action} {info['key']}..."
+        if event == 'end':
+            if info['operation'] == 'insert':
+                return f"Inserted {info['key']}" if info['done'] else f"Key {info['key']} already exists"
+            return f"Deleted {info['key']}" if info['done'] else f"Key {info['key']} not found"
+        if event == 'visit':
+            return f"Checking node {info['node']}"
+        if event == 'compare':
+            sign = '<' if info['direction'] == 'left' else '>'
+            return f"{info['key']} {sign} {info['node']}, going {info['direction']}"
+        if event == 'create':
+            return f"Creating new node with key {info['node']}"
+        if event == 'duplicate':
+            return f"Key {info['node']} already exists"
+        if event == 'remove':
+            return f"Removing node with key {info['key']}"
+        if event == 'balance':
+            balance = info['balance']
+            if balance == -2:
+                return f"Need to balance left-heavy {info['node']}"
+            if balance == 2:
+                return f"Need to balance right-heavy {info['node']}"
+            if balance == 0:
+                return f"Balance of {info['node']} restored to 0"
+            return f"Adjusting balance of {info['node']} to {balance:+d}"
+        if event == 'rotation':
+            if '-' in info['kind']:
+                return f"Double rotation ({info['kind']}) at {info['node']}"
+            return f"Single {info['kind']} rotation at {info['node']}"
+        return event
 
-        if node.left:
-            self.canvas.create_line(node.x, node.y, node.left.x, node.left.y, width=2, fill="gray")
-            self._draw_connections(node.left)
-
-        if node.right:
-            self.canvas.create_line(node.x, node.y, node.right.x, node.right.y, width=2, fill="gray")
-            self._draw_connections(node.right)
-
-    def _draw_nodes(self, node):
-        if node is None:
-            return
+    def draw_tree(self):
+        # Полная перерисовка: новая укладка и новые элементы холста
+        self.canvas.delete("all")
+        self.items = {}
+        self.edges = {}
+        self.layout = IncrementalLayout(self._children)
+        self._highlight = None
+        self._refresh()
+
+    def _children(self, node):
+        _, left, right, _ = self.shown[node]
+        return left, right
+
+    def _pixel(self, node):
+        x, depth = self.layout.position(node)
+        return self.origin_x + x * self.horizontal_spacing, self.origin_y + depth * self.vertical_spacing
+
+    def _refresh(self, dirty=(), removed=()):
+        # Пересчитывает укладку только для измененных узлов и их предков
+        # и двигает лишь те элементы холста, чьи координаты сменились
+        for node in removed:
+            for item in self.items.pop(node, ()):
+                self.canvas.delete(item)
+            edge = self.edges.pop(node, None)
+            if edge is not None:
+                self.canvas.delete(edge)
+
+        changed = set(self.layout.update(self.shown_root, dirty, removed))
+        changed.update(node for node in dirty if node in self.shown)
+
+        new_edges = False
+        for node in changed:
+            self._draw_node(node)
+        # Связь рисуется от родителя к узлу: обновляем ее у сдвинутых узлов и их детей
+        for node in changed | {child for node in changed for child in self._children(node)}:
+            if node is not None:
+                new_edges |= self._draw_edge(node)
+        if new_edges:
+            self.canvas.tag_lower("edge")
+
+    def _draw_node(self, node):
+        key, left, right, balance = self.shown[node]
 
-        # Draw node
         color = "lightblue"
-        if node.balance == -1:
+        if balance == -1:
             color = "lightgreen"
-        elif node.balance == 1:
+        elif balance == 1:
             color = "lightcoral"
 
-        self.canvas.create_oval(node.x - 20, node.y - 20, node.x + 20, node.y + 20, fill=color, outline="black")
-        self.canvas.create_text(node.x, node.y, text=str(node.key), font=('Arial', 10, 'bold'))
-
-        # Draw balance factor
-        self.canvas.create_text(node.x, node.y + 25, text=str(node.balance), font=('Arial', 8))
+        x, y = self._pixel(node)
+        if node not in self.items:
+            self.items[node] = (
+                self.canvas.create_oval(x - 20, y - 20, x + 20, y + 20, fill=color, outline="black"),
+                self.canvas.create_text(x, y, text=str(key), font=('Arial', 10, 'bold')),
+                # Balance factor
+                self.canvas.create_text(x, y + 25, text=str(balance), font=('Arial', 8)),
+            )
+            return
 
-        # Draw children
-        self._draw_nodes(node.left)
-        self._draw_nodes(node.right)
+        oval, label, balance_label = self.items[node]
+        self.canvas.coords(oval, x - 20, y - 20, x + 20, y + 20)
+        self.canvas.itemconfig(oval, fill=color)
+        self.canvas.coords(label, x, y)
+        self.canvas.itemconfig(label, text=str(key))
+        self.canvas.coords(balance_label, x, y + 25)
+        self.canvas.itemconfig(balance_label, text=str(balance))
+
+    def _draw_edge(self, node):
+        # Возвращает True, если создан новый элемент связи
+        parent = self.layout.parent(node)
+        edge = self.edges.get(node)
+        if parent is None:
+            if edge is not None:
+                self.canvas.delete(self.edges.pop(node))
+            return False
+
+        coords = (*self._pixel(parent), *self._pixel(node))
+        if edge is None:
+            self.edges[node] = self.canvas.create_line(*coords, width=2, fill="gray", tags="edge")
+            return True
+        self.canvas.coords(edge, *coords)
+        return False
 
     def highlight_node(self, node, color):
-        if node is None:
+        if node is None or node not in self.items:
+            self.clear_highlight()
             return
-        self.canvas.create_oval(node.x - 22, node.y - 22, node.x + 22, node.y + 22, outline=color, width=3)
+        x, y = self._pixel(node)
+        if self._highlight is None:
+            self._highlight = self.canvas.create_oval(x - 22, y - 22, x + 22, y + 22, outline=color, width=3)
+        else:
+            self.canvas.coords(self._highlight, x - 22, y - 22, x + 22, y + 22)
+            self.canvas.itemconfig(self._highlight, outline=color, state="normal")
+        self.canvas.tag_raise(self._highlight)
 
+    def clear_highlight(self):
+        if self._highlight is not None:
+            self.canvas.itemconfig(self._highlight, state="hidden")
 
-if __name__ == "__main__":
+
+def main():
     root = tk.Tk()
     app = BalancedTreeVisualizer(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
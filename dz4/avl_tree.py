@@ -0,0 +1,583 @@
+from collections import namedtuple
+
+
+class Node:
+    """Узел AVL-дерева.
+
+    balance — разность высот правого и левого поддеревьев (-1, 0, 1).
+    """
+
+    __slots__ = ('key', 'left', 'right', 'balance')
+
+    def __init__(self, key):
+        self.key = key
+        self.left = None
+        self.right = None
+        self.balance = 0
+
+    def __repr__(self):
+        return f"Node(key={self.key}, balance={self.balance})"
+
+
+def rotate_left(node):
+    """Левый поворот вокруг node; возвращает новый корень поддерева.
+
+    Показатели баланса пересчитываются для любых исходных значений, поэтому
+    поворот годится и для вставки, и для удаления, и для слияния деревьев.
+    """
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    node.balance -= 1 + max(pivot.balance, 0)
+    pivot.balance -= 1 - min(node.balance, 0)
+    return pivot
+
+
+def rotate_right(node):
+    """Правый поворот вокруг node; возвращает новый корень поддерева."""
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    node.balance += 1 - min(pivot.balance, 0)
+    pivot.balance += 1 + max(node.balance, 0)
+    return pivot
+
+
+def _fix(node):
+    """Повороты для узла с показателем ±2.
+
+    Returns:
+        Кортеж (новый корень поддерева, вид поворота).
+    """
+    if node.balance < 0:
+        if node.left.balance > 0:
+            node.left = rotate_left(node.left)
+            return rotate_right(node), 'left-right'
+        return rotate_right(node), 'right'
+    if node.right.balance < 0:
+        node.right = rotate_right(node.right)
+        return rotate_left(node), 'right-left'
+    return rotate_left(node), 'left'
+
+
+def _child_heights(node, height):
+    """Высоты левого и правого поддеревьев узла высоты height (по балансу)."""
+    return (height - 1 - max(node.balance, 0),
+            height - 1 + min(node.balance, 0))
+
+
+# Шаг записанной операции: событие, его параметры (узлы заменены ключами),
+# главный узел события, новые поля затронутых узлов (узел, ключ, левый,
+# правый, баланс), корень дерева после шага и исключенный узел (для remove)
+Step = namedtuple('Step', 'event info node changes root removed')
+
+# Какие узлы меняют поля при событии (помимо детей нового корня при повороте)
+_TOUCHED = {
+    'create': ('node', 'parent'),
+    'balance': ('node',),
+    'rotation': ('node', 'root', 'parent'),
+    'remove': ('target', 'parent'),
+}
+
+
+class TraceRecorder:
+    """Наблюдатель, записывающий операции дерева как последовательность шагов.
+
+    Каждый шаг хранит только поля узлов, которые он изменил (O(1) на шаг),
+    поэтому по записи можно воспроизвести операцию на копии дерева — например,
+    анимировать ее в интерфейсе, пока само дерево уже в итоговом состоянии.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.steps = []
+
+    def __call__(self, event, **details):
+        info = {name: value.key if isinstance(value, Node) else value
+                for name, value in details.items()}
+        touched = [details[name] for name in _TOUCHED.get(event, ())]
+        if event == 'rotation':
+            touched += (details['root'].left, details['root'].right)
+        changes = [(node, node.key, node.left, node.right, node.balance)
+                   for node in touched if node is not None]
+        removed = details['node'] if event == 'remove' else None
+        self.steps.append(Step(event, info, details.get('node'), changes, self.tree.root, removed))
+
+
+class AVLTree:
+    """AVL-дерево без графического интерфейса и без рекурсии.
+
+    Вставка и поиск идут по дереву циклом с явным стеком пути, поэтому нет ни
+    ограничения глубины рекурсии, ни общих флагов вроде «поддерево выросло».
+    Наблюдатель (например, визуализатор) — необязательный вызываемый объект
+    observer(event, **details), которому сообщаются шаги алгоритма:
+
+        visit      — details: node; переход к очередному узлу
+        compare    — details: key, node, direction ('left' / 'right')
+        create     — details: node, parent; новый лист уже подвешен к parent
+        duplicate  — details: node; ключ уже есть в дереве
+        remove     — details: key, node, target, parent; узел node исключен из
+                     дерева, target — узел, хранивший key (при двух потомках он
+                     получает ключ node), parent — узел, у которого сменился потомок
+        balance    — details: node, balance; новый показатель баланса узла
+        rotation   — details: kind ('left', 'right', 'left-right', 'right-left'),
+                     node (бывший корень поддерева), root (новый корень),
+                     parent (узел над поддеревом или None)
+
+    Без наблюдателя никакие уведомления не формируются.
+
+    Количество ключей count после split и операций над множествами
+    неизвестно (None) и считается при первом вызове len().
+    """
+
+    def __init__(self, keys=(), observer=None):
+        """
+        Args:
+            keys: Ключи, которые нужно сразу вставить
+            observer: Наблюдатель за шагами алгоритма или None
+        """
+        self.root = None
+        self.count = 0
+        self.observer = None
+        for key in keys:
+            self.insert(key)
+        self.observer = observer
+
+    def __len__(self):
+        if self.count is None:
+            self.count = sum(1 for _ in self)
+        return self.count
+
+    def __contains__(self, key):
+        return self.search(key) is not None
+
+    def __iter__(self):
+        """Ключи по возрастанию (симметричный обход с явным стеком)."""
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+    def height(self):
+        """Высота дерева за O(log n): спуск по более высокой стороне."""
+        height = 0
+        node = self.root
+        while node is not None:
+            height += 1
+            node = node.left if node.balance < 0 else node.right
+        return height
+
+    def search(self, key):
+        """Возвращает узел с ключом key или None."""
+        observer = self.observer
+        node = self.root
+        while node is not None:
+            if observer is not None:
+                observer('visit', node=node)
+            if key == node.key:
+                return node
+            direction = 'left' if key < node.key else 'right'
+            if observer is not None:
+                observer('compare', key=key, node=node, direction=direction)
+            node = node.left if direction == 'left' else node.right
+        return None
+
+    def insert(self, key):
+        """Вставляет ключ с перебалансировкой.
+
+        Returns:
+            True, если ключ добавлен, False, если он уже был в дереве.
+        """
+        observer = self.observer
+        if self.root is None:
+            self.root = Node(key)
+            self.count = 1
+            if observer is not None:
+                observer('create', node=self.root, parent=None)
+            return True
+
+        # Спуск: запоминаем пары (узел, пошли ли влево)
+        path = []
+        node = self.root
+        while node is not None:
+            if observer is not None:
+                observer('visit', node=node)
+            if key == node.key:
+                if observer is not None:
+                    observer('duplicate', node=node)
+                return False
+            go_left = key < node.key
+            if observer is not None:
+                observer('compare', key=key, node=node, direction='left' if go_left else 'right')
+            path.append((node, go_left))
+            node = node.left if go_left else node.right
+
+        parent, go_left = path[-1]
+        leaf = Node(key)
+        if go_left:
+            parent.left = leaf
+        else:
+            parent.right = leaf
+        if self.count is not None:
+            self.count += 1
+        if observer is not None:
+            observer('create', node=leaf, parent=parent)
+
+        # Подъем: поддерево выросло на единицу, пока баланс не станет нулевым
+        for i in range(len(path) - 1, -1, -1):
+            node, went_left = path[i]
+            node.balance += -1 if went_left else 1
+            if observer is not None:
+                observer('balance', node=node, balance=node.balance)
+            if node.balance == 0:
+                break
+            if node.balance in (-1, 1):
+                continue
+            # После поворота высота поддерева та же, что до вставки
+            self._rebalance(path, i)
+            break
+        return True
+
+    def delete(self, key):
+        """Удаляет ключ с перебалансировкой.
+
+        Returns:
+            True, если ключ был удален, False, если его не было в дереве.
+        """
+        observer = self.observer
+        path = []
+        node = self.root
+        while node is not None and key != node.key:
+            if observer is not None:
+                observer('visit', node=node)
+            go_left = key < node.key
+            if observer is not None:
+                observer('compare', key=key, node=node, direction='left' if go_left else 'right')
+            path.append((node, go_left))
+            node = node.left if go_left else node.right
+        if node is None:
+            return False
+        if observer is not None:
+            observer('visit', node=node)
+
+        target = node
+        if node.left is not None and node.right is not None:
+            # Два потомка: ключ заменяется минимальным из правого поддерева,
+            # а исключается узел этого минимума (у него нет левого потомка)
+            path.append((node, False))
+            node = node.right
+            while node.left is not None:
+                path.append((node, True))
+                node = node.left
+            target.key = node.key
+
+        self._replace(path, len(path), node.left if node.left is not None else node.right)
+        node.left = node.right = None
+        if self.count is not None:
+            self.count -= 1
+        if observer is not None:
+            observer('remove', key=key, node=node, target=target,
+                     parent=path[-1][0] if path else None)
+
+        # Подъем: поддерево укоротилось, пока высота какого-то узла не сохранится
+        for i in range(len(path) - 1, -1, -1):
+            node, went_left = path[i]
+            node.balance += 1 if went_left else -1
+            if observer is not None:
+                observer('balance', node=node, balance=node.balance)
+            if node.balance in (-1, 1):
+                break
+            if node.balance != 0 and self._rebalance(path, i).balance != 0:
+                # Поворот при перекошенном потомке сохраняет высоту
+                break
+        return True
+
+    def _replace(self, path, i, subtree):
+        """Подвешивает subtree на место i-го узла пути."""
+        if i == 0:
+            self.root = subtree
+            return
+        parent, went_left = path[i - 1]
+        if went_left:
+            parent.left = subtree
+        else:
+            parent.right = subtree
+
+    def _rebalance(self, path, i):
+        """Восстанавливает баланс i-го узла пути (показатель ±2).
+
+        Новый корень поддерева подвешивается на место узла до уведомления
+        наблюдателя, так что тот всегда видит связное дерево.
+
+        Returns:
+            Новый корень поддерева.
+        """
+        node = path[i][0]
+        root, kind = _fix(node)
+        self._replace(path, i, root)
+        if self.observer is not None:
+            self.observer('rotation', kind=kind, node=node, root=root,
+                          parent=path[i - 1][0] if i else None)
+        return root
+
+
+def _join(left, left_height, middle, right, right_height):
+    """Соединяет поддеревья через узел middle (ключи left < middle < right).
+
+    Более низкое поддерево подвешивается на спуске по краю более высокого,
+    затем баланс восстанавливается как после вставки: O(|разность высот| + 1).
+
+    Returns:
+        Кортеж (корень, высота).
+    """
+    if abs(left_height - right_height) <= 1:
+        middle.left, middle.right = left, right
+        middle.balance = right_height - left_height
+        return middle, max(left_height, right_height) + 1
+
+    tall_left = left_height > right_height
+    root, height = (left, left_height) if tall_left else (right, right_height)
+    short_height = right_height if tall_left else left_height
+
+    # Спуск по правому краю левого дерева (или левому краю правого)
+    path = []
+    node, node_height = root, height
+    while node_height > short_height + 1:
+        path.append(node)
+        left_child_height, right_child_height = _child_heights(node, node_height)
+        if tall_left:
+            node, node_height = node.right, right_child_height
+        else:
+            node, node_height = node.left, left_child_height
+
+    if tall_left:
+        subtree, _ = _join(node, node_height, middle, right, right_height)
+    else:
+        subtree, _ = _join(left, left_height, middle, node, node_height)
+
+    # Поддерево на месте node выросло на единицу
+    for i in range(len(path) - 1, -1, -1):
+        parent = path[i]
+        if tall_left:
+            parent.right = subtree
+            parent.balance += 1
+        else:
+            parent.left = subtree
+            parent.balance -= 1
+        if parent.balance == 0:
+            return root, height
+        if parent.balance in (-2, 2):
+            subtree, _ = _fix(parent)
+            if i == 0:
+                return subtree, height
+            if tall_left:
+                path[i - 1].right = subtree
+            else:
+                path[i - 1].left = subtree
+            return root, height
+        subtree = parent
+    return root, height + 1
+
+
+def _pop_max(root, height):
+    """Исключает узел с максимальным ключом.
+
+    Returns:
+        Кортеж (новый корень, новая высота, исключенный узел).
+    """
+    path = []
+    node = root
+    while node.right is not None:
+        path.append(node)
+        node = node.right
+
+    subtree = node.left
+    node.left = None
+    for i in range(len(path) - 1, -1, -1):
+        parent = path[i]
+        parent.right = subtree
+        parent.balance -= 1
+        if parent.balance == -1:
+            return root, height, node
+        if parent.balance == -2:
+            subtree, _ = _fix(parent)
+            if subtree.balance != 0:
+                if i == 0:
+                    return subtree, height, node
+                path[i - 1].right = subtree
+                return root, height, node
+        else:
+            subtree = parent
+    return subtree, height - 1, node
+
+
+def _join2(left, left_height, right, right_height):
+    """Соединяет поддеревья без разделяющего ключа (ключи left < right)."""
+    if left is None:
+        return right, right_height
+    left, left_height, middle = _pop_max(left, left_height)
+    return _join(left, left_height, middle, right, right_height)
+
+
+def _split(root, height, key):
+    """Разрезает поддерево по ключу без рекурсии.
+
+    Returns:
+        Кортеж (меньшие, их высота, узел с ключом key или None, большие, их высота).
+    """
+    path = []
+    found = None
+    less, less_height = greater, greater_height = None, 0
+    node, node_height = root, height
+    while node is not None:
+        left_height, right_height = _child_heights(node, node_height)
+        if key == node.key:
+            found = node
+            less, less_height = node.left, left_height
+            greater, greater_height = node.right, right_height
+            break
+        path.append((node, left_height, right_height))
+        if key < node.key:
+            node, node_height = node.left, left_height
+        else:
+            node, node_height = node.right, right_height
+
+    # Поднимаясь, узел пути с противоположным поддеревом присоединяется
+    # к соответствующей половине; суммарная стоимость — O(log n)
+    for node, left_height, right_height in reversed(path):
+        if key < node.key:
+            greater, greater_height = _join(greater, greater_height, node,
+                                            node.right, right_height)
+        else:
+            less, less_height = _join(node.left, left_height, node, less, less_height)
+
+    if found is not None:
+        found.left = found.right = None
+        found.balance = 0
+    return less, less_height, found, greater, greater_height
+
+
+def _edge(node, rightmost):
+    """Крайний правый (или левый) узел поддерева."""
+    while True:
+        child = node.right if rightmost else node.left
+        if child is None:
+            return node
+        node = child
+
+
+def _from_root(root, count=None):
+    tree = AVLTree()
+    tree.root = root
+    tree.count = count if root is not None else 0
+    return tree
+
+
+def _take(tree):
+    """Забирает корень и высоту дерева, оставляя само дерево пустым."""
+    root, height = tree.root, tree.height()
+    tree.root, tree.count = None, 0
+    return root, height
+
+
+def join(left, key, right):
+    """Соединяет два дерева и ключ между ними за O(log n).
+
+    Узлы исходных деревьев переиспользуются, сами деревья становятся пустыми.
+
+    Args:
+        left: Дерево, все ключи которого меньше key
+        key: Разделяющий ключ
+        right: Дерево, все ключи которого больше key
+
+    Returns:
+        Новое AVLTree.
+
+    Raises:
+        ValueError: если ключи деревьев не разделены ключом key.
+    """
+    if left.root is not None and _edge(left.root, rightmost=True).key >= key:
+        raise ValueError(f"Ключи левого дерева должны быть меньше {key}")
+    if right.root is not None and _edge(right.root, rightmost=False).key <= key:
+        raise ValueError(f"Ключи правого дерева должны быть больше {key}")
+
+    count = None
+    if left.count is not None and right.count is not None:
+        count = left.count + right.count + 1
+    root, _ = _join(*_take(left), Node(key), *_take(right))
+    return _from_root(root, count)
+
+
+def split(tree, key):
+    """Разрезает дерево по ключу за O(log n); исходное дерево становится пустым.
+
+    Returns:
+        Кортеж (дерево ключей меньше key, был ли key в дереве, дерево ключей больше key).
+    """
+    less, _, found, greater, _ = _split(*_take(tree), key)
+    return _from_root(less), found is not None, _from_root(greater)
+
+
+def _union(a, a_height, b, b_height):
+    if a is None:
+        return b, b_height
+    if b is None:
+        return a, a_height
+    a_left_height, a_right_height = _child_heights(a, a_height)
+    a_left, a_right = a.left, a.right
+    less, less_height, _, greater, greater_height = _split(b, b_height, a.key)
+    left, left_height = _union(a_left, a_left_height, less, less_height)
+    right, right_height = _union(a_right, a_right_height, greater, greater_height)
+    return _join(left, left_height, a, right, right_height)
+
+
+def _intersection(a, a_height, b, b_height):
+    if a is None or b is None:
+        return None, 0
+    a_left_height, a_right_height = _child_heights(a, a_height)
+    a_left, a_right = a.left, a.right
+    less, less_height, found, greater, greater_height = _split(b, b_height, a.key)
+    left, left_height = _intersection(a_left, a_left_height, less, less_height)
+    right, right_height = _intersection(a_right, a_right_height, greater, greater_height)
+    if found is not None:
+        return _join(left, left_height, a, right, right_height)
+    return _join2(left, left_height, right, right_height)
+
+
+def _difference(a, a_height, b, b_height):
+    if a is None or b is None:
+        return a, a_height
+    b_left_height, b_right_height = _child_heights(b, b_height)
+    b_left, b_right = b.left, b.right
+    less, less_height, _, greater, greater_height = _split(a, a_height, b.key)
+    left, left_height = _difference(less, less_height, b_left, b_left_height)
+    right, right_height = _difference(greater, greater_height, b_right, b_right_height)
+    return _join2(left, left_height, right, right_height)
+
+
+# Операции над множествами по схеме «разрезать по корню и соединить»:
+# O(m log(n / m + 1)) для деревьев размеров m <= n. Глубина рекурсии —
+# O(высоты деревьев). Узлы исходных деревьев переиспользуются, деревья
+# становятся пустыми.
+
+def union(a, b):
+    """Объединение ключей двух деревьев."""
+    root, _ = _union(*_take(a), *_take(b))
+    return _from_root(root)
+
+
+def intersection(a, b):
+    """Пересечение ключей двух деревьев."""
+    root, _ = _intersection(*_take(a), *_take(b))
+    return _from_root(root)
+
+
+def difference(a, b):
+    """Ключи дерева a, которых нет в дереве b."""
+    root, _ = _difference(*_take(a), *_take(b))
+    return _from_root(root)
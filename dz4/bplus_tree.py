@@ -0,0 +1,261 @@
+from bisect import bisect_left, bisect_right
+
+
+class _Leaf:
+    """Лист: отсортированные ключи и ссылка на следующий лист."""
+
+    __slots__ = ('keys', 'next')
+
+    def __init__(self, keys, next=None):
+        self.keys = keys
+        self.next = next
+
+
+class _Inner:
+    """Внутренний узел: keys[j] — наименьший ключ поддерева children[j + 1]."""
+
+    __slots__ = ('keys', 'children')
+
+    def __init__(self, keys, children):
+        self.keys = keys
+        self.children = children
+
+
+class BPlusTree:
+    """B+-дерево ключей с тем же интерфейсом, что у AVLTree.
+
+    В узле до fanout ключей (или детей) в одном списке, поиск внутри узла —
+    bisect на C, поэтому на уровень приходится один вызов вместо цепочки
+    сравнений и переходов по ссылкам, а высота — log_{fanout/2..fanout} n
+    вместо ~1.44 log2 n. Листья связаны в список, так что упорядоченный
+    обход и запросы по диапазону идут по листьям подряд.
+    """
+
+    def __init__(self, keys=(), fanout=64):
+        """
+        Args:
+            keys: Начальные ключи (загружаются за O(n log n) на сортировку + O(n))
+            fanout: Наибольшее число ключей в листе и детей во внутреннем узле
+        """
+        if fanout < 4:
+            raise ValueError("fanout должен быть не меньше 4")
+        self.fanout = fanout
+        self.min_fill = fanout // 2  # Меньше — узел сливается или занимает у соседа
+        keys = sorted(set(keys))
+        self.count = len(keys)
+        self.root = self._bulk_load(keys)
+
+    def _bulk_load(self, keys):
+        """Строит дерево снизу вверх из отсортированных уникальных ключей."""
+        leaves = [_Leaf(chunk) for chunk in self._chunks(keys)] or [_Leaf([])]
+        for leaf, following in zip(leaves, leaves[1:]):
+            leaf.next = following
+
+        level = leaves
+        firsts = [leaf.keys[0] if leaf.keys else None for leaf in leaves]
+        while len(level) > 1:
+            parents, parent_firsts = [], []
+            start = 0
+            for group in self._chunks(level):
+                stop = start + len(group)
+                parents.append(_Inner(firsts[start + 1:stop], group))
+                parent_firsts.append(firsts[start])
+                start = stop
+            level, firsts = parents, parent_firsts
+        return level[0]
+
+    def _chunks(self, items):
+        """Делит список на ceil(n / fanout) почти равных частей."""
+        if not items:
+            return []
+        parts = -(-len(items) // self.fanout)
+        size, extra = divmod(len(items), parts)
+        chunks, start = [], 0
+        for i in range(parts):
+            stop = start + size + (i < extra)
+            chunks.append(items[start:stop])
+            start = stop
+        return chunks
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, key):
+        return self.search(key) is not None
+
+    def __iter__(self):
+        """Ключи по возрастанию: проход по цепочке листьев."""
+        leaf = self._first_leaf()
+        while leaf is not None:
+            yield from leaf.keys
+            leaf = leaf.next
+
+    def height(self):
+        """Число уровней дерева (0 для пустого)."""
+        if self.count == 0:
+            return 0
+        height, node = 1, self.root
+        while isinstance(node, _Inner):
+            node = node.children[0]
+            height += 1
+        return height
+
+    def _first_leaf(self):
+        node = self.root
+        while isinstance(node, _Inner):
+            node = node.children[0]
+        return node
+
+    def _find_leaf(self, key):
+        node = self.root
+        while isinstance(node, _Inner):
+            node = node.children[bisect_right(node.keys, key)]
+        return node
+
+    def search(self, key):
+        """Возвращает лист, содержащий key, или None."""
+        leaf = self._find_leaf(key)
+        keys = leaf.keys
+        i = bisect_left(keys, key)
+        return leaf if i < len(keys) and keys[i] == key else None
+
+    def range(self, lo, hi):
+        """Ключи из отрезка [lo, hi] по возрастанию."""
+        leaf = self._find_leaf(lo)
+        i = bisect_left(leaf.keys, lo)
+        while leaf is not None:
+            keys = leaf.keys
+            stop = bisect_right(keys, hi)
+            yield from keys[i:stop]
+            if stop < len(keys):
+                return
+            leaf, i = leaf.next, 0
+
+    def insert(self, key):
+        """Вставляет ключ; True, если его не было.
+
+        Переполненный узел делится пополам, разделитель поднимается к
+        родителю; деление корня добавляет уровень.
+        """
+        path = []  # (внутренний узел, индекс ребенка)
+        node = self.root
+        while isinstance(node, _Inner):
+            i = bisect_right(node.keys, key)
+            path.append((node, i))
+            node = node.children[i]
+
+        keys = node.keys
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            return False
+        keys.insert(i, key)
+        self.count += 1
+        if len(keys) <= self.fanout:
+            return True
+
+        # Деление листа: правая половина получает первый ключ-разделитель
+        half = len(keys) // 2
+        right = _Leaf(keys[half:], node.next)
+        del keys[half:]
+        node.next = right
+        separator, new_child = right.keys[0], right
+
+        for parent, i in reversed(path):
+            parent.keys.insert(i, separator)
+            parent.children.insert(i + 1, new_child)
+            if len(parent.children) <= self.fanout:
+                return True
+            # Деление внутреннего узла: средний ключ уходит наверх
+            half = len(parent.children) // 2
+            separator = parent.keys[half - 1]
+            new_child = _Inner(parent.keys[half:], parent.children[half:])
+            del parent.keys[half - 1:]
+            del parent.children[half:]
+
+        self.root = _Inner([separator], [self.root, new_child])
+        return True
+
+    def delete(self, key):
+        """Удаляет ключ; True, если он был.
+
+        Недозаполненный узел занимает ключ у соседа или сливается с ним;
+        корень с единственным ребенком убирается.
+        """
+        path = []
+        node = self.root
+        while isinstance(node, _Inner):
+            i = bisect_right(node.keys, key)
+            path.append((node, i))
+            node = node.children[i]
+
+        keys = node.keys
+        i = bisect_left(keys, key)
+        if i >= len(keys) or keys[i] != key:
+            return False
+        del keys[i]
+        self.count -= 1
+
+        for parent, i in reversed(path):
+            if len(node.keys if isinstance(node, _Leaf) else node.children) >= self.min_fill:
+                return True
+            if isinstance(node, _Leaf):
+                self._fix_leaf(parent, i)
+            else:
+                self._fix_inner(parent, i)
+            node = parent
+
+        if isinstance(self.root, _Inner) and len(self.root.children) == 1:
+            self.root = self.root.children[0]
+        return True
+
+    def _fix_leaf(self, parent, i):
+        """Восстанавливает заполнение листа parent.children[i]."""
+        leaf = parent.children[i]
+        if i > 0:
+            left = parent.children[i - 1]
+            if len(left.keys) > self.min_fill:
+                leaf.keys.insert(0, left.keys.pop())
+                parent.keys[i - 1] = leaf.keys[0]
+            else:
+                left.keys.extend(leaf.keys)
+                left.next = leaf.next
+                del parent.keys[i - 1]
+                del parent.children[i]
+        else:
+            right = parent.children[i + 1]
+            if len(right.keys) > self.min_fill:
+                leaf.keys.append(right.keys.pop(0))
+                parent.keys[i] = right.keys[0]
+            else:
+                leaf.keys.extend(right.keys)
+                leaf.next = right.next
+                del parent.keys[i]
+                del parent.children[i + 1]
+
+    def _fix_inner(self, parent, i):
+        """Восстанавливает заполнение внутреннего узла parent.children[i]."""
+        node = parent.children[i]
+        if i > 0:
+            left = parent.children[i - 1]
+            if len(left.children) > self.min_fill:
+                node.keys.insert(0, parent.keys[i - 1])
+                node.children.insert(0, left.children.pop())
+                parent.keys[i - 1] = left.keys.pop()
+            else:
+                left.keys.append(parent.keys[i - 1])
+                left.keys.extend(node.keys)
+                left.children.extend(node.children)
+                del parent.keys[i - 1]
+                del parent.children[i]
+        else:
+            right = parent.children[i + 1]
+            if len(right.children) > self.min_fill:
+                node.keys.append(parent.keys[i])
+                node.children.append(right.children.pop(0))
+                parent.keys[i] = right.keys.pop(0)
+            else:
+                node.keys.append(parent.keys[i])
+                node.keys.extend(right.keys)
+                node.children.extend(right.children)
+                del parent.keys[i]
+                del parent.children[i + 1]
@@ -0,0 +1,149 @@
+class _Entry:
+    """Кэш укладки поддерева: смещения детей и контуры относительно узла.
+
+    lefts[d] / rights[d] — крайние левая и правая координаты поддерева на
+    глубине d под узлом (lefts[0] == rights[0] == 0).
+    """
+
+    __slots__ = ('left_offset', 'right_offset', 'lefts', 'rights')
+
+    def __init__(self, left_offset, right_offset, lefts, rights):
+        self.left_offset = left_offset
+        self.right_offset = right_offset
+        self.lefts = lefts
+        self.rights = rights
+
+
+class IncrementalLayout:
+    """Аккуратная укладка бинарного дерева, пересчитываемая по изменениям.
+
+    Для каждого узла кэшируются смещения детей и контуры поддерева. После
+    изменения структуры пересчитываются только «грязные» узлы (у которых
+    сменились дети) и их предки — O(log n) узлов для сбалансированного
+    дерева, — а абсолютные координаты обновляются лишь там, где они
+    действительно сдвинулись. Правила укладки те же, что в dz3/tree_layout:
+    соседи уровня не ближе separation, родитель посередине между детьми,
+    единственный потомок — на separation / 2 в свою сторону.
+    """
+
+    def __init__(self, children, separation=1.0):
+        """
+        Args:
+            children: Функция узел -> (левый, правый); узлы — любые хешируемые объекты
+            separation: Минимальное расстояние между соседними узлами уровня
+        """
+        self.children = children
+        self.separation = separation
+        self.root = None
+        self.entries = {}  # узел -> _Entry
+        self.positions = {}  # узел -> (x, depth)
+        self.parents = {}  # узел -> родитель (у корня нет записи)
+
+    def position(self, node):
+        """Возвращает (x, depth) узла."""
+        return self.positions[node]
+
+    def parent(self, node):
+        """Родитель узла в последней укладке или None для корня."""
+        return self.parents.get(node)
+
+    def update(self, root, dirty=(), removed=()):
+        """Приводит укладку в соответствие с текущим деревом.
+
+        Args:
+            root: Текущий корень дерева
+            dirty: Узлы, у которых сменились дети (новые узлы находятся сами)
+            removed: Узлы, исключенные из дерева
+
+        Returns:
+            Список узлов, чьи координаты изменились или были вычислены впервые.
+        """
+        for node in removed:
+            self.entries.pop(node, None)
+            self.positions.pop(node, None)
+            self.parents.pop(node, None)
+
+        # Грязные узлы и все их прежние предки: новые предки грязного узла
+        # либо сами грязные, либо были предками какого-то грязного узла
+        stale = set()
+        for node in dirty:
+            while node is not None and node not in stale:
+                stale.add(node)
+                node = self.parents.get(node)
+
+        self.root = root
+        if root is None:
+            self.entries.clear()
+            self.positions.clear()
+            self.parents.clear()
+            return []
+
+        # Пересчет контуров снизу вверх; чистые поддеревья не обходятся
+        order = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node in self.entries and node not in stale:
+                continue
+            order.append(node)
+            stack.extend(child for child in self.children(node) if child is not None)
+        for node in reversed(order):
+            self.entries[node] = self._entry(node)
+        self.parents.pop(root, None)
+
+        # Абсолютные координаты: поддерево, чей корень не сдвинулся и не
+        # пересчитывался, остается на месте целиком
+        moved = []
+        stack = [(root, 0.0, 0)]
+        while stack:
+            node, x, depth = stack.pop()
+            if node not in stale and self.positions.get(node) == (x, depth):
+                continue
+            self.positions[node] = (x, depth)
+            moved.append(node)
+            entry = self.entries[node]
+            left, right = self.children(node)
+            if left is not None:
+                stack.append((left, x + entry.left_offset, depth + 1))
+            if right is not None:
+                stack.append((right, x + entry.right_offset, depth + 1))
+        return moved
+
+    def _entry(self, node):
+        """Укладка поддерева узла по уже готовым укладкам его детей."""
+        half = self.separation / 2
+        left, right = self.children(node)
+        if left is None and right is None:
+            return _Entry(0.0, 0.0, [0.0], [0.0])
+
+        if right is None:
+            self.parents[left] = node
+            child = self.entries[left]
+            return _Entry(-half, 0.0,
+                          [0.0] + [x - half for x in child.lefts],
+                          [0.0] + [x - half for x in child.rights])
+        if left is None:
+            self.parents[right] = node
+            child = self.entries[right]
+            return _Entry(0.0, half,
+                          [0.0] + [x + half for x in child.lefts],
+                          [0.0] + [x + half for x in child.rights])
+
+        self.parents[left] = node
+        self.parents[right] = node
+        left_entry, right_entry = self.entries[left], self.entries[right]
+        left_depth, right_depth = len(left_entry.lefts), len(right_entry.lefts)
+
+        # Минимальное расстояние между детьми по всем общим уровням
+        gap = self.separation
+        for d in range(min(left_depth, right_depth)):
+            gap = max(gap, left_entry.rights[d] - right_entry.lefts[d] + self.separation)
+        offset = gap / 2
+
+        lefts, rights = [0.0], [0.0]
+        for d in range(max(left_depth, right_depth)):
+            lefts.append(left_entry.lefts[d] - offset if d < left_depth
+                         else right_entry.lefts[d] + offset)
+            rights.append(right_entry.rights[d] + offset if d < right_depth
+                          else left_entry.rights[d] - offset)
+        return _Entry(-offset, offset, lefts, rights)
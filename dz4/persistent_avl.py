@@ -0,0 +1,230 @@
+import threading
+
+
+class PersistentNode:
+    """Неизменяемый узел персистентного AVL-дерева.
+
+    Поля задаются только при создании; вместо изменения узла создается
+    новый, поэтому поддерево, попавшее в какую-либо версию, не меняется
+    никогда и может разделяться между версиями.
+    """
+
+    __slots__ = ('key', 'left', 'right', 'height')
+
+    def __init__(self, key, left=None, right=None):
+        self.key = key
+        self.left = left
+        self.right = right
+        self.height = 1 + max(_height(left), _height(right))
+
+    def __repr__(self):
+        return f"PersistentNode(key={self.key}, height={self.height})"
+
+
+def _height(node):
+    return node.height if node is not None else 0
+
+
+def _balanced(key, left, right):
+    """Новый узел key над left и right с восстановлением баланса.
+
+    Разность высот left и right не больше двух; повороты создают новые узлы
+    и не трогают существующие.
+    """
+    left_height, right_height = _height(left), _height(right)
+    if left_height > right_height + 1:
+        if _height(left.left) >= _height(left.right):
+            return PersistentNode(left.key, left.left, PersistentNode(key, left.right, right))
+        middle = left.right
+        return PersistentNode(middle.key,
+                              PersistentNode(left.key, left.left, middle.left),
+                              PersistentNode(key, middle.right, right))
+    if right_height > left_height + 1:
+        if _height(right.right) >= _height(right.left):
+            return PersistentNode(right.key, PersistentNode(key, left, right.left), right.right)
+        middle = right.left
+        return PersistentNode(middle.key,
+                              PersistentNode(key, left, middle.left),
+                              PersistentNode(right.key, middle.right, right.right))
+    return PersistentNode(key, left, right)
+
+
+def _rebuild(path, key, subtree):
+    """Копирует узлы пути снизу вверх, подвешивая subtree на место спуска по key."""
+    for node in reversed(path):
+        if key < node.key:
+            subtree = _balanced(node.key, subtree, node.right)
+        else:
+            subtree = _balanced(node.key, node.left, subtree)
+    return subtree
+
+
+def insert(root, key):
+    """Вставка с копированием пути: O(log n) новых узлов, исходная версия не меняется.
+
+    Returns:
+        Кортеж (корень новой версии, был ли ключ добавлен). Если ключ уже
+        есть, возвращается тот же корень.
+    """
+    path = []
+    node = root
+    while node is not None:
+        if key == node.key:
+            return root, False
+        path.append(node)
+        node = node.left if key < node.key else node.right
+    return _rebuild(path, key, PersistentNode(key)), True
+
+
+def delete(root, key):
+    """Удаление с копированием пути; исходная версия не меняется.
+
+    Returns:
+        Кортеж (корень новой версии, был ли ключ удален).
+    """
+    path = []
+    node = root
+    while node is not None and key != node.key:
+        path.append(node)
+        node = node.left if key < node.key else node.right
+    if node is None:
+        return root, False
+
+    if node.left is None:
+        subtree = node.right
+    elif node.right is None:
+        subtree = node.left
+    else:
+        # Ключ заменяется минимальным из правого поддерева, а тот
+        # исключается из копии этого поддерева
+        spine = []
+        successor = node.right
+        while successor.left is not None:
+            spine.append(successor)
+            successor = successor.left
+        right = _rebuild(spine, successor.key, successor.right)
+        subtree = _balanced(successor.key, node.left, right)
+    return _rebuild(path, key, subtree), True
+
+
+def search(root, key):
+    """Ищет ключ в версии дерева; возвращает узел или None."""
+    node = root
+    while node is not None:
+        if key == node.key:
+            return node
+        node = node.left if key < node.key else node.right
+    return None
+
+
+def from_sorted(keys):
+    """Сбалансированная версия из отсортированных уникальных ключей за O(n)."""
+    def build(lo, hi):
+        if lo >= hi:
+            return None
+        middle = (lo + hi) // 2
+        return PersistentNode(keys[middle], build(lo, middle), build(middle + 1, hi))
+
+    return build(0, len(keys))
+
+
+class Snapshot:
+    """Неизменяемая версия дерева: корень, число ключей и номер версии.
+
+    Читать снимок можно из любого потока без блокировок — ни один узел
+    версии больше не изменится.
+    """
+
+    __slots__ = ('root', 'count', 'version')
+
+    def __init__(self, root, count, version):
+        self.root = root
+        self.count = count
+        self.version = version
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, key):
+        return search(self.root, key) is not None
+
+    def __iter__(self):
+        """Ключи по возрастанию (симметричный обход с явным стеком)."""
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+    def height(self):
+        return _height(self.root)
+
+    def range(self, lo, hi):
+        """Ключи из отрезка [lo, hi] по возрастанию; поддеревья вне отрезка не обходятся."""
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                if node.key < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if node.key > hi:
+                return
+            yield node.key
+            node = node.right
+
+
+class PersistentAVLTree:
+    """Персистентное AVL-дерево для одного писателя и многих читателей.
+
+    Каждая вставка и удаление строит новую версию, копируя только узлы на
+    пути от корня (O(log n)), и публикует ее одним присваиванием ссылки на
+    Snapshot — в CPython оно атомарно. Читатели берут snapshot() без
+    блокировок и работают с согласованной версией, сколько бы изменений ни
+    произошло после. Писатели упорядочиваются одной блокировкой.
+    """
+
+    def __init__(self, keys=()):
+        keys = sorted(set(keys))
+        self._lock = threading.Lock()
+        self._snapshot = Snapshot(from_sorted(keys), len(keys), 0)
+
+    def snapshot(self):
+        """Текущая версия дерева (неизменяемая)."""
+        return self._snapshot
+
+    def __len__(self):
+        return self._snapshot.count
+
+    def __contains__(self, key):
+        return key in self._snapshot
+
+    def __iter__(self):
+        return iter(self._snapshot)
+
+    def insert(self, key):
+        """Добавляет ключ и публикует новую версию; True, если ключа не было."""
+        with self._lock:
+            current = self._snapshot
+            root, inserted = insert(current.root, key)
+            if inserted:
+                self._snapshot = Snapshot(root, current.count + 1, current.version + 1)
+            return inserted
+
+    def delete(self, key):
+        """Удаляет ключ и публикует новую версию; True, если ключ был."""
+        with self._lock:
+            current = self._snapshot
+            root, deleted = delete(current.root, key)
+            if deleted:
+                self._snapshot = Snapshot(root, current.count - 1, current.version + 1)
+            return deleted
@@ -0,0 +1,250 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from bisect import bisect_left
+from itertools import accumulate
+
+# BinaryTree лежит в соседнем каталоге dz3
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'dz3'))
+from binary_tree import BinaryTree  # noqa: E402
+
+from avl_tree import AVLTree  # noqa: E402
+from bplus_tree import BPlusTree  # noqa: E402
+
+
+class BinaryTreeBackend:
+    """dz3/binary_tree: несбалансированное дерево поиска."""
+
+    def __init__(self):
+        self.root = None
+
+    def insert(self, key):
+        self.root = BinaryTree.insert(self.root, key)
+
+    def delete(self, key):
+        self.root = BinaryTree.delete(self.root, key)
+
+    def search(self, key):
+        return BinaryTree.search(self.root, key) is not None
+
+    def height(self):
+        return BinaryTree.get_tree_depth(self.root)
+
+
+class AVLBackend:
+    """dz4/avl_tree: AVL-дерево."""
+
+    def __init__(self):
+        self.tree = AVLTree()
+        self.insert = self.tree.insert
+        self.delete = self.tree.delete
+
+    def search(self, key):
+        return self.tree.search(key) is not None
+
+    def height(self):
+        return self.tree.height()
+
+
+class BPlusBackend:
+    """dz4/bplus_tree: B+-дерево с fanout 64."""
+
+    def __init__(self):
+        self.tree = BPlusTree()
+        self.insert = self.tree.insert
+        self.delete = self.tree.delete
+
+    def search(self, key):
+        return self.tree.search(key) is not None
+
+    def height(self):
+        return self.tree.height()
+
+
+class SortedListBackend:
+    """Отсортированный список с bisect: поиск O(log n), вставка и удаление O(n) сдвигом."""
+
+    def __init__(self):
+        self.keys = []
+
+    def insert(self, key):
+        keys = self.keys
+        i = bisect_left(keys, key)
+        if i == len(keys) or keys[i] != key:
+            keys.insert(i, key)
+
+    def delete(self, key):
+        keys = self.keys
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            del keys[i]
+
+    def search(self, key):
+        keys = self.keys
+        i = bisect_left(keys, key)
+        return i < len(keys) and keys[i] == key
+
+    def height(self):
+        return None  # Не дерево
+
+
+BACKENDS = {
+    'binary_tree': BinaryTreeBackend,
+    'avl': AVLBackend,
+    'bplus': BPlusBackend,
+    'sorted_list': SortedListBackend,
+}
+
+
+# Нагрузки: (ключи для предварительной загрузки, список операций (имя, ключ)).
+# Загрузка не измеряется, операции — измеряются.
+
+def workload_random(n, rng):
+    """Вставка n случайных ключей, затем n поисков (примерно половина — промахи)."""
+    keys = rng.sample(range(2 * n), n)
+    lookups = [rng.randrange(2 * n) for _ in range(n)]
+    return [], [('insert', key) for key in keys] + [('search', key) for key in lookups]
+
+
+def workload_sorted(n, rng):
+    """Вставка n ключей по возрастанию (худший случай для несбалансированного дерева), затем n поисков."""
+    lookups = [rng.randrange(n) for _ in range(n)]
+    return [], [('insert', key) for key in range(n)] + [('search', key) for key in lookups]
+
+
+def workload_zipf(n, rng, exponent=1.1):
+    """n поисков с частотами по закону Ципфа; популярность ключа не связана с его величиной."""
+    keys = rng.sample(range(2 * n), n)
+    weights = list(accumulate(1 / rank ** exponent for rank in range(1, n + 1)))
+    lookups = rng.choices(keys, cum_weights=weights, k=n)
+    return keys, [('search', key) for key in lookups]
+
+
+def workload_mixed(n, rng):
+    """Загрузка n / 2 ключей, затем n операций: половина поисков, по четверти вставок и удалений."""
+    preload = rng.sample(range(2 * n), n // 2)
+    ops = []
+    for _ in range(n):
+        roll = rng.random()
+        op = 'search' if roll < 0.5 else 'insert' if roll < 0.75 else 'delete'
+        ops.append((op, rng.randrange(2 * n)))
+    return preload, ops
+
+
+WORKLOADS = {
+    'random': workload_random,
+    'sorted': workload_sorted,
+    'zipf': workload_zipf,
+    'mixed': workload_mixed,
+}
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_one(backend_cls, preload, ops, measure_memory=True):
+    """Прогоняет нагрузку на свежем экземпляре структуры.
+
+    Время меряется отдельным проходом без tracemalloc (он замедляет
+    выделение памяти в разы), пиковая память — вторым проходом.
+
+    Returns:
+        Словарь с метриками.
+    """
+    backend = backend_cls()
+    for key in preload:
+        backend.insert(key)
+    calls = [(getattr(backend, op), key) for op, key in ops]
+
+    latencies = []
+    clock = time.perf_counter_ns
+    started = clock()
+    for call, key in calls:
+        before = clock()
+        call(key)
+        latencies.append(clock() - before)
+    elapsed = (clock() - started) / 1e9
+    latencies.sort()
+
+    result = {
+        'ops': len(ops),
+        'seconds': round(elapsed, 6),
+        'ops_per_sec': round(len(ops) / elapsed) if elapsed else None,
+        'p50_us': round(_percentile(latencies, 0.50) / 1000, 3) if latencies else None,
+        'p99_us': round(_percentile(latencies, 0.99) / 1000, 3) if latencies else None,
+        'height': backend.height(),
+    }
+    del backend, calls
+
+    if measure_memory:
+        tracemalloc.start()
+        backend = backend_cls()
+        for key in preload:
+            backend.insert(key)
+        for op, key in ops:
+            getattr(backend, op)(key)
+        result['peak_kib'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+    return result
+
+
+def run_suite(n, seed, backends=tuple(BACKENDS), workloads=tuple(WORKLOADS), measure_memory=True):
+    """Запускает каждую нагрузку на каждой структуре; данные нагрузки одинаковы для всех."""
+    results = []
+    for workload in workloads:
+        preload, ops = WORKLOADS[workload](n, random.Random(seed))
+        for backend in backends:
+            result = {'workload': workload, 'backend': backend, 'n': n}
+            result.update(run_one(BACKENDS[backend], preload, ops, measure_memory))
+            results.append(result)
+            print(f"{workload:>8} {backend:>12}: {result['ops_per_sec'] or 0:>10} оп/с, "
+                  f"p50 {result['p50_us']} мкс, p99 {result['p99_us']} мкс, "
+                  f"высота {result['height']}, пик {result.get('peak_kib', '-')} КиБ")
+    return results
+
+
+def _metadata(n, seed):
+    """Условия запуска, чтобы результаты разных коммитов можно было сравнивать."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'n': n,
+        'seed': seed,
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def main():
+    """Командная строка: выбор структур, нагрузок и файла результатов."""
+    parser = argparse.ArgumentParser(description="Сравнение деревьев поиска на типовых нагрузках")
+    parser.add_argument('-n', type=int, default=5000, help="Размер нагрузки (ключей / операций)")
+    parser.add_argument('--seed', type=int, default=1, help="Зерно генератора нагрузок")
+    parser.add_argument('--backends', nargs='+', choices=tuple(BACKENDS), default=list(BACKENDS))
+    parser.add_argument('--workloads', nargs='+', choices=tuple(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument('--no-memory', action='store_true', help="Не измерять пиковую память")
+    parser.add_argument('--json', help="Сохранить результаты в JSON-файл")
+    args = parser.parse_args()
+
+    results = run_suite(args.n, args.seed, args.backends, args.workloads, not args.no_memory)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump({'meta': _metadata(args.n, args.seed), 'results': results},
+                      file, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"Результаты сохранены в {args.json}")
+
+
+if __name__ == "__main__":
+    main()
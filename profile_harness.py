@@ -0,0 +1,356 @@
+import argparse
+import builtins
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import multiprocessing
+import os
+import platform
+import pstats
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from cli import ROOT, load_module
+
+try:
+    import resource
+except ImportError:  # Нет на Windows: пик RSS не измеряется
+    resource = None
+
+# Меньше этих разниц — шум, а не регрессия
+MIN_SECONDS = 0.02
+MIN_KIB = 256
+
+
+def _maxrss_kib():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak  # На macOS — байты
+
+
+class PhaseRecorder:
+    """Время и память по фазам: каждая фаза — обернутая функция модуля.
+
+    Для фазы суммируются wall- и CPU-время всех вызовов; пик памяти —
+    наибольший за вызов прирост выделенного tracemalloc сверх занятого на
+    входе в фазу; рост пика RSS процесса — по getrusage. Вложенные фазы
+    учитываются и в своей, и во внешней.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stats = {}
+        self._stack = []
+
+    def wrap(self, name, function):
+        """Функция, выполняющаяся как фаза name."""
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+
+    def _lift_peak(self, peak):
+        # reset_peak сбрасывает пик и для внешних фаз: сохраняем его в них заранее
+        for frame in self._stack:
+            frame['peak'] = max(frame['peak'], peak)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        frame = {'peak': 0, 'base': 0}
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self._lift_peak(peak)
+            tracemalloc.reset_peak()
+            frame['base'] = current
+        rss_before = _maxrss_kib()
+        self._stack.append(frame)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            self._stack.pop()
+            stats = self.stats.setdefault(name, {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0,
+                                                 'peak_kib': None, 'rss_growth_kib': None})
+            stats['calls'] += 1
+            stats['wall_s'] += wall
+            stats['cpu_s'] += cpu
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                self._lift_peak(peak)
+                frame['peak'] = max(frame['peak'], peak)
+                stats['peak_kib'] = max(stats['peak_kib'] or 0, (frame['peak'] - frame['base']) / 1024)
+            if rss_before is not None:
+                stats['rss_growth_kib'] = max(stats['rss_growth_kib'] or 0, _maxrss_kib() - rss_before)
+
+    def patch(self, module, phases):
+        """Оборачивает атрибуты модуля: phases — {фаза: ['функция', 'Класс.метод', ...]}."""
+        for name, targets in phases.items():
+            for target in targets:
+                *owner_path, attribute = target.split('.')
+                owner = functools.reduce(getattr, owner_path, module)
+                setattr(owner, attribute, self.wrap(name, getattr(owner, attribute)))
+
+
+def _generate_records(workdir, options):
+    """Подготовка: файл записей нужного размера (не измеряется)."""
+    generator = load_module('dz1/FirstTask.py')
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.generate_large_file(os.path.join(workdir, 'large_data.txt'), options['size_mb'])
+
+
+# entry — имя функции модуля или функция (модуль, опции); inputs — ответы на input();
+# argv — аргументы командной строки; setup — подготовка каталога до измерений
+Scenario = namedtuple('Scenario', 'path entry phases inputs argv setup')
+Scenario.__new__.__defaults__ = ((), (), None)
+
+SCENARIOS = {
+    'dz1.generate': Scenario(
+        'dz1/FirstTask.py',
+        lambda module, options: module.generate_large_file('large_data.txt', options['size_mb']),
+        {'generate': ['generate_large_file']}),
+    'dz1.search': Scenario(
+        'dz1/SecondTask.py', 'main',
+        {'scan': ['search_and_remove_records'],
+         'rewrite': ['append_to_temp_file', 'replace_file_with_temp'],
+         'range': ['range_search'],
+         'append': ['add_record']},
+        inputs=['1', '000000123', '2', 'tag_42', '3', 'FAIL',
+                '5', '', '', 'FAILED',
+                '4', 'ACTIVE', 'tag_1', '12.5', '6', '100', '200', 'PENDING', '7'],
+        setup=_generate_records),
+    'dz1.experiment': Scenario(
+        'dz1/ThirdTask.py', 'main',
+        {'experiment': ['KeyExperiment.run_experiment'], 'linear_search': ['KeyExperiment.linear_search']}),
+    'dz2.linear': Scenario(
+        'dz2/FirstTask.py', 'main',
+        {'io': ['write_array_to_file', 'read_array_from_file'],
+         'search': ['calculate_average_comparisons']}),
+    'dz2.tape': Scenario(
+        'dz2/SecondTask.py', 'run_experiments',
+        {'generate': ['generate_tape'], 'search': ['evaluate_search_performance']}),
+    'dz2.geometric': Scenario(
+        'dz2/ThreeTask.py', 'main',
+        {'matrix': ['calculate_expected_comparisons']}),
+    'dz2.matrix': Scenario(
+        'dz2/FourTask.py', 'main',
+        {'distribution': ['calculate_probability_distribution'], 'matrix': ['compute_expected_comparisons']}),
+    'dz2.conditions': Scenario(
+        'dz2/FiveTask.py', 'main',
+        {'test': ['run_performance_test']},
+        inputs=['50']),
+    'dz3.optimal': Scenario(
+        'dz3/optimal_bst.py', 'main',
+        {'optimal': ['optimal_bst'], 'weight_balanced': ['weight_balanced_bst']},
+        argv=['--size', '300']),
+    'dz4.trees': Scenario(
+        'dz4/tree_benchmark.py', 'main',
+        {'run': ['run_one']},
+        argv=['-n', '2000', '--no-memory']),
+}
+
+
+def _scripted_input(answers):
+    answers = deque(answers)
+
+    def scripted(prompt=''):
+        if not answers:
+            raise EOFError("Сценарий исчерпан: программа ждет еще ввода")
+        answer = answers.popleft()
+        print(f"{prompt}{answer}")
+        return answer
+    return scripted
+
+
+def run_scenario(name, options):
+    """Выполняет сценарий в текущем процессе во временном каталоге.
+
+    Returns:
+        Словарь: фазы, пик RSS, хвост вывода программы и (по запросу) горячие точки cProfile.
+    """
+    scenario = SCENARIOS[name]
+    workdir = tempfile.mkdtemp(prefix='profile_')
+    previous_cwd, previous_argv, previous_input = os.getcwd(), sys.argv, builtins.input
+    recorder = PhaseRecorder(trace_memory=options['trace_memory'])
+    output = io.StringIO()
+    result = {}
+    try:
+        if scenario.setup:
+            scenario.setup(workdir, options)
+        os.chdir(workdir)
+        sys.argv = [scenario.path] + list(scenario.argv)
+        builtins.input = _scripted_input(scenario.inputs)
+        if options['trace_memory']:
+            tracemalloc.start()
+
+        profiler = cProfile.Profile() if options['profile'] else None
+        with contextlib.redirect_stdout(output):
+            with recorder.phase('import'):
+                module = load_module(scenario.path)
+            recorder.patch(module, scenario.phases)
+            entry = getattr(module, scenario.entry) if isinstance(scenario.entry, str) else \
+                functools.partial(scenario.entry, module, options)
+            if profiler:
+                profiler.enable()
+            with recorder.phase('total'):
+                entry()
+            if profiler:
+                profiler.disable()
+
+        if profiler:
+            stats = pstats.Stats(profiler).sort_stats('cumulative')
+            result['profile'] = [
+                {'function': pstats.func_std_string(key), 'calls': stats.stats[key][1],
+                 'tottime_s': round(stats.stats[key][2], 6), 'cumtime_s': round(stats.stats[key][3], 6)}
+                for key in stats.fcn_list[:options['profile']]]
+    finally:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        os.chdir(previous_cwd)
+        sys.argv, builtins.input = previous_argv, previous_input
+        if options['keep']:
+            result['workdir'] = workdir
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    result['phases'] = {phase: {key: round(value, 6) if isinstance(value, float) else value
+                                for key, value in stats.items()}
+                        for phase, stats in recorder.stats.items()}
+    result['maxrss_kib'] = _maxrss_kib()
+    result['output_tail'] = output.getvalue().splitlines()[-5:]
+    return result
+
+
+def run_isolated(name, options):
+    """Сценарий в отдельном процессе: чистые модули и свой пик RSS для каждого."""
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(run_scenario, name, options).result()
+
+
+def compare(results, baseline, time_threshold, memory_threshold):
+    """Регрессии относительно сохраненного прогона.
+
+    Метрика считается ухудшившейся, если выросла больше чем на порог (доля)
+    и больше чем на MIN_SECONDS / MIN_KIB по абсолютной величине.
+
+    Returns:
+        Список строк с описанием регрессий.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            continue
+        for phase, stats in result['phases'].items():
+            old = base['phases'].get(phase)
+            if old is None:
+                continue
+            for metric, threshold, floor in (('wall_s', time_threshold, MIN_SECONDS),
+                                             ('cpu_s', time_threshold, MIN_SECONDS),
+                                             ('peak_kib', memory_threshold, MIN_KIB)):
+                new_value, old_value = stats.get(metric), old.get(metric)
+                if new_value is None or old_value is None:
+                    continue
+                if new_value > old_value * (1 + threshold) and new_value - old_value > floor:
+                    regressions.append(f"{name}/{phase}: {metric} {old_value:g} -> {new_value:g} "
+                                       f"(+{(new_value / old_value - 1) * 100 if old_value else float('inf'):.0f}%)")
+    return regressions
+
+
+def _metadata(options):
+    """Условия запуска, чтобы результаты разных коммитов можно было сравнивать."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=ROOT).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'options': options,
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def _print_result(name, result):
+    print(f"\n=== {name} (пик RSS {result['maxrss_kib']} КиБ) ===")
+    print(f"{'фаза':>16} {'вызовы':>7} {'wall, с':>9} {'CPU, с':>9} {'пик, КиБ':>10} {'рост RSS, КиБ':>14}")
+    for phase, stats in result['phases'].items():
+        peak = '-' if stats['peak_kib'] is None else f"{stats['peak_kib']:.0f}"
+        rss = '-' if stats['rss_growth_kib'] is None else stats['rss_growth_kib']
+        print(f"{phase:>16} {stats['calls']:>7} {stats['wall_s']:>9.3f} {stats['cpu_s']:>9.3f} {peak:>10} {rss:>14}")
+    for entry in result.get('profile', []):
+        print(f"    {entry['cumtime_s']:>9.3f} с {entry['calls']:>9} выз.  {entry['function']}")
+
+
+def main():
+    """Командная строка: выбор сценариев, профилирование и сравнение с базовым прогоном."""
+    parser = argparse.ArgumentParser(description="Время и память по фазам для точек входа dz1-dz4")
+    parser.add_argument('scenarios', nargs='*', metavar='scenario',
+                        help="Сценарии (по умолчанию — все): " + ", ".join(SCENARIOS))
+    parser.add_argument('--size-mb', type=int, default=5, help="Размер файла записей для dz1")
+    parser.add_argument('--profile', type=int, default=0, metavar='N', help="Показать N горячих точек cProfile")
+    parser.add_argument('--no-tracemalloc', action='store_true',
+                        help="Не отслеживать выделения (время без накладных расходов tracemalloc)")
+    parser.add_argument('--in-process', action='store_true', help="Без отдельного процесса на сценарий")
+    parser.add_argument('--keep', action='store_true', help="Не удалять рабочие каталоги")
+    parser.add_argument('--json', help="Сохранить результаты (годятся как базовый прогон)")
+    parser.add_argument('--baseline', help="Сравнить с результатами из этого файла")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Допустимый рост времени (доля)")
+    parser.add_argument('--memory-threshold', type=float, default=0.25, help="Допустимый рост памяти (доля)")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"неизвестные сценарии: {', '.join(unknown)}")
+
+    options = {'size_mb': args.size_mb, 'profile': args.profile,
+               'trace_memory': not args.no_tracemalloc, 'keep': args.keep}
+    run = run_scenario if args.in_process else run_isolated
+    results = {}
+    failed = []
+    for name in args.scenarios or SCENARIOS:
+        try:
+            results[name] = run(name, options)
+        except Exception as error:  # Сломанный сценарий не должен останавливать остальные
+            failed.append(name)
+            print(f"\n=== {name}: ошибка {type(error).__name__}: {error} ===")
+            continue
+        _print_result(name, results[name])
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump({'meta': _metadata(options), 'results': results}, file, ensure_ascii=False, indent=2)
+        print(f"\nРезультаты сохранены в {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        base_options = baseline.get('meta', {}).get('options', {})
+        # cProfile и tracemalloc сами замедляют программу: сравнимы только прогоны с теми же настройками
+        if any(bool(base_options.get(key)) != bool(options[key]) for key in ('profile', 'trace_memory')) or \
+                base_options.get('size_mb') != options['size_mb']:
+            print("\nВнимание: параметры базового прогона отличаются, сравнение неточно")
+        regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+        if regressions:
+            print("\nРегрессии:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nРегрессий нет")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()